@@ -75,4 +75,10 @@ class GameState:
         discard_possibilities = num_ranks + 1  # 13 ranks + 'None'
         round_possibilities = max_rounds
         total_states = total_known_combinations * discard_possibilities * round_possibilities
-        return total_states
\ No newline at end of file
+        return total_states
+
+    @staticmethod
+    def calculate_canonical_state_space():
+        """State space size once 10/Q/K relabelings are merged (see state_canonical.py)."""
+        from state_canonical import count_canonical_states
+        return count_canonical_states(max_known=4, max_rounds=4)
\ No newline at end of file
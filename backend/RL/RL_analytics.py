@@ -17,6 +17,7 @@ import pandas as pd
 import numpy as np
 import csv
 from RL_viz import *
+from trajectory_store import TrajectoryReader
 import matplotlib.pyplot as plt
 import matplotlib.image as mpimg
 from tqdm import trange
@@ -178,7 +179,13 @@ def analyze_state_patterns(q_table, verbose=True):
 
 
 def analyze_growth_patterns(games, states, entries, scores=None):
-    """Analyze Q-table growth patterns"""
+    """
+    Analyze Q-table growth patterns.
+
+    states/entries are the per-game samples recorded in training_stats
+    ('qtable_states'/'qtable_entries'), which come from the Q-table's running
+    counters, so no Q-table scan is needed here.
+    """
     print(f"\n" + "="*50)
     print("GROWTH ANALYSIS")
     print("="*50)
@@ -187,20 +194,13 @@ def analyze_growth_patterns(games, states, entries, scores=None):
         print("Not enough data points for analysis")
         return {}
 
-    # Calculate growth rates
-    state_growth_rates = []
-    entry_growth_rates = []
-
-    for i in range(1, len(games)):
-        games_diff = games[i] - games[i-1]
-        state_diff = states[i] - states[i-1]
-        entry_diff = entries[i] - entries[i-1]
-
-        state_growth_rate = state_diff / games_diff if games_diff > 0 else 0
-        entry_growth_rate = entry_diff / games_diff if games_diff > 0 else 0
-
-        state_growth_rates.append(state_growth_rate)
-        entry_growth_rates.append(entry_growth_rate)
+    # Growth rates between consecutive samples of the Q-table counters
+    games_diff = np.diff(np.asarray(games, dtype=float))
+    valid = games_diff > 0
+    state_growth_rates = np.zeros_like(games_diff)
+    entry_growth_rates = np.zeros_like(games_diff)
+    state_growth_rates[valid] = np.diff(np.asarray(states, dtype=float))[valid] / games_diff[valid]
+    entry_growth_rates[valid] = np.diff(np.asarray(entries, dtype=float))[valid] / games_diff[valid]
 
     # Final statistics
     final_states = states[-1]
@@ -382,30 +382,12 @@ def analyze_trained_agent(agent, training_stats, save_prefix="trained_agent", op
     )
 
     # 5. Action type tracking visualization
-    # Load the full trajectory from the output CSV
-    import csv
-    trajectory_path = get_output_path("trajectory_train.csv")
-    trajectory = []
-    if os.path.exists(trajectory_path):
-        with open(trajectory_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                # Reconstruct action as dict if possible, else keep as string
-                try:
-                    import ast
-                    action = ast.literal_eval(row['action']) if 'action' in row and row['action'].startswith('{') else row['action']
-                except:
-                    action = row['action']
-                trajectory.append({
-                    'state_key': row['state_key'],
-                    'action_key': row['action_key'],
-                    'action': action,
-                    'game': int(row['game']) if row['game'] != '?' else None,
-                    'round': int(row['round']) if row['round'] != '?' else None
-                })
+    # Load the logged trajectory from the columnar store written during training
+    trajectory_reader = TrajectoryReader(output_dir)
+    if len(trajectory_reader):
         # Plot action type tracking
         plot_action_type_tracking(
-            trajectory,
+            list(trajectory_reader.iter_steps()),
             round_info=True,
             save_filename=f"{save_prefix}_action_type_tracking.png"
         )
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Resumable Training Checkpoints
+
+A checkpoint is the Q-table on disk (base CSV + delta log, see q_table.py)
+plus a small JSON metadata file with everything else needed to continue a run
+exactly: games played, epsilon, the random/numpy RNG states, and how far the
+run and its trajectory log had got.
+
+Each checkpoint only appends the Q-entries changed since the previous one to
+the delta log. When the delta log grows large relative to the base it is
+compacted into a new base snapshot.
+"""
+
+import json
+import os
+import random
+import time
+import numpy as np
+
+from q_table import QTable, load_q_table_csv, save_q_table_csv, append_q_table_delta, q_table_paths
+
+
+def _random_state_to_json(state):
+    version, internal, gauss_next = state
+    return [version, list(internal), gauss_next]
+
+
+def _random_state_from_json(state):
+    version, internal, gauss_next = state
+    return (version, tuple(internal), gauss_next)
+
+
+def _numpy_state_to_json(state):
+    name, keys, pos, has_gauss, cached_gaussian = state
+    return [name, keys.tolist(), int(pos), int(has_gauss), float(cached_gaussian)]
+
+
+def _numpy_state_from_json(state):
+    name, keys, pos, has_gauss, cached_gaussian = state
+    return (name, np.array(keys, dtype=np.uint32), pos, has_gauss, cached_gaussian)
+
+
+class TrainingCheckpoint:
+    """
+    Periodic, incremental checkpoints for a Q-learning training run.
+
+    Args:
+        directory: Output directory holding the Q-table files
+        filename: Base Q-table CSV name (the same file save_q_table_csv writes)
+        compact_ratio: Compact when delta rows exceed this fraction of base rows
+        min_compact_rows: Never compact for deltas smaller than this
+    """
+
+    def __init__(self, directory, filename="qtable_train.csv", compact_ratio=0.5,
+                 min_compact_rows=50000):
+        self.base_path = os.path.join(directory, filename)
+        self.delta_path, self.meta_path = q_table_paths(self.base_path)
+        self.compact_ratio = compact_ratio
+        self.min_compact_rows = min_compact_rows
+
+    def read_meta(self):
+        if not os.path.exists(self.meta_path):
+            return {}
+        with open(self.meta_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_meta(self, meta):
+        tmp_path = f"{self.meta_path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.meta_path)
+
+    def resume(self, agent, num_games, restore_run=True):
+        """
+        Load the Q-table into agent and, if restore_run is set and the previous
+        run of the same length stopped before finishing, restore its exact
+        training state.
+
+        Returns the saved run state (run_games_done, run_last_game_num,
+        trajectory_records, ...) for an interrupted run, otherwise None.
+        """
+        meta = self.read_meta()
+        # Drop rows appended by a checkpoint that died before its metadata
+        # was written, so later appends start from a clean row boundary.
+        if meta and os.path.exists(self.delta_path):
+            if os.path.getsize(self.delta_path) > meta.get('delta_bytes', 0):
+                with open(self.delta_path, 'r+b') as f:
+                    f.truncate(meta.get('delta_bytes', 0))
+
+        agent.q_table = QTable()
+        if load_q_table_csv(self.base_path, agent.q_table) is not None:
+            print(f"Loaded Q-table from {self.base_path} with {agent.q_table.num_states} states.")
+        else:
+            print(f"No existing Q-table found at {self.base_path}. Starting fresh.")
+        agent.q_table.track_changes()
+
+        run = meta.get('run')
+        if (not restore_run or not run or run['run_num_games'] != num_games or
+                run['run_games_done'] >= run['run_num_games']):
+            return None
+
+        agent.games_played = meta['games_played']
+        agent.epsilon = meta['epsilon']
+        random.setstate(_random_state_from_json(meta['random_state']))
+        np.random.set_state(_numpy_state_from_json(meta['numpy_random_state']))
+        print(f"Resuming interrupted run at game {run['run_games_done'] + 1}/{num_games} "
+              f"(epsilon={agent.epsilon:.3f}, games played={agent.games_played})")
+        return run
+
+    def save(self, agent, run, compact=False):
+        """
+        Append entries changed since the last checkpoint to the delta log and
+        record the training state. `run` is stored as-is and handed back by
+        resume(). Compacts into a new base when the delta has grown too large.
+        """
+        start = time.perf_counter()
+        meta = self.read_meta()
+        changes = agent.q_table.pop_changes()
+
+        delta_rows = meta.get('delta_rows', 0) + len(changes)
+        delta_bytes = append_q_table_delta(agent.q_table, self.base_path, changes)
+        base_rows = meta.get('base_rows', 0)
+
+        meta.update({
+            'games_played': agent.games_played,
+            'epsilon': agent.epsilon,
+            'random_state': _random_state_to_json(random.getstate()),
+            'numpy_random_state': _numpy_state_to_json(np.random.get_state()),
+            'run': run,
+            'delta_bytes': delta_bytes,
+            'delta_rows': delta_rows,
+            'base_rows': base_rows,
+            'saved_at': time.time(),
+        })
+        # The delta append is durable before the metadata that points past it
+        self._write_meta(meta)
+
+        if compact or (delta_rows >= self.min_compact_rows and
+                       delta_rows > self.compact_ratio * base_rows):
+            # The delta log now matches the table, so a crash during
+            # compaction still replays to the same values. save_q_table_csv
+            # also resets the delta fields of the metadata.
+            save_q_table_csv(agent.q_table, self.base_path)
+
+        return time.perf_counter() - start
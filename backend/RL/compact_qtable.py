@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Build a pruned, quantized Q-table artifact for the web app.
+
+Usage:
+    python compact_qtable.py output/qtable_train.csv output/qtable_deploy.npz --dtype int8 --min-visits 3
+
+Prints the size/accuracy tradeoff (kept entries, bytes, and how often the
+greedy action matches the full table).
+"""
+
+import argparse
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from q_table import load_q_table_csv
+from q_table_deploy import build_deployment_artifact, QUANTIZATION_DTYPES
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prune and quantize a Q-table for deployment")
+    parser.add_argument('input', help="Trained Q-table CSV")
+    parser.add_argument('output', help="Deployment artifact (.npz)")
+    parser.add_argument('--dtype', choices=list(QUANTIZATION_DTYPES), default='float16')
+    parser.add_argument('--min-visits', type=int, default=2,
+                        help="Drop entries updated fewer times than this (default 2)")
+    parser.add_argument('--min-abs-value', type=float, default=1e-3,
+                        help="Drop entries this close to the 0.0 default (default 0.001)")
+    args = parser.parse_args()
+
+    q_table = load_q_table_csv(args.input)
+    if q_table is None:
+        print(f"❌ No Q-table found at {args.input}")
+        sys.exit(1)
+    build_deployment_artifact(q_table, args.output, min_visits=args.min_visits,
+                              min_abs_value=args.min_abs_value, dtype=args.dtype)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+Merge Q-tables trained separately into one table.
+
+Usage:
+    python merge_qtables.py output/qtable_merged.csv alice_qtable.csv bob_qtable.csv shard3.qbin
+
+Entries are combined by visit-weighted averaging (see q_table_merge.py);
+inputs and output may be CSV or .qbin. A CSV input is read together with
+its checkpoint delta log (name.delta.csv), so a training run's table can be
+merged without compacting it first.
+"""
+
+import argparse
+import os
+import sys
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from q_table_merge import merge_q_tables, table_exists
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge Q-table shards by visit-weighted averaging")
+    parser.add_argument('output', help="Merged table (.csv or .qbin)")
+    parser.add_argument('inputs', nargs='+', help="Q-table shards (.csv or .qbin)")
+    parser.add_argument('--chunk-rows', type=int, default=200000,
+                        help="Entries held in memory per sort run (default 200000)")
+    args = parser.parse_args()
+
+    missing = [path for path in args.inputs if not table_exists(path)]
+    if missing:
+        print(f"❌ Input not found: {', '.join(missing)}")
+        sys.exit(1)
+
+    start = time.time()
+    written = merge_q_tables(args.inputs, args.output, chunk_rows=args.chunk_rows)
+    print(f"✅ Merged {len(args.inputs)} tables into {args.output}: "
+          f"{written:,} entries in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test script for resumable training checkpoints: a run interrupted after a
+checkpoint and resumed must end with exactly the same Q-table, epsilon and
+games_played as an uninterrupted run.
+"""
+
+import csv
+import sys
+import os
+import random
+import tempfile
+from unittest.mock import MagicMock, patch
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Game uploads go to Supabase; mock it out like test_multiround.py does
+sys.modules.setdefault('supabase', MagicMock())
+os.environ.setdefault('SUPABASE_URL', 'http://localhost')
+os.environ.setdefault('SUPABASE_PUBLIC', 'test')
+
+import game
+game.upload_game_state = MagicMock(return_value=None)
+from game import GolfGame
+from agents import QLearningAgent
+import q_table
+from q_table import load_q_table_csv, save_q_table_csv
+from checkpoint import TrainingCheckpoint
+
+NUM_GAMES = 30
+CHECKPOINT_INTERVAL = 10
+
+
+def run_training(output_dir, stop_after=None):
+    """Minimal version of the train.py loop with checkpoints."""
+    agent = QLearningAgent(epsilon=0.3, n_bootstrap_games=0)
+    checkpoint = TrainingCheckpoint(output_dir, min_compact_rows=400)
+    run_state = checkpoint.resume(agent, NUM_GAMES)
+    start_game = run_state['run_games_done'] if run_state else 0
+
+    for game_num in range(start_game, NUM_GAMES):
+        if stop_after is not None and game_num == stop_after:
+            return agent  # simulated crash: nothing after the last checkpoint is saved
+        trajectory = []
+        g = GolfGame(num_players=2, agent_types=["qlearning", "random"], q_agents=[agent, None])
+        scores = g.play_game(verbose=False, trajectories=[trajectory, None])
+        agent.train_on_trajectory(trajectory, 1.0 if scores[0] <= scores[1] else -1.0, scores[0])
+        agent.notify_game_end()
+        agent.decay_epsilon(0.97)
+        if (game_num + 1) % CHECKPOINT_INTERVAL == 0:
+            checkpoint.save(agent, {'run_num_games': NUM_GAMES, 'run_games_done': game_num + 1,
+                                    'run_last_game_num': 0, 'trajectory_records': 0})
+    return agent
+
+
+def snapshot(agent):
+    return {s: dict(a) for s, a in agent.q_table.items() if a}, agent.epsilon, agent.games_played
+
+
+def test_resume_matches_uninterrupted_run():
+    with tempfile.TemporaryDirectory() as straight_dir, tempfile.TemporaryDirectory() as crash_dir:
+        random.seed(1234)
+        expected = snapshot(run_training(straight_dir))
+
+        random.seed(1234)
+        run_training(crash_dir, stop_after=15)   # dies 5 games after the checkpoint at 10
+        random.seed(999)                          # the resumed process starts with other RNG state
+        resumed = snapshot(run_training(crash_dir))
+
+        assert resumed[1:] == expected[1:]
+        assert resumed[0] == expected[0]
+
+        # The files on disk (base + delta) hold the same table
+        on_disk = load_q_table_csv(os.path.join(crash_dir, "qtable_train.csv"))
+        assert {s: dict(a) for s, a in on_disk.items()} == expected[0]
+
+
+def test_torn_delta_is_ignored():
+    with tempfile.TemporaryDirectory() as tmp:
+        random.seed(7)
+        agent = run_training(tmp)
+        expected = snapshot(agent)[0]
+        checkpoint = TrainingCheckpoint(tmp)
+        with open(checkpoint.delta_path, 'a', encoding='utf-8') as f:
+            f.write('"pub_()_priv_()_adv_0.0_dis_5_drawn_none_round_1",take_discard_0,12')
+        assert {s: dict(a) for s, a in load_q_table_csv(checkpoint.base_path).items()} == expected
+
+
+def test_save_folds_delta_into_meta():
+    with tempfile.TemporaryDirectory() as tmp:
+        random.seed(3)
+        agent = run_training(tmp)
+        checkpoint = TrainingCheckpoint(tmp)
+        assert checkpoint.read_meta()['delta_bytes'] > 0
+        save_q_table_csv(agent.q_table, checkpoint.base_path)
+        meta = checkpoint.read_meta()
+        assert not os.path.exists(checkpoint.delta_path)
+        assert meta['delta_bytes'] == 0 and meta['delta_rows'] == 0
+        assert meta['base_rows'] == agent.q_table.num_entries
+        # The next checkpoint appends to a fresh delta log that the metadata covers exactly
+        agent.q_table["extra_state"]["take_discard_0"] = 1.0
+        checkpoint.save(agent, meta['run'])
+        meta = checkpoint.read_meta()
+        assert meta['delta_rows'] == 1 and meta['delta_bytes'] == os.path.getsize(checkpoint.delta_path)
+
+
+def test_save_interrupted_after_new_base():
+    with tempfile.TemporaryDirectory() as tmp:
+        random.seed(4)
+        agent = run_training(tmp)
+        checkpoint = TrainingCheckpoint(tmp)
+        # A checkpoint older than the table: its delta rows must not be replayed onto the new base
+        with open(checkpoint.delta_path, 'r', encoding='utf-8') as f:
+            logged = next(row for row in csv.reader(f) if len(row) > 2)
+        agent.q_table[logged[0]][logged[1]] = 42.0
+        expected = snapshot(agent)[0]
+        with patch.object(q_table, '_update_meta', side_effect=OSError("crashed")):
+            try:
+                save_q_table_csv(agent.q_table, checkpoint.base_path)
+            except OSError:
+                pass
+        assert os.path.exists(checkpoint.delta_path) and checkpoint.read_meta()['delta_bytes'] > 0
+        assert {s: dict(a) for s, a in load_q_table_csv(checkpoint.base_path).items() if a} == expected
+
+        # Training resumes on top of the new base with a fresh delta log
+        resumed = run_training(tmp)
+        resumed.q_table["extra_state"]["take_discard_0"] = 1.0
+        checkpoint.save(resumed, checkpoint.read_meta()['run'])
+        on_disk = load_q_table_csv(checkpoint.base_path)
+        assert on_disk["extra_state"]["take_discard_0"] == 1.0
+        assert {s: dict(a) for s, a in on_disk.items() if a} == snapshot(resumed)[0]
+
+
+if __name__ == "__main__":
+    test_resume_matches_uninterrupted_run()
+    test_torn_delta_is_ignored()
+    test_save_folds_delta_into_meta()
+    test_save_interrupted_after_new_base()
+    print("✅ Checkpoint tests passed")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the columnar trajectory store: round trip, append across
+writer sessions, and game-range reads.
+"""
+
+import os
+import tempfile
+from trajectory_store import (TrajectoryWriter, TrajectoryReader, ACTION_KEYS,
+                              action_to_id, action_from_id)
+
+
+def make_trajectory(game_num):
+    """A small fake trajectory covering every action type"""
+    actions = [
+        {'type': 'take_discard', 'position': game_num % 4},
+        {'type': 'draw_deck', 'position': 1, 'keep': True},
+        {'type': 'draw_deck', 'position': None, 'keep': False, 'flip_position': 3},
+    ]
+    return [
+        {'state_key': f"pub_()_priv_(5, 7)_adv_0.0_dis_{game_num % 13}_drawn_None_round_{i + 1}",
+         'action': action, 'round': i + 1}
+        for i, action in enumerate(actions)
+    ]
+
+
+def test_action_ids_round_trip():
+    for action_id, key in enumerate(ACTION_KEYS):
+        action = action_from_id(action_id)
+        assert action_to_id(action) == action_id, key
+
+
+def test_round_trip_and_resume():
+    with tempfile.TemporaryDirectory() as tmp:
+        # Small chunks so the background thread writes several chunks
+        with TrajectoryWriter(tmp, chunk_size=4) as writer:
+            for game_num in range(1, 11):
+                writer.append_game(game_num, make_trajectory(game_num))
+
+        # A second session continues numbering without rereading history
+        writer = TrajectoryWriter(tmp)
+        assert writer.last_game_num == 10
+        writer.append_game(11, make_trajectory(11), player=1)
+        writer.close()
+
+        reader = TrajectoryReader(tmp)
+        assert len(reader) == 33
+        assert reader.last_game_num() == 11
+
+        steps = list(reader.iter_steps(4, 5))
+        assert [step['game'] for step in steps] == [4, 4, 4, 5, 5, 5]
+        expected = make_trajectory(4)
+        for step, original in zip(steps[:3], expected):
+            assert step['state_key'] == original['state_key']
+            assert step['round'] == original['round']
+            assert step['action']['type'] == original['action']['type']
+
+        last = list(reader.iter_steps(11))
+        assert len(last) == 3 and all(step['player'] == 1 for step in last)
+
+
+def test_empty_store():
+    with tempfile.TemporaryDirectory() as tmp:
+        reader = TrajectoryReader(tmp)
+        assert len(reader) == 0
+        assert reader.last_game_num() == 0
+        assert list(reader.iter_steps()) == []
+        assert not os.path.exists(os.path.join(tmp, "trajectory_train.bin"))
+
+
+if __name__ == "__main__":
+    test_action_ids_round_trip()
+    test_round_trip_and_resume()
+    test_empty_store()
+    print("✅ Trajectory store tests passed")
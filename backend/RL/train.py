@@ -62,6 +62,9 @@ os.makedirs(output_dir, exist_ok=True)
 # Import your custom modules
 from agents import * # Ensure agents.py has QLearningAgent, GPUQLearningAgent, EVAgent, RandomAgent
 from game import GolfGame # Ensure game.py has GolfGame
+from trajectory_store import TrajectoryWriter
+from q_table import QTable, load_q_table_csv, save_q_table_csv
+from checkpoint import TrainingCheckpoint
 
 # ============================================================================
 # FILE I/O UTILITIES FOR COLAB (using Google Drive paths from 'output_dir')
@@ -72,80 +75,37 @@ def get_output_path(filename):
     return os.path.join(output_dir, filename)
 
 def load_q_table_from_drive(filepath):
-    """Loads Q-table from a CSV file."""
-    q_table = defaultdict(lambda: defaultdict(float))
-    if os.path.exists(filepath):
-        try:
-            df = pd.read_csv(filepath)
-            for _, row in df.iterrows():
-                state_key = row['state_key']
-                action_key = row['action_key']
-                q_value = row['q_value']
-                q_table[state_key][action_key] = q_value
+    """Loads Q-table from a CSV file (plus its checkpoint delta log, if any)."""
+    q_table = QTable()
+    try:
+        if load_q_table_csv(filepath, q_table) is None:
+            print(f"No existing Q-table found at {filepath}. Starting fresh.")
+        else:
             print(f"Loaded Q-table from {filepath} with {len(q_table)} states.")
-        except Exception as e:
-            print(f"Error loading Q-table from {filepath}: {e}")
-            # If there's an error, it might mean the CSV is malformed or empty,
-            # so we still return an empty q_table to start fresh.
-    else:
-        print(f"No existing Q-table found at {filepath}. Starting fresh.")
+    except Exception as e:
+        print(f"Error loading Q-table from {filepath}: {e}")
+        # If there's an error, it might mean the CSV is malformed or empty,
+        # so we still return an empty q_table to start fresh.
+        q_table = QTable()
     return q_table
 
 
 def save_q_table_to_drive(q_table, filepath):
     """Saves Q-table to a CSV file."""
-    data = []
-    for state_key, actions in q_table.items():
-        for action_key, q_value in actions.items():
-            data.append({'state_key': state_key, 'action_key': action_key, 'q_value': q_value})
-    df = pd.DataFrame(data)
-    df.to_csv(filepath, index=False)
+    save_q_table_csv(q_table, filepath)
     print(f"Saved Q-table to {filepath}.")
 
-def load_trajectory_csv(filename="trajectory_train.csv"):
-    output_path = get_output_path(filename)
-    trajectory = []
-    last_game_num = 0
-    if os.path.exists(output_path):
-        with open(output_path, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-            for row in reader:
-                try:
-                    game_num = int(row['game']) if row['game'] != '?' else 0
-                except ValueError:
-                    game_num = 0 # Default to 0 if '?' or other non-int value
-                last_game_num = max(last_game_num, game_num)
-                trajectory.append(row)
-    return trajectory, last_game_num
-
-def save_trajectory_csv_full(trajectory, filename="trajectory_train.csv"):
-    output_path = get_output_path(filename)
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['game', 'round', 'state_key', 'action_key', 'action']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for step in trajectory:
-            writer.writerow(step)
-
-def save_trajectory_csv(trajectory, game_num, filename="trajectory_train.csv"):
-    output_path = get_output_path(filename)
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    file_exists = os.path.isfile(output_path)
-    with open(output_path, 'a', newline='') as csvfile:
-        fieldnames = ['game', 'round', 'state_key', 'action_key', 'action']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        if not file_exists:
-            writer.writeheader()
-        for step in trajectory:
-            row = {
-                'game': game_num,
-                'round': step.get('round', ''),
-                'state_key': step.get('state_key', ''),
-                'action_key': step.get('action_key', ''),
-                'action': str(step.get('action', '')),
-            }
-            writer.writerow(row)
+
+def save_training_checkpoint(checkpoint, agent, trajectory_writer, num_games, games_done, last_game_num,
+                             compact=False):
+    """Flush the trajectory log and checkpoint the Q-table and training state (compact: fold the delta into the base)."""
+    trajectory_writer.flush()
+    return checkpoint.save(agent, {
+        'run_num_games': num_games,
+        'run_games_done': games_done,
+        'run_last_game_num': last_game_num,
+        'trajectory_records': trajectory_writer.records_written,
+    }, compact=compact)
 
 # ============================================================================
 # GPU UTILITIES
@@ -190,7 +150,7 @@ class QLearningAgent:
         self.learning_rate = learning_rate
         self.discount_factor = discount_factor
         self.epsilon = epsilon
-        self.q_table = defaultdict(lambda: defaultdict(float))
+        self.q_table = QTable()
         self.n_bootstrap_games = n_bootstrap_games
         self.games_played = 0
         self.device = device if device else torch.device("cpu")
@@ -206,7 +166,7 @@ class QLearningAgent:
         save_q_table_to_drive(self.q_table, q_table_path)
 
     def get_q_table_size(self):
-        return len(self.q_table), sum(len(v) for v in self.q_table.values())
+        return self.q_table.size()
 
     def decay_epsilon(self, factor):
         self.epsilon *= factor
@@ -236,6 +196,7 @@ class QLearningAgent:
             # Q-learning update formula
             new_q = current_q + self.learning_rate * (reward + self.discount_factor * max_next_q - current_q)
             self.q_table[state_key][action_key] = new_q
+            self.q_table.record_visit(state_key, action_key)
 
     def notify_game_end(self):
         self.games_played += 1
@@ -324,11 +285,20 @@ def train_qlearning_agent(
     use_imitation_learning=True,
     # Training configuration
     epsilon_decay_interval=100,
-    progress_report_interval=100
+    progress_report_interval=100,
+    # Checkpointing
+    checkpoint_interval=500,
+    resume=True
 ):
     """
     Dedicated training phase for Q-learning agent with GPU support.
     Focus on training first, then return the trained agent for analysis.
+
+    Every checkpoint_interval games the Q-entries changed since the previous
+    checkpoint are appended to a delta log next to qtable_train.csv. If a run
+    with the same num_games was interrupted, resume=True continues it from the
+    last checkpoint with the same games_played, epsilon and RNG state.
+    training_stats only cover the games played in this call.
     """
     print("="*70)
     print("Q-LEARNING AGENT TRAINING PHASE")
@@ -375,12 +345,17 @@ def train_qlearning_agent(
     else:
         raise ValueError(f"Unknown opponent type: {opponent_type}")
 
-    # Load Q-table from previous run if available (now from Google Drive)
-    agent.load_q_table_csv()
+    # Load Q-table (base snapshot + checkpoint deltas) from previous runs,
+    # restoring the training state too if the last run was interrupted
+    checkpoint = TrainingCheckpoint(output_dir)
+    run_state = checkpoint.resume(agent, num_games, restore_run=resume)
+    start_game = run_state['run_games_done'] if run_state else 0
 
-    # Load trajectory from previous run if available (now from Google Drive)
-    trajectory, last_game_num = load_trajectory_csv()
-    new_trajectory_steps = []
+    # Trajectories are appended to the columnar store in the background;
+    # game numbering continues from the last game already logged.
+    trajectory_writer = TrajectoryWriter(
+        output_dir, keep_records=run_state['trajectory_records'] if run_state else None)
+    last_game_num = run_state['run_last_game_num'] if run_state else trajectory_writer.last_game_num
 
     # Training statistics
     training_stats = {
@@ -391,6 +366,8 @@ def train_qlearning_agent(
         'opponent_scores': [],
         'qtable_states': [],
         'qtable_entries': [],
+        'qtable_new_states': [],
+        'qtable_new_entries': [],
         'epsilon_values': [],
         'training_times': []
     }
@@ -409,7 +386,7 @@ def train_qlearning_agent(
         print(f"  • Bootstrapping: Disabled")
     print(f"  • Progress reports: Every {progress_report_interval} games")
 
-    game_iter = trange(num_games, desc="Training Q-learning agent")
+    game_iter = trange(start_game, num_games, desc="Training Q-learning agent")
     total_sim_time = 0.0
     total_q_time = 0.0
     for game_num_abs in game_iter:
@@ -443,36 +420,38 @@ def train_qlearning_agent(
                         reward = -10.0
                 agent.train_on_trajectory(traj, reward, score)
                 agent.notify_game_end()
-                if idx == 0:
-                    save_trajectory_csv(traj, current_game_num)
-                for step in traj:
-                    step_to_save = {
-                        'game': current_game_num,
-                        'round': step.get('round', ''),
-                        'state_key': step.get('state_key', ''),
-                        'action_key': step.get('action_key', ''),
-                        'action': str(step.get('action', '')),
-                    }
-                    new_trajectory_steps.append(step_to_save)
+                trajectory_writer.append_game(current_game_num, traj, player=idx)
         end_q = time.perf_counter()
         q_time = end_q - start_q
         total_q_time += q_time
 
         training_stats['games_played'] += 1
+        if game_scores.index(min(game_scores)) == 0:
+            training_stats['wins'] += 1
+        else:
+            training_stats['losses'] += 1
         training_stats['scores'].append(game_scores[0])
         training_stats['opponent_scores'].append(game_scores[1])
         training_stats['training_times'].append(time.time() - start_time)
 
         states, entries = agent.get_q_table_size()
+        new_states, new_entries = agent.q_table.interval_growth()
         training_stats['qtable_states'].append(states)
         training_stats['qtable_entries'].append(entries)
+        training_stats['qtable_new_states'].append(new_states)
+        training_stats['qtable_new_entries'].append(new_entries)
         training_stats['epsilon_values'].append(agent.epsilon)
 
         if epsilon_decay_interval and (game_num_abs + 1) % epsilon_decay_interval == 0:
             agent.decay_epsilon(factor=epsilon_decay_factor)
 
+        if checkpoint_interval and (game_num_abs + 1) % checkpoint_interval == 0 and game_num_abs + 1 < num_games:
+            save_training_checkpoint(checkpoint, agent, trajectory_writer,
+                                     num_games, game_num_abs + 1, last_game_num)
+
         if verbose and (game_num_abs + 1) % progress_report_interval == 0:
-            win_rate = training_stats['wins'] / (game_num_abs + 1)
+            # Stats cover this run only, so a resumed run divides by the games it played itself
+            win_rate = training_stats['wins'] / training_stats['games_played']
             avg_score = np.mean(training_stats['scores'])
             avg_time = np.mean(training_stats['training_times'])
             bootstrap_status = "BOOTSTRAP" if game_num_abs < n_bootstrap_games else "Q-LEARNING"
@@ -480,19 +459,20 @@ def train_qlearning_agent(
                   f"Avg score={avg_score:.2f}, States={states}, Epsilon={agent.epsilon:.3f}, "
                   f"Avg time={avg_time:.3f}s")
 
-    final_win_rate = training_stats['wins'] / num_games
+    games_this_run = max(training_stats['games_played'], 1)
+    final_win_rate = training_stats['wins'] / games_this_run
     final_avg_score = np.mean(training_stats['scores'])
     final_states, final_entries = agent.get_q_table_size()
     total_time = sum(training_stats['training_times'])
 
     print(f"\n🎯 TRAINING COMPLETE!")
-    print(f"   • Games played: {num_games}")
-    print(f"   • Win rate: {final_win_rate:.2%} ({training_stats['wins']}/{num_games})")
+    print(f"   • Games played: {training_stats['games_played']} this run ({num_games} in total)")
+    print(f"   • Win rate: {final_win_rate:.2%} ({training_stats['wins']}/{training_stats['games_played']})")
     print(f"   • Average score: {final_avg_score:.2f}")
     print(f"   • Final Q-table: {final_states} states, {final_entries} entries")
     print(f"   • Final epsilon: {agent.epsilon:.3f}")
     print(f"   • Total training time: {total_time:.2f}s")
-    print(f"   • Average time per game: {total_time/num_games:.3f}s")
+    print(f"   • Average time per game: {total_time/games_this_run:.3f}s")
     print(f"   • Total simulation time: {total_sim_time:.2f}s")
     print(f"   • Total Q-table update time: {total_q_time:.2f}s")
     if use_imitation_learning:
@@ -501,10 +481,11 @@ def train_qlearning_agent(
         print(f"   • Bootstrapping phase: {bootstrap_games} games")
         print(f"   • Q-learning phase: {qlearning_games} games")
 
-    full_trajectory = trajectory + new_trajectory_steps
-    save_trajectory_csv_full(full_trajectory)
-
-    agent.save_q_table_csv() # Save the final Q-table to Google Drive
+    # Final checkpoint marks the run complete and compacts, so qtable_train.csv is current on its own
+    save_time = save_training_checkpoint(checkpoint, agent, trajectory_writer,
+                                         num_games, num_games, last_game_num, compact=True)
+    trajectory_writer.close()
+    print(f"   • Q-table checkpoint saved in {save_time:.2f}s")
 
     return agent, training_stats
 
@@ -522,10 +503,14 @@ def train_qlearning_agent_batch(
     n_bootstrap_games=250,
     use_imitation_learning=True,
     epsilon_decay_interval=100,
-    progress_report_interval=100
+    progress_report_interval=100,
+    checkpoint_interval=500,
+    resume=True
 ):
     """
     Batch training for better GPU utilization - plays multiple games simultaneously.
+    Checkpoints are taken at the first batch boundary after every
+    checkpoint_interval games (see train_qlearning_agent).
     """
     print("="*70)
     print("BATCH Q-LEARNING AGENT TRAINING PHASE")
@@ -556,9 +541,11 @@ def train_qlearning_agent_batch(
     else:
         raise ValueError(f"Unknown opponent type: {opponent_type}")
 
-    agent.load_q_table_csv()
-    trajectory, last_game_num = load_trajectory_csv()
-    new_trajectory_steps = []
+    checkpoint = TrainingCheckpoint(output_dir)
+    run_state = checkpoint.resume(agent, num_games, restore_run=resume)
+    trajectory_writer = TrajectoryWriter(
+        output_dir, keep_records=run_state['trajectory_records'] if run_state else None)
+    last_game_num = run_state['run_last_game_num'] if run_state else trajectory_writer.last_game_num
 
     training_stats = {
         'games_played': 0,
@@ -568,6 +555,8 @@ def train_qlearning_agent_batch(
         'opponent_scores': [],
         'qtable_states': [],
         'qtable_entries': [],
+        'qtable_new_states': [],
+        'qtable_new_entries': [],
         'epsilon_values': [],
         'training_times': []
     }
@@ -582,9 +571,11 @@ def train_qlearning_agent_batch(
         batch_size = num_games
         num_batches = 1
 
+    start_batch = run_state['run_games_done'] // batch_size if run_state else 0
+
     total_sim_time = 0.0
     total_q_time = 0.0
-    for batch_idx in trange(num_batches, desc="Training batches"):
+    for batch_idx in trange(start_batch, num_batches, desc="Training batches"):
         batch_start_time = time.time()
 
         games_in_batch = min(batch_size, num_games - batch_idx * batch_size)
@@ -621,16 +612,7 @@ def train_qlearning_agent_batch(
             training_stats['games_played'] += 1
             training_stats['scores'].append(game_scores[0])
             training_stats['opponent_scores'].append(game_scores[1])
-            save_trajectory_csv(trajectory, current_game_num)
-            for step in trajectory:
-                step_to_save = {
-                    'game': current_game_num,
-                    'round': step.get('round', ''),
-                    'state_key': step.get('state_key', ''),
-                    'action_key': step.get('action_key', ''),
-                    'action': str(step.get('action', '')),
-                }
-                new_trajectory_steps.append(step_to_save)
+            trajectory_writer.append_game(current_game_num, trajectory)
         end_sim = time.perf_counter()
         sim_time = end_sim - start_sim
         total_sim_time += sim_time
@@ -652,14 +634,24 @@ def train_qlearning_agent_batch(
         training_stats['training_times'].extend([batch_time / games_in_batch] * games_in_batch)
 
         states, entries = agent.get_q_table_size()
+        # Growth is recorded once per batch
+        new_states, new_entries = agent.q_table.interval_growth()
+        training_stats['qtable_new_states'].append(new_states)
+        training_stats['qtable_new_entries'].append(new_entries)
         for _ in range(games_in_batch):
             training_stats['qtable_states'].append(states)
             training_stats['qtable_entries'].append(entries)
             training_stats['epsilon_values'].append(agent.epsilon)
 
-        if epsilon_decay_interval and (training_stats['games_played']) % epsilon_decay_interval == 0:
+        games_done = batch_idx * batch_size + games_in_batch
+        if epsilon_decay_interval and games_done % epsilon_decay_interval == 0:
             agent.decay_epsilon(factor=epsilon_decay_factor)
 
+        if (checkpoint_interval and games_done < num_games and
+                games_done // checkpoint_interval > (games_done - games_in_batch) // checkpoint_interval):
+            save_training_checkpoint(checkpoint, agent, trajectory_writer,
+                                     num_games, games_done, last_game_num)
+
         report_every_batches = max(1, progress_report_interval // batch_size)
         if verbose and (batch_idx + 1) % report_every_batches == 0:
             games_so_far = training_stats['games_played']
@@ -682,27 +674,28 @@ def train_qlearning_agent_batch(
               f"Avg score={avg_score:.2f}, States={final_states}, Epsilon={agent.epsilon:.3f}, "
               f"Avg time={avg_time:.3f}s")
 
-    final_win_rate = training_stats['wins'] / num_games
+    games_this_run = max(training_stats['games_played'], 1)
+    final_win_rate = training_stats['wins'] / games_this_run
     final_avg_score = np.mean(training_stats['scores'])
     final_states, final_entries = agent.get_q_table_size()
     total_time = sum(training_stats['training_times'])
 
     print(f"\n🎯 BATCH TRAINING COMPLETE!")
-    print(f"   • Games played: {num_games}")
+    print(f"   • Games played: {training_stats['games_played']} this run ({num_games} in total)")
     print(f"   • Batch size: {batch_size}")
-    print(f"   • Win rate: {final_win_rate:.2%} ({training_stats['wins']}/{num_games})")
+    print(f"   • Win rate: {final_win_rate:.2%} ({training_stats['wins']}/{training_stats['games_played']})")
     print(f"   • Average score: {final_avg_score:.2f}")
     print(f"   • Final Q-table: {final_states} states, {final_entries} entries")
     print(f"   • Final epsilon: {agent.epsilon:.3f}")
     print(f"   • Total training time: {total_time:.2f}s")
-    print(f"   • Average time per game: {total_time/num_games:.3f}s")
+    print(f"   • Average time per game: {total_time/games_this_run:.3f}s")
     print(f"   • Total simulation time: {total_sim_time:.2f}s")
     print(f"   • Total Q-table update time: {total_q_time:.2f}s")
 
-    full_trajectory = trajectory + new_trajectory_steps
-    save_trajectory_csv_full(full_trajectory)
-
-    agent.save_q_table_csv() # Save the final Q-table to Google Drive
+    save_time = save_training_checkpoint(checkpoint, agent, trajectory_writer,
+                                         num_games, num_games, last_game_num, compact=True)
+    trajectory_writer.close()
+    print(f"   • Q-table checkpoint saved in {save_time:.2f}s")
 
     return agent, training_stats
 
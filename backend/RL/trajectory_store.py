@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Columnar Trajectory Store
+
+Training trajectories are logged as fixed-width integer records instead of
+CSV rows. State keys are interned into an append-only vocabulary file and
+actions are stored as small integer ids, so every step is a single 12-byte
+record. Records are buffered in memory and written in chunks by a background
+thread, so the training loop never waits on disk and never rereads history.
+
+Files written for a prefix such as ``trajectory_train``:
+    trajectory_train.bin          - packed records (see TRAJECTORY_DTYPE)
+    trajectory_train.states.txt   - one state key per line, line number = id
+"""
+
+import os
+import queue
+import threading
+import numpy as np
+
+# One record per trajectory step. Games are appended in increasing order,
+# which lets readers binary-search the game column for a range.
+TRAJECTORY_DTYPE = np.dtype([
+    ('game', '<i4'),
+    ('round', '<i1'),
+    ('player', '<i1'),
+    ('action', '<i2'),
+    ('state', '<i4'),
+])
+
+# Every legal action in the game, in a fixed order. The index is the action id.
+ACTION_KEYS = (
+    [f"take_discard_{pos}" for pos in range(4)] +
+    [f"draw_deck_{pos}" for pos in range(4)] +
+    [f"draw_deck_flip_{pos}" for pos in range(4)]
+)
+ACTION_IDS = {key: idx for idx, key in enumerate(ACTION_KEYS)}
+NUM_ACTIONS = len(ACTION_KEYS)
+
+
+def action_to_id(action):
+    """Map an action dict (as produced by the agents) to its integer id."""
+    if action['type'] == 'take_discard':
+        return action['position']
+    if action.get('keep', True):
+        return 4 + action['position']
+    return 8 + action['flip_position']
+
+
+def action_from_id(action_id):
+    """Rebuild the action dict for an integer action id."""
+    action_id = int(action_id)
+    if action_id < 4:
+        return {'type': 'take_discard', 'position': action_id}
+    if action_id < 8:
+        return {'type': 'draw_deck', 'position': action_id - 4, 'keep': True}
+    return {'type': 'draw_deck', 'position': None, 'keep': False, 'flip_position': action_id - 8}
+
+
+def _store_paths(directory, prefix):
+    return (os.path.join(directory, f"{prefix}.bin"),
+            os.path.join(directory, f"{prefix}.states.txt"))
+
+
+def _read_state_keys(states_path):
+    if not os.path.exists(states_path):
+        return []
+    with open(states_path, 'r', encoding='utf-8') as f:
+        return f.read().splitlines()
+
+
+class TrajectoryWriter:
+    """
+    Buffered appender for training trajectories.
+
+    append_game() only copies integers into a preallocated buffer; full buffers
+    are handed to a background thread which appends them to disk. Call flush()
+    to wait for everything queued so far, and close() when training ends.
+    """
+
+    def __init__(self, directory, prefix="trajectory_train", chunk_size=65536, keep_records=None):
+        os.makedirs(directory, exist_ok=True)
+        self.records_path, self.states_path = _store_paths(directory, prefix)
+        self.chunk_size = chunk_size
+
+        # Drop a partial record left by an interrupted write so appends stay
+        # aligned. When resuming from a checkpoint, also drop records logged
+        # after it so replayed games are not stored twice.
+        if os.path.exists(self.records_path):
+            size = os.path.getsize(self.records_path)
+            keep_bytes = size - size % TRAJECTORY_DTYPE.itemsize
+            if keep_records is not None:
+                keep_bytes = min(keep_bytes, keep_records * TRAJECTORY_DTYPE.itemsize)
+            if keep_bytes != size:
+                with open(self.records_path, 'r+b') as f:
+                    f.truncate(keep_bytes)
+
+        # The vocabulary file is small compared to the records, so it is
+        # loaded once to keep ids stable across runs.
+        self._state_ids = {key: idx for idx, key in enumerate(_read_state_keys(self.states_path))}
+        self._new_keys = []
+
+        self._buffer = np.empty(chunk_size, dtype=TRAJECTORY_DTYPE)
+        self._fill = 0
+        reader = TrajectoryReader(directory, prefix)
+        self.last_game_num = reader.last_game_num()
+        self.records_written = len(reader)
+
+        self._queue = queue.Queue(maxsize=8)
+        self._error = None
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def _state_id(self, state_key):
+        state_id = self._state_ids.get(state_key)
+        if state_id is None:
+            state_id = len(self._state_ids)
+            self._state_ids[state_key] = state_id
+            self._new_keys.append(state_key)
+        return state_id
+
+    def append_game(self, game_num, trajectory, player=0):
+        """Queue every step of one player's trajectory for the given game."""
+        for step in trajectory:
+            if self._fill == self.chunk_size:
+                self._hand_off()
+            self._buffer[self._fill] = (game_num, step.get('round') or 0, player,
+                                        action_to_id(step['action']),
+                                        self._state_id(step['state_key']))
+            self._fill += 1
+        self.records_written += len(trajectory)
+        self.last_game_num = max(self.last_game_num, game_num)
+
+    def _hand_off(self):
+        if self._error is not None:
+            raise self._error
+        if self._fill == 0 and not self._new_keys:
+            return
+        self._queue.put((self._buffer[:self._fill], self._new_keys))
+        self._buffer = np.empty(self.chunk_size, dtype=TRAJECTORY_DTYPE)
+        self._fill = 0
+        self._new_keys = []
+
+    def _write_loop(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                records, new_keys = item
+                # New keys go to disk before the records that reference them.
+                if new_keys:
+                    with open(self.states_path, 'a', encoding='utf-8') as f:
+                        f.write('\n'.join(new_keys) + '\n')
+                if len(records):
+                    with open(self.records_path, 'ab') as f:
+                        f.write(records.tobytes())
+            except Exception as e:
+                self._error = e
+                print(f"❌ Trajectory writer failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """Write out everything appended so far and wait for the disk writes."""
+        self._hand_off()
+        self._queue.join()
+        if self._error is not None:
+            raise self._error
+
+    def close(self):
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class TrajectoryReader:
+    """
+    Lazy reader for a trajectory store.
+
+    Records are memory-mapped, so opening the store and looking up a game range
+    only touches the pages that are actually read. State keys are decoded on
+    demand from the vocabulary file.
+    """
+
+    def __init__(self, directory, prefix="trajectory_train"):
+        self.records_path, self.states_path = _store_paths(directory, prefix)
+        self._records = None
+        self._state_keys = None
+
+    @property
+    def records(self):
+        if self._records is None:
+            size = os.path.getsize(self.records_path) if os.path.exists(self.records_path) else 0
+            count = size // TRAJECTORY_DTYPE.itemsize
+            if count == 0:
+                self._records = np.empty(0, dtype=TRAJECTORY_DTYPE)
+            else:
+                # Ignore a trailing partial record left by an interrupted write.
+                self._records = np.memmap(self.records_path, dtype=TRAJECTORY_DTYPE,
+                                          mode='r', shape=(count,))
+        return self._records
+
+    @property
+    def state_keys(self):
+        if self._state_keys is None:
+            self._state_keys = _read_state_keys(self.states_path)
+        return self._state_keys
+
+    def __len__(self):
+        return len(self.records)
+
+    def last_game_num(self):
+        """Highest game number in the store, read from the final record only."""
+        records = self.records
+        return int(records[-1]['game']) if len(records) else 0
+
+    def read_games(self, first_game=None, last_game=None):
+        """Records for games in [first_game, last_game] (inclusive, either end open)."""
+        records = self.records
+        games = records['game']
+        start = 0 if first_game is None else int(np.searchsorted(games, first_game, side='left'))
+        end = len(records) if last_game is None else int(np.searchsorted(games, last_game, side='right'))
+        return records[start:end]
+
+    def iter_steps(self, first_game=None, last_game=None):
+        """
+        Yield trajectory steps as dicts with the same fields the CSV log had
+        (game, round, state_key, action_key, action), plus player.
+        """
+        state_keys = self.state_keys
+        for record in self.read_games(first_game, last_game):
+            action_id = int(record['action'])
+            yield {
+                'game': int(record['game']),
+                'round': int(record['round']),
+                'player': int(record['player']),
+                'state_key': state_keys[int(record['state'])],
+                'action_key': ACTION_KEYS[action_id],
+                'action': action_from_id(action_id),
+            }
@@ -1,12 +1,21 @@
 import random
 import itertools
+import numpy as np
 from collections import defaultdict
 # Import from same directory
 from models import Card
 from probabilities import expected_value_draw_vs_discard
+from q_table import QTable, load_q_table_csv, save_q_table_csv
+from state_canonical import canonical_ranks, canonical_action_key, IDENTITY
+from teacher_cache import TeacherCache
+from features import FEATURE_DIM, ACTION_TYPES, encode_state, encode_actions
 import csv
 import os
 
+from app_log import get_logger
+
+log = get_logger('agents')
+
 # Add PyTorch imports for GPU support  asdf
 try:
     import torch
@@ -15,7 +24,7 @@ try:
     TORCH_AVAILABLE = True
 except ImportError:
     TORCH_AVAILABLE = False
-    print("Warning: PyTorch not available. GPUQLearningAgent will not work.")
+    log.info("Warning: PyTorch not available. GPUQLearningAgent will not work.")
 
 class RandomAgent:
     """Random agent that makes random legal moves"""
@@ -250,6 +259,7 @@ class HeuristicAgent:
     def evaluate_draw_deck_action(self, position, player, deck_probs, baseline_expected):
         """Evaluate drawing from deck and expected outcome at position"""
         total_expected_score = 0
+        unknown_score = player.expected_score_for_unknown_position(deck_probs)  # same for every draw
 
         for rank, prob in deck_probs.items():
             if prob == 0:
@@ -266,55 +276,79 @@ class HeuristicAgent:
             unknown_expected = 0
             for i in range(4):
                 if not new_known[i]:
-                    unknown_expected += player.expected_score_for_unknown_position(deck_probs)
+                    unknown_expected += unknown_score
 
             total_score = known_score + unknown_expected
             total_expected_score += prob * total_score
 
         return baseline_expected - total_expected_score
 
-class QLearningAgent:
-    """Q-learning agent that actually learns from experience"""
-    def __init__(self, learning_rate=0.1, discount_factor=0.9, epsilon=0.2, n_bootstrap_games=250):
+class LearningAgent:
+    """
+    What the learning agents (tabular, linear and DQN) share: hyperparameters,
+    EV-teacher bootstrapping, epsilon decay, legal actions and the state /
+    action keys recorded in trajectories. Subclasses provide choose_action,
+    train_on_trajectory and get_q_table_size.
+    """
+    def __init__(self, learning_rate, discount_factor, epsilon, n_bootstrap_games,
+                 canonical_states=False, teacher_cache=None):
         self.learning_rate = learning_rate
         self.discount_factor = discount_factor
         self.epsilon = epsilon
-        self.q_table = defaultdict(lambda: defaultdict(float))
         self.training_mode = True
         self.n_bootstrap_games = n_bootstrap_games
         self.games_played = 0
+        self.canonical_states = canonical_states
+        # Memoized EV analysis / EV-teacher actions, shareable between agents and runs
+        self.teacher_cache = teacher_cache if teacher_cache is not None else TeacherCache()
 
-    def get_state_key(self, player, game_state):
-        from probabilities import expected_value_draw_vs_discard
-
+    def _state_ranks(self, player, game_state):
+        """Ranks that appear in the state key: public, private, discard and drawn card."""
         # Separate public cards (flipped, visible to all) from private cards (known only to this player)
         public_cards = tuple(sorted(card.rank for i, card in enumerate(player.grid)
                                   if card and player.known[i]))
         private_cards = tuple(sorted(card.rank for i, card in enumerate(player.grid)
                                    if card and player.privately_visible[i] and not player.known[i]))
+        # Discard card rank (since score isn't useful for Jacks)
+        discard_rank = game_state.discard_pile[-1].rank if game_state.discard_pile else 'none'
+        if getattr(game_state, 'drawn_card', None):
+            drawn_card_str = game_state.drawn_card.rank
+        else:
+            drawn_card_str = 'none'
+        if self.canonical_states:
+            return canonical_ranks(public_cards, private_cards, discard_rank, drawn_card_str)
+        return public_cards, private_cards, discard_rank, drawn_card_str, IDENTITY
+
+    def get_rank_relabel(self, player, game_state):
+        """Rank relabeling used by the canonical state key (identity when canonical_states is off)."""
+        if not self.canonical_states:
+            return IDENTITY
+        return self._state_ranks(player, game_state)[4]
 
-        # Get EV analysis to inform state representation
-        ev_analysis = expected_value_draw_vs_discard(game_state, player)
+    def get_state_key(self, player, game_state, ev_analysis=None):
+        public_cards, private_cards, discard_rank, drawn_card_str, _ = self._state_ranks(player, game_state)
+
+        # Get EV analysis to inform state representation (callers may pass one they already have)
+        if ev_analysis is None:
+            ev_analysis = self.teacher_cache.ev(player, game_state)
 
         # Use draw advantage (key decision factor) - bucket to reduce state space
         draw_advantage = ev_analysis.get('draw_advantage', 0)
         advantage_bucket = round(draw_advantage * 2) / 2  # Round to nearest 0.5
 
-        # Discard card rank (since score isn't useful for Jacks)
-        discard_rank = game_state.discard_pile[-1].rank if game_state.discard_pile else 'none'
-
         # Round number
         round_num = game_state.round
 
-        if getattr(game_state, 'drawn_card', None):
-            drawn_card_str = game_state.drawn_card.rank
-        else:
-            drawn_card_str = 'none'
         # Add drawn_card_str to the state key
         return f"pub_{public_cards}_priv_{private_cards}_adv_{advantage_bucket}_dis_{discard_rank}_drawn_{drawn_card_str}_round_{round_num}"
 
-    def get_action_key(self, action):
-        """Convert action to a string key"""
+    def get_action_key(self, action, player=None, relabel=IDENTITY):
+        """
+        Convert action to a string key. With canonical_states and a player,
+        the position is replaced by its visibility class.
+        """
+        if self.canonical_states and player is not None:
+            return canonical_action_key(action, player, relabel)
         if action['type'] == 'draw_deck' and not action.get('keep', True):
             # For draw-discard-flip actions, use flip_position
             return f"{action['type']}_flip_{action['flip_position']}"
@@ -322,7 +356,8 @@ class QLearningAgent:
             # For take_discard and draw_deck_keep actions, use position
             return f"{action['type']}_{action['position']}"
 
-    def get_legal_actions(self, player, game_state):
+    @staticmethod
+    def get_legal_actions(player, game_state):
         """Get all legal actions for the current game state"""
         actions = []
 
@@ -349,6 +384,38 @@ class QLearningAgent:
 
         return actions
 
+    def notify_game_end(self):
+        self.games_played += 1
+
+    def set_training_mode(self, training):
+        """Enable or disable training mode"""
+        self.training_mode = training
+
+    def decay_epsilon(self, factor=0.995):
+        """Decay epsilon for better exploration/exploitation balance"""
+        self.epsilon = max(0.01, self.epsilon * factor)
+
+
+class QLearningAgent(LearningAgent):
+    """
+    Q-learning agent that actually learns from experience.
+
+    With canonical_states=True, equivalent states and actions share Q-entries
+    (10/Q/K relabeling and position classes, see state_canonical.py). Tables
+    trained with and without it use different keys and are not interchangeable.
+    """
+    def __init__(self, learning_rate=0.1, discount_factor=0.9, epsilon=0.2, n_bootstrap_games=250,
+                 canonical_states=False, replay_buffer=None, replay_batch_size=256, replay_steps=1,
+                 teacher_cache=None):
+        super().__init__(learning_rate, discount_factor, epsilon, n_bootstrap_games,
+                         canonical_states=canonical_states, teacher_cache=teacher_cache)
+        self.q_table = QTable()
+        # Optional TransitionBuffer (replay_buffer.py): each game is also replayed
+        # in prioritized minibatches after the usual in-order pass
+        self.replay_buffer = replay_buffer
+        self.replay_batch_size = replay_batch_size
+        self.replay_steps = replay_steps
+
     def choose_action(self, player, game_state, trajectory=None):
         legal_actions = self.get_legal_actions(player, game_state)
         if not legal_actions:
@@ -356,8 +423,7 @@ class QLearningAgent:
 
         # Bootstrapping phase: use EVAgent for first n_bootstrap_games
         if self.games_played < self.n_bootstrap_games:
-            ev_agent = EVAgent()
-            action = ev_agent.choose_action(player, game_state)
+            action = self.teacher_cache.teacher_action(player, game_state)
             if action not in legal_actions:
                 action = random.choice(legal_actions)
         else:
@@ -382,10 +448,12 @@ class QLearningAgent:
                 action = random.choice(type_groups[chosen_type])
             else:
                 state_key = self.get_state_key(player, game_state)
+                relabel = self.get_rank_relabel(player, game_state)
                 best_action = None
                 best_value = float('-inf')
+                # Equivalent canonical actions share a key; the first (lowest position) wins ties
                 for action_candidate in legal_actions:
-                    action_key = self.get_action_key(action_candidate)
+                    action_key = self.get_action_key(action_candidate, player, relabel)
                     q_value = self.q_table[state_key][action_key]
                     if q_value > best_value:
                         best_value = q_value
@@ -395,7 +463,7 @@ class QLearningAgent:
         # Record trajectory if provided
         if trajectory is not None:
             state_key = self.get_state_key(player, game_state)
-            action_key = self.get_action_key(action)
+            action_key = self.get_action_key(action, player, self.get_rank_relabel(player, game_state))
             trajectory.append({
                 'state_key': state_key,
                 'action_key': action_key,
@@ -404,19 +472,18 @@ class QLearningAgent:
             })
         return action
 
-    def notify_game_end(self):
-        self.games_played += 1
-
     def update(self, state_key, action_key, reward, next_state_key, next_actions):
         """Update Q-values using Q-learning update rule"""
         max_next_q = 0
         if next_actions:
-            max_next_q = max(self.q_table[next_state_key][self.get_action_key(a)]
+            # next_actions may be action dicts or already-computed action keys
+            max_next_q = max(self.q_table[next_state_key][a if isinstance(a, str) else self.get_action_key(a)]
                            for a in next_actions)
 
         current_q = self.q_table[state_key][action_key]
         new_q = current_q + self.learning_rate * (reward + self.discount_factor * max_next_q - current_q)
         self.q_table[state_key][action_key] = new_q
+        self.q_table.record_visit(state_key, action_key)
 
     def train_on_trajectory(self, trajectory, final_reward, final_score):
         """Train the agent on a complete game trajectory with improved rewards"""
@@ -437,7 +504,7 @@ class QLearningAgent:
             if i < len(trajectory) - 1:
                 next_step = trajectory[i + 1]
                 next_state_key = next_step['state_key']
-                next_actions = [next_step['action']]
+                next_actions = [next_step['action_key']]
             else:
                 next_state_key = state_key  # Terminal state
                 next_actions = []
@@ -446,56 +513,81 @@ class QLearningAgent:
 
             self.update(state_key, action_key, immediate_reward, next_state_key, next_actions)
 
-    def set_training_mode(self, training):
-        """Enable or disable training mode"""
-        self.training_mode = training
+        if self.replay_buffer is not None:
+            self.replay_buffer.add_trajectory(trajectory, final_reward)
+            for _ in range(self.replay_steps):
+                self.train_from_replay(self.replay_buffer, self.replay_batch_size)
+
+    def train_from_replay(self, buffer, batch_size=256):
+        """
+        Q-learning updates for a minibatch sampled from a TransitionBuffer.
+        The step size is scaled by the importance weight of each sample, and
+        the buffer's priorities are refreshed with the new TD errors.
+        """
+        if len(buffer) == 0:
+            return None
+        slots, weights = buffer.sample(batch_size)
+        state_keys, action_keys = buffer.states.keys, buffer.actions.keys
+        td_errors = np.empty(len(slots), dtype=np.float32)
+        for i, slot in enumerate(slots):
+            state_key = state_keys[buffer.state[slot]]
+            action_key = action_keys[buffer.action[slot]]
+            max_next_q = 0.0
+            if not buffer.done[slot]:
+                # Best known action in the next state, without inserting empty rows
+                next_row = dict.get(self.q_table, state_keys[buffer.next_state[slot]])
+                if next_row:
+                    max_next_q = max(next_row.values())
+            current_q = self.q_table[state_key][action_key]
+            td_error = buffer.reward[slot] + self.discount_factor * max_next_q - current_q
+            self.q_table[state_key][action_key] = current_q + self.learning_rate * weights[i] * td_error
+            self.q_table.record_visit(state_key, action_key)
+            td_errors[i] = td_error
+        buffer.update_priorities(slots, td_errors)
+        return td_errors
 
     def get_q_table_size(self):
-        """Get the size of the Q-table for debugging"""
-        total_entries = sum(len(actions) for actions in self.q_table.values())
-        return len(self.q_table), total_entries
-
-    def decay_epsilon(self, factor=0.995):
-        """Decay epsilon for better exploration/exploitation balance"""
-        self.epsilon = max(0.01, self.epsilon * factor)
+        """Get the size of the Q-table (states, entries) from its running counters"""
+        return self.q_table.size()
 
     def save_q_table_csv(self, filename="qtable_train.csv"):
         output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'RL', 'output')
         os.makedirs(output_dir, exist_ok=True)
         output_path = os.path.join(output_dir, filename)
-        with open(output_path, 'w', newline='') as csvfile:
-            writer = csv.writer(csvfile)
-            writer.writerow(['state_key', 'action_key', 'q_value'])
-            for state_key, actions in self.q_table.items():
-                for action_key, q_value in actions.items():
-                    writer.writerow([state_key, action_key, q_value])
-        print(f"Q-table saved to {output_path}")
+        save_q_table_csv(self.q_table, output_path)
+        log.info(f"Q-table saved to {output_path}")
 
     def load_q_table_csv(self, filename="qtable_train.csv"):
         output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'RL', 'output')
         output_path = os.path.join(output_dir, filename)
+        # Also replays the checkpoint delta log written during training, if present
+        if load_q_table_csv(output_path, self.q_table) is None:
+            log.info(f"No Q-table file found at {output_path}, starting fresh.")
+            return
+        log.info(f"Loaded Q-table from {output_path}")
+
+    def load_deployment_artifact(self, filename="qtable_deploy.npz"):
+        """Act from a pruned/quantized artifact (q_table_deploy.py); read-only, so training is switched off."""
+        from q_table_deploy import DeployedQTable
+        output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'RL', 'output', filename)
         if not os.path.exists(output_path):
-            print(f"No Q-table file found at {output_path}, starting fresh.")
+            log.info(f"No Q-table deployment artifact found at {output_path}, starting fresh.")
             return
-        with open(output_path, 'r', newline='') as csvfile:
-            reader = csv.reader(csvfile)
-            header = next(reader, None)
-            for row in reader:
-                if len(row) < 3:
-                    continue
-                state_key, action_key, q_value = row[0], row[1], row[2]
-                try:
-                    self.q_table[state_key][action_key] = float(q_value)
-                except ValueError:
-                    continue
-        print(f"Loaded Q-table from {output_path}")
+        self.q_table = DeployedQTable.load(output_path)
+        self.training_mode = False
+        self.n_bootstrap_games = 0
+        log.info(f"Loaded Q-table deployment artifact from {output_path}")
 
 class EVAgent:
     def choose_action(self, player, game, trajectory=None):
-        ev = expected_value_draw_vs_discard(game, player)  # Pass the correct player
         available_positions = [i for i, known in enumerate(player.known) if not known]
         if not available_positions:
             return None  # No moves
+        ev = expected_value_draw_vs_discard(game, player)  # Pass the correct player
+        return self.action_from_ev(ev, available_positions)
+
+    def action_from_ev(self, ev, available_positions):
+        """The EV-greedy action for an already computed expected_value_draw_vs_discard() result."""
 
         # Determine which action is better based on EV values, not just recommendation text
         draw_ev = ev.get('draw_expected_value', 0)
@@ -734,6 +826,106 @@ class AdvancedEVAgent(EVAgent):
         self.pair_memory = {}
 
 
+# ============================================================================
+# LINEAR FUNCTION-APPROXIMATION Q-LEARNING AGENT
+# ============================================================================
+
+class LinearQAgent(LearningAgent):
+    """
+    Q-learning with a linear model over fixed-size features (see features.py)
+    instead of a table keyed by state strings.
+
+    Q(s, a) = features(s, a) . weights[type(a)], with one weight block per
+    action type (take discard, draw and keep, draw and flip). Memory is fixed
+    at len(ACTION_TYPES) * FEATURE_DIM floats however many states are seen,
+    and states never visited still get sensible values from similar ones.
+    """
+    def __init__(self, learning_rate=0.01, discount_factor=0.9, epsilon=0.2, n_bootstrap_games=0):
+        super().__init__(learning_rate, discount_factor, epsilon, n_bootstrap_games)
+        self.weights = np.zeros((len(ACTION_TYPES), FEATURE_DIM), dtype=np.float32)
+
+    def q_values(self, features, types):
+        """Q-value of every row of an encode_actions() matrix."""
+        return np.einsum('ij,ij->i', features, self.weights[types])
+
+    def choose_action(self, player, game_state, trajectory=None):
+        legal_actions = self.get_legal_actions(player, game_state)
+        if not legal_actions:
+            return None
+
+        ev_analysis = self.teacher_cache.ev(player, game_state)
+        state, context = encode_state(player, game_state, ev_analysis)
+        features, types = encode_actions(state, context, legal_actions)
+
+        if self.games_played < self.n_bootstrap_games:
+            action = self.teacher_cache.teacher_action(player, game_state)
+            index = legal_actions.index(action) if action in legal_actions else random.randrange(len(legal_actions))
+        elif self.training_mode and random.random() < self.epsilon:
+            # Same exploration as the tabular agent: pick an action type, then a position
+            chosen_type = random.choice(sorted(set(types.tolist())))
+            index = random.choice(np.flatnonzero(types == chosen_type).tolist())
+        else:
+            index = int(np.argmax(self.q_values(features, types)))
+        action = legal_actions[index]
+
+        if trajectory is not None:
+            trajectory.append({
+                'state_key': self.get_state_key(player, game_state, ev_analysis),
+                'action_key': self.get_action_key(action),
+                'action': action,
+                'round': getattr(game_state, 'round', None),
+                'features': features[index],
+                'action_type': int(types[index]),
+                'legal_features': features,
+                'legal_types': types,
+            })
+        return action
+
+    def train_on_trajectory(self, trajectory, final_reward, final_score):
+        """
+        One semi-gradient Q-learning sweep over a game. Targets use the
+        weights from before the sweep, so all steps are updated in one batch.
+        """
+        if not trajectory:
+            return
+        features = np.stack([step['features'] for step in trajectory])
+        types = np.array([step['action_type'] for step in trajectory])
+
+        rewards = np.full(len(trajectory), 0.1, dtype=np.float32)
+        rewards[-1] += final_reward
+        next_q = np.zeros(len(trajectory), dtype=np.float32)
+        for i, step in enumerate(trajectory[1:]):
+            next_q[i] = self.q_values(step['legal_features'], step['legal_types']).max()
+
+        td_error = rewards + self.discount_factor * next_q - self.q_values(features, types)
+        np.add.at(self.weights, types, self.learning_rate * td_error[:, None] * features)
+
+    def get_q_table_size(self):
+        """(action types, weights): fixed, unlike the tabular agent's (states, entries)."""
+        return self.weights.shape[0], self.weights.size
+
+    def save_weights(self, filename="linear_q.npz"):
+        output_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'RL', 'output')
+        os.makedirs(output_dir, exist_ok=True)
+        output_path = os.path.join(output_dir, filename)
+        np.savez(output_path, weights=self.weights, games_played=self.games_played)
+        log.info(f"Linear Q weights saved to {output_path}")
+
+    def load_weights(self, filename="linear_q.npz"):
+        output_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'RL', 'output', filename)
+        if not os.path.exists(output_path):
+            log.info(f"No linear Q weights found at {output_path}, starting fresh.")
+            return
+        data = np.load(output_path)
+        if data['weights'].shape != self.weights.shape:
+            log.error(f"❌ Linear Q weights at {output_path} have shape {data['weights'].shape}, "
+                  f"expected {self.weights.shape}; starting fresh.")
+            return
+        self.weights = data['weights'].astype(np.float32)
+        self.games_played = int(data['games_played'])
+        log.info(f"Loaded linear Q weights from {output_path}")
+
+
 # ============================================================================
 # GPU-ACCELERATED Q-LEARNING AGENT
 # ============================================================================
@@ -745,11 +937,11 @@ def get_device():
 
     if torch.cuda.is_available():
         device = torch.device("cuda")
-        print(f"🚀 Using GPU: {torch.cuda.get_device_name(0)}")
-        print(f"   Memory: {torch.cuda.get_device_properties(0).total_memory / 1e9:.1f} GB")
+        log.info(f"🚀 Using GPU: {torch.cuda.get_device_name(0)}")
+        log.info(f"   Memory: {torch.cuda.get_device_properties(0).total_memory / 1e9:.1f} GB")
     else:
         device = torch.device("cpu")
-        print("💻 Using CPU")
+        log.info("💻 Using CPU")
     return device
 
 
@@ -757,13 +949,13 @@ class GPUQLearningAgent(QLearningAgent):
     """GPU-accelerated version of QLearningAgent using PyTorch tensors for computation, but same Q-table structure as CPU agent."""
 
     def __init__(self, learning_rate=0.1, discount_factor=0.9, epsilon=0.2,
-                 n_bootstrap_games=0, device=None):
-        super().__init__(learning_rate, discount_factor, epsilon, n_bootstrap_games)
+                 n_bootstrap_games=0, device=None, canonical_states=False):
+        super().__init__(learning_rate, discount_factor, epsilon, n_bootstrap_games, canonical_states)
         if not TORCH_AVAILABLE:
             raise ImportError("PyTorch is required for GPUQLearningAgent")
         self.device = device if device else get_device()
-        # Q-table is now a defaultdict of defaultdicts, just like CPU agent
-        self.q_table = defaultdict(lambda: defaultdict(float))
+        # Q-table uses the same counted structure as the CPU agent
+        self.q_table = QTable()
         self.optimizer = None
         self.criterion = nn.MSELoss()
 
@@ -786,7 +978,7 @@ class GPUQLearningAgent(QLearningAgent):
             if i < len(trajectory) - 1:
                 next_step = trajectory[i + 1]
                 next_state_key = next_step['state_key']
-                next_actions = [next_step['action']]
+                next_actions = [next_step['action_key']]
             else:
                 next_state_key = state_key
                 next_actions = []
@@ -797,13 +989,15 @@ class GPUQLearningAgent(QLearningAgent):
         """Update Q-values using Q-learning update rule (with tensor ops if possible)."""
         # Use tensor ops for max_next_q if there are multiple next actions
         if next_actions:
-            next_qs = [self.q_table[next_state_key][self.get_action_key(a)] for a in next_actions]
+            next_qs = [self.q_table[next_state_key][a if isinstance(a, str) else self.get_action_key(a)]
+                       for a in next_actions]
             max_next_q = float(torch.tensor(next_qs, device=self.device).max())
         else:
             max_next_q = 0.0
         current_q = self.q_table[state_key][action_key]
         new_q = current_q + self.learning_rate * (reward + self.discount_factor * max_next_q - current_q)
         self.q_table[state_key][action_key] = new_q
+        self.q_table.record_visit(state_key, action_key)
 
     def train_on_batch_trajectories_vectorized(self, batch_trajectories, batch_rewards, batch_scores):
         """Vectorized batch training using tensor operations for maximum GPU efficiency, but Q-table structure matches CPU agent."""
@@ -823,7 +1017,7 @@ class GPUQLearningAgent(QLearningAgent):
                 else:
                     next_step = trajectory[i + 1]
                     next_state_key = next_step['state_key']
-                    next_actions = [next_step['action']]
+                    next_actions = [next_step['action_key']]
                 updates.append((state_key, action_key, immediate_reward, next_state_key, next_actions))
         # Batch update using tensor ops
         for state_key, action_key, reward, next_state_key, next_actions in updates:
@@ -831,5 +1025,4 @@ class GPUQLearningAgent(QLearningAgent):
 
     def get_q_table_size(self):
         """Get the size of the Q-table for debugging (matches CPU agent)."""
-        total_entries = sum(len(actions) for actions in self.q_table.values())
-        return len(self.q_table), total_entries
\ No newline at end of file
+        return self.q_table.size()
\ No newline at end of file
@@ -0,0 +1,142 @@
+"""
+Leveled, structured logging for the server, in place of print().
+
+Modules log through get_logger('<module>'). Records go onto a bounded
+in-memory queue and a background thread writes them to stdout, so a request
+never waits on a slow stdout; when the queue is full, new records are
+dropped and counted instead of blocking.
+
+    LOG_LEVEL       DEBUG / INFO / WARNING / ERROR (default WARNING, so the
+                    debug and info output is off in production)
+    LOG_FORMAT      text (default) or json, one object per line
+    LOG_QUEUE_SIZE  records buffered before dropping (default 10000)
+
+Fields passed with extra={...} are appended as key=value (or become JSON
+keys). Lines on hot paths pass extra=sampled(rate, ...) to keep only that
+fraction of them.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'WARNING').upper()
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'text').lower()
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+ROOT_LOGGER = 'golf'
+
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'taskName', 'sample_rate'}
+
+
+def sampled(rate, **fields):
+    """extra= for a log call that should only be written for `rate` (0..1) of the calls."""
+    return dict(fields, sample_rate=rate)
+
+
+def _fields(record):
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRS}
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__('%(asctime)s %(levelname)s %(name)s: %(message)s')
+
+    def format(self, record):
+        line = super().format(record)
+        fields = _fields(record)
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return line
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {'ts': self.formatTime(record), 'level': record.levelname,
+                 'logger': record.name, 'msg': record.getMessage()}
+        entry.update(_fields(record))
+        return json.dumps(entry, default=str)
+
+
+class SamplingQueueHandler(logging.handlers.QueueHandler):
+    """Queues records without ever blocking; applies sample_rate and counts what it drops."""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self.sampled_out = 0
+
+    def filter(self, record):
+        rate = getattr(record, 'sample_rate', None)
+        if rate is not None and random.random() >= rate:
+            self.sampled_out += 1
+            return False
+        return super().filter(record)
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)  # on stop, wait for room rather than fail on a full queue
+
+
+_handler = None
+_listener = None
+_setup_lock = threading.Lock()
+
+
+def setup_logging(level=LOG_LEVEL, fmt=LOG_FORMAT, stream=None, queue_size=LOG_QUEUE_SIZE):
+    """(Re)configure the 'golf' loggers; runs once on import with the environment settings."""
+    global _handler, _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter() if fmt == 'json' else TextFormatter())
+        log_queue = queue.Queue(queue_size)
+        _handler = SamplingQueueHandler(log_queue)
+        logger = logging.getLogger(ROOT_LOGGER)
+        logger.handlers = [_handler]
+        logger.setLevel(level)
+        logger.propagate = False
+        _listener = DrainingQueueListener(log_queue, output)
+        _listener.start()
+
+
+def flush_logging():
+    """Write out everything queued so far (the writer thread restarts afterwards)."""
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener.start()
+
+
+def get_logger(name):
+    return logging.getLogger(f'{ROOT_LOGGER}.{name}')
+
+
+def log_stats():
+    return {
+        'level': logging.getLevelName(logging.getLogger(ROOT_LOGGER).level),
+        'queued': _handler.queue.qsize(),
+        'dropped': _handler.dropped,
+        'sampled_out': _handler.sampled_out,
+    }
+
+
+setup_logging()
+atexit.register(lambda: _listener.stop())
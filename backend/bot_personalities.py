@@ -4,9 +4,11 @@ from typing import Dict, Any, Optional, List
 from abc import ABC, abstractmethod
 from llm_cerebras import call_cerebras_llm
 from data_upset import save_bot_to_supabase, upload_llm_call_info
+from app_log import get_logger
 
 from dotenv import load_dotenv
 load_dotenv()
+log = get_logger('bot_personalities')
 
 import os
 from supabase import create_client, Client
@@ -16,9 +18,9 @@ url = os.environ.get("SUPABASE_URL")
 key = os.environ.get("SUPABASE_LEGACY_SECRET") or os.environ.get("SUPABASE_PUBLIC") or os.environ.get("SUPBAASE_PUBLIC")
 test = os.environ.get("TEST")
 if not key:
-    print("WARNING: No Supabase API key found!")
+    log.warning("WARNING: No Supabase API key found!")
 else:
-    print(f"key found: {key[:20]}...")
+    log.debug(f"key found: {key[:20]}...")
 
 NANTZ_COOLDOWN = 1200
 
@@ -502,7 +504,7 @@ class CustomBot(BaseBot):
     def _generate_llm_configurations(self):
         """Use LLM to generate bot configurations based on personality"""
         try:
-            print(f"🤖 LLM CONFIG: Generating configurations for {self.name}")
+            log.debug(f"🤖 LLM CONFIG: Generating configurations for {self.name}")
 
             # Generate all configurations in one LLM call
             all_configs = self._generate_all_configurations()
@@ -513,11 +515,11 @@ class CustomBot(BaseBot):
             self.response_config = all_configs.get('response_config', self.response_config)
             self.gif_config = all_configs.get('gif_config', self.gif_config)
 
-            print(f"🤖 LLM CONFIG: Successfully generated configurations for {self.name}")
+            log.debug(f"🤖 LLM CONFIG: Successfully generated configurations for {self.name}")
 
         except Exception as e:
-            print(f"🤖 LLM CONFIG: Error generating configurations for {self.name}: {e}")
-            print(f"🤖 LLM CONFIG: Using default configurations")
+            log.error(f"🤖 LLM CONFIG: Error generating configurations for {self.name}: {e}")
+            log.debug(f"🤖 LLM CONFIG: Using default configurations")
             # Keep default configurations if LLM fails
 
     def _generate_all_configurations(self) -> Dict[str, Any]:
@@ -647,12 +649,12 @@ Generate a complete behavioral configuration for this bot.
             # Add last_performance to emotional_state
             all_configs['emotional_state']['last_performance'] = 'neutral'
 
-            print(f"🤖 LLM CONFIG: Generated all configurations for {self.name}: {all_configs}")
+            log.debug(f"🤖 LLM CONFIG: Generated all configurations for {self.name}: {all_configs}")
             return all_configs
 
         except Exception as e:
-            print(f"🤖 LLM CONFIG: Error generating configurations: {e}")
-            print(f"🤖 LLM CONFIG: Raw response was: {repr(response) if 'response' in locals() else 'No response'}")
+            log.error(f"🤖 LLM CONFIG: Error generating configurations: {e}")
+            log.debug(f"🤖 LLM CONFIG: Raw response was: {repr(response) if 'response' in locals() else 'No response'}")
             # Return default configurations if LLM fails
             return {
                 "emotional_state": {
@@ -690,9 +692,9 @@ Generate a complete behavioral configuration for this bot.
             }
 
     def get_system_prompt(self) -> str:
-        print(f"🔧 CUSTOM BOT DEBUG: get_system_prompt() called for {self.name}")
-        print(f"🔧 CUSTOM BOT DEBUG: self.custom_description = '{self.custom_description}'")
-        print(f"🔧 CUSTOM BOT DEBUG: self.difficulty = '{self.difficulty}'")
+        log.debug(f"🔧 CUSTOM BOT DEBUG: get_system_prompt() called for {self.name}")
+        log.debug(f"🔧 CUSTOM BOT DEBUG: self.custom_description = '{self.custom_description}'")
+        log.debug(f"🔧 CUSTOM BOT DEBUG: self.difficulty = '{self.difficulty}'")
 
         # Create a system prompt based on the custom description
         base_prompt = f"You are {self.name}. "
@@ -700,9 +702,9 @@ Generate a complete behavioral configuration for this bot.
         # Add personality traits from the description
         if self.custom_description:
             base_prompt += f"Your personality: {self.custom_description}. "
-            print(f"🔧 CUSTOM BOT DEBUG: Adding description to system prompt: '{self.custom_description}'")
+            log.debug(f"🔧 CUSTOM BOT DEBUG: Adding description to system prompt: '{self.custom_description}'")
         else:
-            print(f"🔧 CUSTOM BOT DEBUG: WARNING - custom_description is empty or None!")
+            log.warning(f"🔧 CUSTOM BOT DEBUG: WARNING - custom_description is empty or None!")
 
         # Add difficulty-based characteristics
         if self.difficulty == "easy":
@@ -714,7 +716,7 @@ Generate a complete behavioral configuration for this bot.
 
         base_prompt += "Keep responses under 2 sentences and 200 characters. Stay in character and respond naturally to the game situation."
 
-        print(f"🔧 CUSTOM BOT DEBUG: Final system prompt: {base_prompt}")
+        log.debug(f"🔧 CUSTOM BOT DEBUG: Final system prompt: {base_prompt}")
         return base_prompt
 
     def get_catchphrases(self) -> List[str]:
@@ -8,8 +8,13 @@ from game_state import get_game_state
 import re
 import time
 from data_upset import upload_chatbot_message, upload_llm_call_info
+from metrics import metrics
+from app_log import get_logger, sampled
+import logging
 import threading
 import time
+
+log = get_logger('chatbot')
 # Create global instances. # TODO, not sue why???
 # chatbot = GolfChatbot()
 # chat_handler = ChatHandler(chatbot)
@@ -17,6 +22,7 @@ import time
 LAST_X_MESSAGES = 10
 PROACTIVE_TIMER = 3 # (seconds)300 seconds = 5 minutes
 CHAT_HISTORY_CHANGE_INTERVAL = 3
+TIMER_LOG_SAMPLE_RATE = 0.05  # share of the per-tick proactive timer log lines that are written
 
 class GolfChatbot:
     """Chatbot for the Golf card game with different personalities
@@ -24,7 +30,7 @@ class GolfChatbot:
     Knows about bot personalities, how to format game state, how to generate a message, and how to decide if/when a bot should respond (based on game state, personality, etc)."""
 
     def __init__(self, selected_bots: Optional[List[dict]] = None):
-        print("GolfChatbot.__init__ called")
+        log.debug("GolfChatbot.__init__ called")
         self.base_prompt = ( "keep responses short and concise. Two sentences max and roughly 150 characters max")
         # TODO There are x people in the chatbot and in the game.
         self.off_topic_prompt = ( "You are in a conversation with a group playing cards, but dn't want to talk about the game. Create a response that is not about the game and about a topic that is related to the the bots personality or another interesting topic.")
@@ -55,26 +61,27 @@ class GolfChatbot:
 
     def update_bots(self, selected_bots: List[dict]):
         """Update the bots dictionary with new bot objects at start of create game."""
-        print(f"GolfChatbot.update_bots called with {len(selected_bots)} bots")
+        log.debug(f"GolfChatbot.update_bots called with {len(selected_bots)} bots")
         if selected_bots:
             from bot_personalities import DataBot
             for bot_dict in selected_bots:
                 # Choose the right class based on bot_dict['name'] or another key. Nantz is from front
                 bot_obj = DataBot(**bot_dict)
                 self.bots[bot_dict['ai_bot_id']] = bot_obj
-                print(f"Added bot: {bot_dict['ai_bot_id']} -> {bot_obj.name}")
+                log.debug(f"Added bot: {bot_dict['ai_bot_id']} -> {bot_obj.name}")
 
-                # DEBUG: Print all attributes of the DataBot object
-                print(f"🔍 DEBUG: DataBot attributes for {bot_obj.name}:")
-                for attr in dir(bot_obj):
-                    if not attr.startswith('_'):  # Skip private attributes
-                        try:
-                            value = getattr(bot_obj, attr)
-                            print(f"  - {attr}: {value}")
-                        except Exception as e:
-                            print(f"  - {attr}: ERROR - {e}")
+                # DEBUG: Log all attributes of the DataBot object
+                if log.isEnabledFor(logging.DEBUG):
+                    log.debug(f"🔍 DEBUG: DataBot attributes for {bot_obj.name}:")
+                    for attr in dir(bot_obj):
+                        if not attr.startswith('_'):  # Skip private attributes
+                            try:
+                                value = getattr(bot_obj, attr)
+                                log.debug(f"  - {attr}: {value}")
+                            except Exception as e:
+                                log.debug(f"  - {attr}: ERROR - {e}")
 
-        print(f"Total bots in self.bots: {list(self.bots.keys())}")
+        log.debug(f"Total bots in self.bots: {list(self.bots.keys())}")
 
     # def get_bot_info(self) -> Dict[str, str]: # TODO still unsure about this.....this is for dicts.
     #     print("GolfChatbot.get_bot_info called")
@@ -87,7 +94,7 @@ class GolfChatbot:
     #     }
 
     def format_game_state_for_prompt(self, game_state: Dict[str, Any]) -> str:
-        print("GolfChatbot.format_game_state_for_prompt called")
+        log.debug("GolfChatbot.format_game_state_for_prompt called")
         """Format the current game state into a readable prompt for the LLM"""
         try:
             # Extract key information from game state
@@ -182,7 +189,7 @@ class GolfChatbot:
             return f"Error formatting game state: {str(e)}"
 
     def will_bot_respond(self, game_state: Dict[str, Any], ai_bot_id: str) -> bool:
-        print("GolfChatbot.will_bot_respond called")
+        log.debug("GolfChatbot.will_bot_respond called")
         """Check if bot will respond to the user message based on the bot's response config."""
 
         # TODO add the response config to the bot object.
@@ -193,7 +200,7 @@ class GolfChatbot:
             # If response_config doesn't exist, use defaults
             response_probability = 1.0
             dramatic_event_comment_prob = 1.0
-            print("WARNING: response_config not found, using default probabilities")
+            log.warning("WARNING: response_config not found, using default probabilities")
 
         # Check if this is a dramatic event
         is_dramatic = self.is_dramatic_event(game_state)
@@ -202,28 +209,28 @@ class GolfChatbot:
         prob = dramatic_event_comment_prob if is_dramatic else response_probability
 
         roll = random.random()
-        print(f"Using probability: {prob} (dramatic: {is_dramatic}), roll: {roll}")
+        log.debug(f"Using probability: {prob} (dramatic: {is_dramatic}), roll: {roll}")
         if roll < prob:
-            print("Bot will respond.")
+            log.debug("Bot will respond.")
             return True
         else:
-            print("Bot will not respond.")
+            log.debug("Bot will not respond.")
             return False
 
     def is_dramatic_event(self, game_state: Dict[str, Any]) -> bool:
-        print("GolfChatbot.is_dramatic_event called")
+        log.debug("GolfChatbot.is_dramatic_event called")
         """Check if the game state is a dramatic event."""
         # TODO add dramatic event logic here.
         return True # will need to update this function.
 
     def dramatic_event_prompt_builder(self, game_state: Dict[str, Any]) -> str:
-        print("dramatic_event_prompt_builder called")
+        log.debug("dramatic_event_prompt_builder called")
         """Build the dramatic event prompt for the bot."""
         # TODO add dramatic event logic here.
         return ""
 
     def difficulty_prompt_builder(self, ai_bot_id: str) -> str:
-        print("difficulty_prompt_builder called")
+        log.debug("difficulty_prompt_builder called")
         """Build the difficulty prompt for the bot."""
         # Get bot difficulty, default to 'medium'
         difficulty = self.bots[ai_bot_id].difficulty
@@ -239,7 +246,7 @@ class GolfChatbot:
         return prompt
 
     def personality_prompt_builder(self, ai_bot_id: str) -> str:
-        print("personality_prompt_builder called")
+        log.debug("personality_prompt_builder called")
         """Build the personality prompt for the bot."""
         # Get bot personality, default to 'friendly'
         #TODO update personality config for bots
@@ -259,25 +266,25 @@ class GolfChatbot:
     def emotional_state_prompt_builder(self, ai_bot_id: str) -> str:
         """Build the emotional state prompt for the bot."""
         # Get bot emotional state, default to 'neutral'
-        print(f"🔍 EMOTIONAL_STATE DEBUG: Processing bot with ai_bot_id: {ai_bot_id}")
+        log.debug(f"🔍 EMOTIONAL_STATE DEBUG: Processing bot with ai_bot_id: {ai_bot_id}")
 
         # Check if bot exists
         if ai_bot_id not in self.bots:
-            print(f"🔍 EMOTIONAL_STATE DEBUG: ERROR - Bot {ai_bot_id} not found in self.bots!")
-            print(f"🔍 EMOTIONAL_STATE DEBUG: Available bots: {list(self.bots.keys())}")
+            log.error(f"🔍 EMOTIONAL_STATE DEBUG: ERROR - Bot {ai_bot_id} not found in self.bots!")
+            log.debug(f"🔍 EMOTIONAL_STATE DEBUG: Available bots: {list(self.bots.keys())}")
             return "You are neutral. "
 
         bot = self.bots[ai_bot_id]
-        print(f"🔍 EMOTIONAL_STATE DEBUG: Bot name: {bot.name}")
-        print(f"🔍 EMOTIONAL_STATE DEBUG: Bot attributes: {[attr for attr in dir(bot) if not attr.startswith('_')]}")
-        print(f"🔍 EMOTIONAL_STATE DEBUG: Bot has emotional_state: {hasattr(bot, 'emotional_state')}")
+        log.debug(f"🔍 EMOTIONAL_STATE DEBUG: Bot name: {bot.name}")
+        log.debug(f"🔍 EMOTIONAL_STATE DEBUG: Bot attributes: {[attr for attr in dir(bot) if not attr.startswith('_')]}")
+        log.debug(f"🔍 EMOTIONAL_STATE DEBUG: Bot has emotional_state: {hasattr(bot, 'emotional_state')}")
 
         if not hasattr(bot, 'emotional_state'):
-            print(f"🔍 EMOTIONAL_STATE DEBUG: ERROR - Bot {bot.name} missing emotional_state attribute!")
+            log.error(f"🔍 EMOTIONAL_STATE DEBUG: ERROR - Bot {bot.name} missing emotional_state attribute!")
             return "You are neutral. "
 
         emotional_state = bot.emotional_state
-        print(f'🔍 EMOTIONAL_STATE DEBUG: emotional_state: {emotional_state}', 'type: ', type(emotional_state))
+        log.debug(f'🔍 EMOTIONAL_STATE DEBUG: emotional_state: {emotional_state} type: {type(emotional_state)}')
 
         prompt = ""
         if emotional_state == "confident":
@@ -293,7 +300,7 @@ class GolfChatbot:
         return prompt
 
     def lucky_event(self, game_state: Dict[str, Any]) -> bool:
-        print("GolfChatbot.lucky_unlucky_event called")
+        log.debug("GolfChatbot.lucky_unlucky_event called")
         """Check if the game state is a lucky or unlucky event."""
         # Example logic: check for a key in game_state
         # Replace with your actual game logic!
@@ -310,8 +317,8 @@ class GolfChatbot:
                           game_state: Optional[Dict[str, Any]] = None,
                           ai_bot_id: str = None) -> str:
 
-        print(f"🔍 GENERATE_RESPONSE DEBUG: Called with ai_bot_id={ai_bot_id}")
-        print(f"🔍 GENERATE_RESPONSE DEBUG: ai_bot_id in self.bots: {ai_bot_id in self.bots}")
+        log.debug(f"🔍 GENERATE_RESPONSE DEBUG: Called with ai_bot_id={ai_bot_id}")
+        log.debug(f"🔍 GENERATE_RESPONSE DEBUG: ai_bot_id in self.bots: {ai_bot_id in self.bots}")
         """Generate a chatbot response based on conversation history and game state"""
 
         game_id = game_state["game_id"]
@@ -337,9 +344,9 @@ class GolfChatbot:
 
         system_prompt += "This is a chat conversation while playing a card game.Keep responses under 2 sentences and 200 characters. Stay in character and respond naturally to the game situation."
 
-        print(f"🤖 Bot: {bot_name}")
-        print(f"🤖 Description: {bot_description}")
-        print(f"🤖 Difficulty: {difficulty}")
+        log.debug(f"🤖 Bot: {bot_name}")
+        log.debug(f"🤖 Description: {bot_description}")
+        log.debug(f"🤖 Difficulty: {difficulty}")
 
         # Always add system prompt and rules ONCE at the top
         context = system_prompt + "\n\n" + "Game Rules:\n" + self.game_rules + "\n\n"
@@ -358,11 +365,11 @@ class GolfChatbot:
         context += f"{bot_name}:"
 
         try:
-            print(f"🔍 GENERATE_RESPONSE DEBUG: About to call prompt builders for ai_bot_id: {ai_bot_id}")
-            print(f"🔍 GENERATE_RESPONSE DEBUG: Bot exists in self.bots: {ai_bot_id in self.bots}")
+            log.debug(f"🔍 GENERATE_RESPONSE DEBUG: About to call prompt builders for ai_bot_id: {ai_bot_id}")
+            log.debug(f"🔍 GENERATE_RESPONSE DEBUG: Bot exists in self.bots: {ai_bot_id in self.bots}")
             if ai_bot_id in self.bots:
-                print(f"🔍 GENERATE_RESPONSE DEBUG: Bot name: {self.bots[ai_bot_id].name}")
-                print(f"🔍 GENERATE_RESPONSE DEBUG: Bot has emotional_state: {hasattr(self.bots[ai_bot_id], 'emotional_state')}")
+                log.debug(f"🔍 GENERATE_RESPONSE DEBUG: Bot name: {self.bots[ai_bot_id].name}")
+                log.debug(f"🔍 GENERATE_RESPONSE DEBUG: Bot has emotional_state: {hasattr(self.bots[ai_bot_id], 'emotional_state')}")
 
             context += self.dramatic_event_prompt_builder(game_state) + "\n\n"
             context += self.difficulty_prompt_builder(ai_bot_id) + "\n\n"
@@ -380,9 +387,9 @@ class GolfChatbot:
             # TODO call gif config for the botto add to the context
             # TODO  can adjust temperature for emotional state
 
-            print(f' ---------------callling the llm ---------------')
-            print(f'🔍 LLM DEBUG: Context length: {len(context)} characters')
-            print(f'🔍 LLM DEBUG: About to call call_llama...')
+            log.debug(f' ---------------callling the llm ---------------')
+            log.debug(f'🔍 LLM DEBUG: Context length: {len(context)} characters')
+            log.debug(f'🔍 LLM DEBUG: About to call call_llama...')
 
             response, usage = call_cerebras_llm(
                 prompt=context,
@@ -409,9 +416,9 @@ class GolfChatbot:
             #     traceback.print_exc()
             #     response = f"Sorry, I'm having trouble responding right now. LLM Error: {str(e)}"
 
-            print(f"🤖 {bot_name}: 'response from LLM': {response}")
+            log.debug(f"🤖 {bot_name}: 'response from LLM': {response}")
             if usage:
-                print(f"🤖 Token usage: {usage}")
+                log.debug(f"🤖 Token usage: {usage}")
 
             #add to conversation history
             self.add_message_to_history(bot_name, response, game_id)
@@ -426,12 +433,12 @@ class GolfChatbot:
             return error_msg
 
     def generate_off_topic_proactive_context(self, game_state: Dict[str, Any], event_type: str = "general") -> Optional[str]:
-        print(f"GolfChatbot.generate_off_topic_proactive_context called with event_type={event_type}")
+        log.debug(f"GolfChatbot.generate_off_topic_proactive_context called with event_type={event_type}")
         """Generate a proactive comment context based on game events. Returns the context that would be sent to the LLM."""
 
         context = self.base_prompt + "\n"
 
-        print(f"DEBUG: generate_proactive_comment called with event_type: {event_type}")
+        log.debug(f"DEBUG: generate_proactive_comment called with event_type: {event_type}")
 
         # Use the bot's proactive behavior system to see if they are going to comment on game state or off topic message. TODO. might need to update proactive config for game state vs off topic.
 
@@ -456,20 +463,20 @@ class GolfChatbot:
             # Always add the base prompt
 
             # Print the full prompt that would be sent to the LLM
-            print(f"🤖 CONTEXT (would be sent to llama3.1-8b, structured: False, stream: False, temp: 0.8):")
-            print(f"🤖 {'='*80}")
-            print(f"🤖 {context[-200:]}")
-            print(f"🤖 {'='*80}")
+            log.debug(f"🤖 CONTEXT (would be sent to llama3.1-8b, structured: False, stream: False, temp: 0.8):")
+            log.debug(f"🤖 {'='*80}")
+            log.debug(f"🤖 {context[-200:]}")
+            log.debug(f"🤖 {'='*80}")
 
             # Return just the last 200 characters of the context instead of calling the LLM
             return context
 
         except Exception as e:
-            print(f"DEBUG: Error generating proactive context: {e}")
+            log.error(f"DEBUG: Error generating proactive context: {e}")
             return None
 
     def bot_personality_prompt_builder(self) -> str:
-        print("GolfChatbot.bot_personality_prompt_builder called")
+        log.debug("GolfChatbot.bot_personality_prompt_builder called")
         """Build the personality prompt for the bot."""
         # TODO build the personality prompt for the bot.
                     # Add emotional and situational context
@@ -477,25 +484,25 @@ class GolfChatbot:
         return ""
 
     def bot_memory_update_for_new_game(self):
-        print("GolfChatbot.bot_memory_update_for_new_game called")
+        log.debug("GolfChatbot.bot_memory_update_for_new_game called")
         """Reset bot state for a new game. maybe not reset, but have a variance and mean that it pulls to. Eh, I think I like bot memory better."""
         # TODO add bot memory to the bot object in the bot_personalities.py file.
         pass
 
     def should_send_gif(self):
-        print("GolfChatbot.should_send_gif called")
+        log.debug("GolfChatbot.should_send_gif called")
         """Check if bot should send a GIF. might be a function in the chat handler tho."""
         return False
 
     def is_on_topic(self, game_state: Optional[Dict[str, Any]]) -> bool:
-        print("GolfChatbot.is_on_topic called")
+        log.debug("GolfChatbot.is_on_topic called")
         """Check if the user message is on or off topic between game state"""
         # TODO if dramatic event, then return true.
         # TODO if user is talking about the game then return true..
         return True # will need to update this function.
 
     def generate_response_with_gif(self, user_message: str, game_state: Optional[Dict[str, Any]] = None, personality: str = None) -> Dict[str, Any]:
-        print(f"GolfChatbot.generate_response_with_gif called with user_message={user_message}")
+        log.debug(f"GolfChatbot.generate_response_with_gif called with user_message={user_message}")
         """Generate an enhanced response that may include GIF suggestions"""
 
         # Generate the normal response
@@ -510,7 +517,7 @@ class GolfChatbot:
 
     # TODO will update this for an advanced gif system by calling llm.
     def _get_gif_context(self, message: str, game_state: Dict[str, Any] = None) -> str:
-        print("GolfChatbot._get_gif_context called")
+        log.debug("GolfChatbot._get_gif_context called")
         """Generate context for what type of GIF would be appropriate"""
 
 
@@ -534,7 +541,7 @@ class GolfChatbot:
 
 
     def _get_turn_start_prompt(self, game_state: Dict[str, Any]) -> str:
-        print("GolfChatbot._get_turn_start_prompt called")
+        log.debug("GolfChatbot._get_turn_start_prompt called")
         """Generate turn start specific prompts based on personality"""
 
         if advice_freq > 0.6:
@@ -543,7 +550,7 @@ class GolfChatbot:
             return "A new turn is starting. Make a brief encouraging comment."
 
     def _get_card_drawn_prompt(self, game_state: Dict[str, Any]) -> str:
-        print("GolfChatbot._get_card_drawn_prompt called")
+        log.debug("GolfChatbot._get_card_drawn_prompt called")
         """Generate card drawn specific prompts"""
 
         if humor_level > 0.6:
@@ -552,7 +559,7 @@ class GolfChatbot:
             return "A card was drawn. Comment on the player's luck or strategy."
 
     def _get_card_played_prompt(self, game_state: Dict[str, Any]) -> str:
-        print("GolfChatbot._get_card_played_prompt called")
+        log.debug("GolfChatbot._get_card_played_prompt called")
         """Generate card played specific prompts"""
 
         if advice_freq > 0.6:
@@ -561,7 +568,7 @@ class GolfChatbot:
             return "A card was played. React to the move briefly."
 
     def _get_score_update_prompt(self, game_state: Dict[str, Any]) -> str:
-        print("GolfChatbot._get_score_update_prompt called")
+        log.debug("GolfChatbot._get_score_update_prompt called")
         """Generate score update specific prompts"""
 
         if excitement > 0.7:
@@ -570,12 +577,12 @@ class GolfChatbot:
             return "Scores have been updated. Comment on the current standings."
 
     def _get_game_over_prompt(self, game_state: Dict[str, Any]) -> str:
-        print("GolfChatbot._get_game_over_prompt called")
+        log.debug("GolfChatbot._get_game_over_prompt called")
         """Generate game over specific prompts"""
         return "The game has ended. React to the final results and congratulate or commiserate as appropriate."
 
     def _get_dramatic_moment_prompt(self, game_state: Dict[str, Any]) -> str:
-        print("GolfChatbot._get_dramatic_moment_prompt called")
+        log.debug("GolfChatbot._get_dramatic_moment_prompt called")
         """Generate dramatic moment specific prompts"""
 
         if excitement > 0.7:
@@ -584,7 +591,7 @@ class GolfChatbot:
             return "This is a tense moment in the game. Comment on the drama unfolding."
 
     def _generate_gif_search_terms(self, bot_name: str, message: str) -> str:
-        print("GolfChatbot._generate_gif_search_terms called")
+        log.debug("GolfChatbot._generate_gif_search_terms called")
         """Generate GIF search terms based on bot's description, prompt, and message."""
         # Try to get the bot instance (use your bot registry/factory)
         bot = None
@@ -618,7 +625,7 @@ class GolfChatbot:
         return ' '.join(filtered_terms[:3])
 
     def add_message_to_history(self, sender: str, content: str, game_id: str = None):
-        print(f"GolfChatbot.add_message_to_history called with sender={sender}, game_id={game_id}")
+        log.debug(f"GolfChatbot.add_message_to_history called with sender={sender}, game_id={game_id}")
         """Add a message to the conversation history with a timestamp."""
 
         import time
@@ -637,7 +644,7 @@ class GolfChatbot:
                 self.conversation_history['global'] = []
             self.conversation_history['global'].append(message)
 
-        print(f' chat history: {self.conversation_history}')
+        log.debug(f' chat history: {self.conversation_history}')
 
 
 
@@ -693,7 +700,12 @@ class ChatHandler:
         if unique_bots:
             self.chatbot.update_bots(list(unique_bots.values()))
 
-        print(f"ChatHandler updated with {len(games_dict)} games and {len(unique_bots)} unique bots")
+        log.debug(f"ChatHandler updated with {len(games_dict)} games and {len(unique_bots)} unique bots")
+
+    def forget_game(self, game_id: str, game_session: Dict = None):
+        """Drop the chat history and tracking kept for a game that has been removed."""
+        self._game_tracking.pop(game_id, None)
+        self.chatbot.conversation_history.pop(game_id, None)
 
     def _get_or_create_game_tracking(self, game_id: str) -> dict:
         """Get or create tracking data for a specific game."""
@@ -714,31 +726,33 @@ class ChatHandler:
             game_id: 'global' to monitor all games, or specific game_id for single game
             time_interval: Seconds to wait for inactivity before triggering proactive comment
         """
-        print(f"ChatHandler.proactive_comment_timer started for {game_id}")
+        log.info(f"ChatHandler.proactive_comment_timer started for {game_id}")
 
         while True:
             # Get list of games to monitor
             games_to_check = list(self.games.keys()) if game_id == 'global' else [game_id]
 
             for active_game_id in games_to_check:
+                game_session = self.games.get(active_game_id)
+                if game_session is None:
+                    continue  # evicted since the list was taken
                 game_state = self.get_game_state_func(active_game_id, self.games)
-                game_session = self.games[active_game_id]
                 # Skip if conversation history changed recently (activity detected)
                 if self.has_conversation_history_changed(active_game_id):
-                    print(f"[Proactive Timer 720] converstiaon history has changed. {active_game_id}, resetting timer.")
+                    log.debug(f"[Proactive Timer 720] converstiaon history has changed. {active_game_id}, resetting timer.", extra=sampled(TIMER_LOG_SAMPLE_RATE))
                     continue
 
                 # Check if enough time has passed since last conversation activity
                 # last_message_time = 0
                 if active_game_id is not None and active_game_id in self.chatbot.conversation_history:
                     last_message = self.chatbot.conversation_history[active_game_id][-1]
-                    print(f"[Proactive Timer 717] last message: {last_message}")
+                    log.debug(f"[Proactive Timer 717] last message: {last_message}", extra=sampled(TIMER_LOG_SAMPLE_RATE))
                     last_message_time = last_message.get('timestamp', 0)
-                    print(f"[Proactive Timer 720] last message time: {last_message_time}")
+                    log.debug(f"[Proactive Timer 720] last message time: {last_message_time}", extra=sampled(TIMER_LOG_SAMPLE_RATE))
 
                 # If enough time passed, call should_generate_proactive_comment () which checks dramatic events and variability for each bot timing.
                     if time.time() - last_message_time >= time_interval:
-                        print(f"[Proactive Timer 723] No conversation activity in game {active_game_id} for {time_interval}s. Generating proactive comment.")
+                        log.debug(f"[Proactive Timer 723] No conversation activity in game {active_game_id} for {time_interval}s. Generating proactive comment.")
                         if self.should_generate_proactive_comment(game_state, game_session):
                             # Get bot info and generate proactive response directly
                             selected_bots = game_session.get('selected_bots', [])
@@ -751,17 +765,17 @@ class ChatHandler:
                                     # Generate a proactive response using generate_response with ai_bot_id
                                     ai_bot_id = bot_dict.get('ai_bot_id')
                                     bot_name = bot_dict.get('name', 'Unknown')
-                                    print(f"🔍 PROACTIVE DEBUG: Trying to generate response for bot: {bot_name} (ai_bot_id: {ai_bot_id})")
-                                    print(f"🔍 PROACTIVE DEBUG: Available bots in chatbot: {list(self.chatbot.bots.keys())}")
-                                    print(f"🔍 PROACTIVE DEBUG 738: Bot exists in chatbot.bots: {ai_bot_id in self.chatbot.bots}")
+                                    log.debug(f"🔍 PROACTIVE DEBUG: Trying to generate response for bot: {bot_name} (ai_bot_id: {ai_bot_id})")
+                                    log.debug(f"🔍 PROACTIVE DEBUG: Available bots in chatbot: {list(self.chatbot.bots.keys())}")
+                                    log.debug(f"🔍 PROACTIVE DEBUG 738: Bot exists in chatbot.bots: {ai_bot_id in self.chatbot.bots}")
 
                                     # Only generate response if bot exists in chatbot.bots
                                     if ai_bot_id in self.chatbot.bots:
                                         conversation_history = self.chatbot.conversation_history.get(active_game_id, [])
-                                        print(f' Proactive comment timer calling generate_response 740')
+                                        log.debug(f' Proactive comment timer calling generate_response 740')
                                         self.chatbot.generate_response(conversation_history, game_state, ai_bot_id)
                                     else:
-                                        print(f"🔍 PROACTIVE DEBUG: Skipping bot {bot_name} (ai_bot_id: {ai_bot_id}) - not found in chatbot.bots")
+                                        log.debug(f"🔍 PROACTIVE DEBUG: Skipping bot {bot_name} (ai_bot_id: {ai_bot_id}) - not found in chatbot.bots")
 
 
             time.sleep(4)  # Check every second
@@ -769,18 +783,18 @@ class ChatHandler:
     def should_generate_proactive_comment(self, game_state: Dict, game_session: Dict) -> bool:
         """Determine if a proactive comment should be generated."""
         # Check for dramatic events
-        print(f' [DEBUG] should_generate_proactive_comment called.')
-        print(f' [DEBUG] Available bots in chatbot: {list(self.chatbot.bots.keys())}')
+        log.debug(f' [DEBUG] should_generate_proactive_comment called.', extra=sampled(TIMER_LOG_SAMPLE_RATE))
+        log.debug(f' [DEBUG] Available bots in chatbot: {list(self.chatbot.bots.keys())}', extra=sampled(TIMER_LOG_SAMPLE_RATE))
         if self.chatbot.is_dramatic_event(game_state):
-            print(f' [DEBUG] Dramatic event detected, checking if any bot wants to respond')
+            log.debug(f' [DEBUG] Dramatic event detected, checking if any bot wants to respond')
             # Check if any bot wants to respond to dramatic events
             for ai_bot_id, bot in self.chatbot.bots.items():
-                print(f' [DEBUG] Checking bot: {bot.name} (ai_bot_id: {ai_bot_id})')
-                print(f' [DEBUG] Bot has emotional_state: {hasattr(bot, "emotional_state")}')
+                log.debug(f' [DEBUG] Checking bot: {bot.name} (ai_bot_id: {ai_bot_id})')
+                log.debug(f' [DEBUG] Bot has emotional_state: {hasattr(bot, "emotional_state")}')
                 if self.chatbot.will_bot_respond(game_state, ai_bot_id):
-                    print(f' [DEBUG] Bot {bot.name} wants to respond to dramatic event')
+                    log.debug(f' [DEBUG] Bot {bot.name} wants to respond to dramatic event')
                     return True
-            print(f' [DEBUG] No bots want to respond to dramatic event')
+            log.debug(f' [DEBUG] No bots want to respond to dramatic event')
             return False
 
         # Check for inactivity (this is handled by proactive_comment_timer)
@@ -799,7 +813,7 @@ class ChatHandler:
         return True
 
     def has_conversation_history_changed(self, game_id: str = None, interval: int = CHAT_HISTORY_CHANGE_INTERVAL) -> bool:
-        print(f" [DEBUG] conversation_history_changed called.")
+        log.debug(f" [DEBUG] conversation_history_changed called.", extra=sampled(TIMER_LOG_SAMPLE_RATE))
         """
         Return True if the last message in conversation history is new (content or timestamp differs)
         AND at least `interval` seconds have passed since the last True.
@@ -833,7 +847,7 @@ class ChatHandler:
 
     def get_game_id_from_memory(self, user_id: str = None) -> Optional[str]:
         """Get the most recent game_id from memory for a user."""
-        print(f"ChatHandler.get_game_id_from_memory called for user_id={user_id}")
+        log.debug(f"ChatHandler.get_game_id_from_memory called for user_id={user_id}")
 
         # If we have access to the games dict, we could find the most recent game
         # For now, this is a placeholder for future implementation
@@ -847,7 +861,7 @@ class ChatHandler:
 
     def handle_user_message(self, data: Dict[str, Any]) -> Dict[str, Any]:
         """Handle send message requests from user. from front end api call. adds conversation history and triggers bot response pipeline."""
-        print("DEBUG:handle_user_message Received data:", data)
+        log.debug("DEBUG:handle_user_message Received data: %s", data)
 
         # Try to get game_id from request first
         game_id = data.get('game_id')
@@ -961,29 +975,29 @@ class ChatHandler:
         try:
             # bot_name should already be the ai_bot_id from the frontend
             ai_bot_id = bot_name
-            print(f"DEBUG: Looking up bot with ai_bot_id: '{ai_bot_id}'")
+            log.debug(f"DEBUG: Looking up bot with ai_bot_id: '{ai_bot_id}'")
 
             # Get bot information directly from game session memory using ai_bot_id
             selected_bots = game_session.get('selected_bots', [])
-            print(f"DEBUG: Available bots in memory: {[(b.get('ai_bot_id'), b.get('name')) for b in selected_bots]}")
+            log.debug(f"DEBUG: Available bots in memory: {[(b.get('ai_bot_id'), b.get('name')) for b in selected_bots]}")
 
             # Find bot by ai_bot_id
             bot_obj = next((b for b in selected_bots if b.get('ai_bot_id') == ai_bot_id), None)
 
             if bot_obj:
                 bot_display_name = bot_obj.get('name', 'Unknown Bot')
-                print(f"DEBUG: Found bot: ai_bot_id='{ai_bot_id}', name='{bot_display_name}'")
+                log.debug(f"DEBUG: Found bot: ai_bot_id='{ai_bot_id}', name='{bot_display_name}'")
             else:
-                print(f"DEBUG: Bot not found with ai_bot_id: '{ai_bot_id}'")
+                log.debug(f"DEBUG: Bot not found with ai_bot_id: '{ai_bot_id}'")
 
             # Calculate delay for this bot (use display name for delay calculation)
             delay_name = bot_obj.get('name', bot_name) if bot_obj else bot_name
             delay = self.calculate_bot_response_delay(delay_name)
-            print(f"DEBUG: Calculated {delay:.2f}s delay for {delay_name}")
+            log.debug(f"DEBUG: Calculated {delay:.2f}s delay for {delay_name}")
             # Do NOT sleep here; let frontend handle the delay for typing indicator
 
             if bot_obj:
-                print(f"DEBUG: Found bot in memory: {bot_obj.get('name')} with description: {bot_obj.get('description', '')[:100]}...")
+                log.debug(f"DEBUG: Found bot in memory: {bot_obj.get('name')} with description: {bot_obj.get('description', '')[:100]}...")
 
                 # Generate response with bot info from memory
                 response = self.chatbot.generate_response(
@@ -995,7 +1009,7 @@ class ChatHandler:
                     bot_obj      # bot_info from memory
                 )
             else:
-                print(f"DEBUG: Bot not found in memory, using fallback for {ai_bot_id}")
+                log.debug(f"DEBUG: Bot not found in memory, using fallback for {ai_bot_id}")
                 # Fallback to old method for built-in bots
                 response = self.chatbot.generate_response(
                     message,     # user_message
@@ -1006,7 +1020,7 @@ class ChatHandler:
             # Use bot display name for return, or ai_bot_id as fallback
             return_bot_name = bot_obj.get('name', ai_bot_id) if bot_obj else ai_bot_id
 
-            print(f"Returning bot response: bot_name={return_bot_name}, reading_delay={delay}, message={response[:60]}")
+            log.debug(f"Returning bot response: bot_name={return_bot_name}, reading_delay={delay}, message={response[:60]}")
             return {
                 'success': True,
                 'bot_name': return_bot_name,  # Return the display name for frontend
@@ -1023,9 +1037,7 @@ class ChatHandler:
             except:
                 pass
 
-            print(f"ERROR: Failed to generate response for {error_bot_name}: {e}")
-            import traceback
-            traceback.print_exc()
+            log.error(f"ERROR: Failed to generate response for {error_bot_name}: {e}", exc_info=True)
             return {
                 'success': False,
                 'bot_name': error_bot_name,
@@ -1034,8 +1046,8 @@ class ChatHandler:
 
     def handle_proactive_comment(self, data: Dict[str, Any], get_game_state_func, games: Dict) -> Dict[str, Any]:
         """Handle proactive comment requests"""
-        print("==== handle_proactive_comment called ====")
-        print("Request data:", data)
+        log.debug("==== handle_proactive_comment called ====")
+        log.debug("Request data: %s", data)
         game_id = data.get('game_id')
         event_type = data.get('event_type', 'general')
         specific_context = data.get('specific_context', '')
@@ -1052,14 +1064,14 @@ class ChatHandler:
                 allowed_bots = data['allowed_bots']
             else:
                 allowed_bots = [b.get('ai_bot_id') for b in selected_bots if b.get('name') not in ('Golf Pro', 'Golf Bro')]
-            print("ALLOWED BOTS:", allowed_bots)
+            log.debug("ALLOWED BOTS: %s", allowed_bots)
             comments = []
             for bot_id in allowed_bots:
                 bot_obj = next((b for b in selected_bots if b.get('ai_bot_id') == bot_id), None)
                 if not bot_obj:
                     continue
                 bot_name = bot_obj.get('name', 'Unknown Bot chatbot.py 936')
-                print(f"DEBUG: Proactive comment - Bot name: {bot_name}, Bot ID: {bot_id}", flush=True)
+                log.debug(f"DEBUG: Proactive comment - Bot name: {bot_name}, Bot ID: {bot_id}")
                 # Use bot_obj attributes directly for proactive comment logic
                 # If you need to instantiate a bot class for advanced logic, do so here (optional)
                 # For now, just use the name and attributes directly
@@ -1077,16 +1089,14 @@ class ChatHandler:
                         **comment
                     })
                     game_session[f'last_proactive_comment_time_{bot_name}'] = time.time()
-            print(f"DEBUG: Generated {len(comments)} enhanced proactive comments")
+            log.debug(f"DEBUG: Generated {len(comments)} enhanced proactive comments")
             return {'success': True, 'comments': comments}
         except Exception as e:
-            print(f"ERROR: Error generating proactive comments: {e}")
-            import traceback
-            traceback.print_exc()
+            log.error(f"ERROR: Error generating proactive comments: {e}", exc_info=True)
             return {'error': str(e)}, 500
 
     def get_bot_reaction_speed(self, ai_bot_id: str) -> float:
-        print(f"GolfChatbot.get_bot_reaction_speed called for ai_bot_id={ai_bot_id}")
+        log.debug(f"GolfChatbot.get_bot_reaction_speed called for ai_bot_id={ai_bot_id}")
         """Get the reaction speed for a bot by ai_bot_id from its response_config."""
         bot = self.bots.get(ai_bot_id)
         if bot and hasattr(bot, 'response_config'):
@@ -1094,7 +1104,7 @@ class ChatHandler:
         return 0.5  # default if not found
 
     def calculate_bot_response_delay(self, ai_bot_id: str) -> float:
-        print(f"GolfChatbot.calculate_bot_response_delay called for ai_bot_id={ai_bot_id}")
+        log.debug(f"GolfChatbot.calculate_bot_response_delay called for ai_bot_id={ai_bot_id}")
         """Calculate response delay based on bot's reaction speed (from response_config) using ai_bot_id."""
         try:
             reaction_speed = self.get_bot_reaction_speed(ai_bot_id)
@@ -1119,12 +1129,12 @@ class ChatHandler:
             # Ensure delay is never negative
             final_delay = max(min_delay, final_delay)
 
-            print(f"DEBUG: Bot {ai_bot_id} - reaction_speed: {reaction_speed:.2f}, calculated delay: {final_delay:.2f}s")
+            log.debug(f"DEBUG: Bot {ai_bot_id} - reaction_speed: {reaction_speed:.2f}, calculated delay: {final_delay:.2f}s")
 
             return final_delay
 
         except Exception as e:
-            print(f"DEBUG: Error calculating delay for {ai_bot_id}: {e}")
+            log.error(f"DEBUG: Error calculating delay for {ai_bot_id}: {e}")
             # Default delay if there's an error
             return 1.5
 
@@ -1135,7 +1145,7 @@ class ChatHandler:
         try:
             message = data.get('message', '')
             bot_name = data.get('bot_name', '')
-            print('gif message:', message)
+            log.debug('gif message: %s', message)
 
             # Get API key from environment
             import os
@@ -1145,7 +1155,7 @@ class ChatHandler:
 
             # Use new helper to generate search query
             search_query = self._generate_gif_search_terms(bot_name, message)
-            print('gif search query:', search_query)
+            log.debug('gif search query: %s', search_query)
 
             # Call Giphy API
             import requests
@@ -1157,7 +1167,8 @@ class ChatHandler:
                 'rating': 'g'
             }
 
-            response = requests.get(url, params=params)
+            with metrics.timer('external_call', 'giphy'):
+                response = requests.get(url, params=params)
             response.raise_for_status()
 
             response_data = response.json()
@@ -0,0 +1,106 @@
+"""
+Shared pytest setup for the web tests.
+
+The third-party clients web_app imports (Supabase, Cerebras, Google TTS,
+OpenAI) are mocked before any test module imports it, and METRICS_ENABLED is
+set for the whole session so the instrumented functions are wrapped however
+the test modules are ordered.
+
+The `web` fixture gives each test its own game store, session tracking,
+event hub, upload mocks, hint precomputer and empty metrics, all restored
+when the test ends; web.new_game() starts a game for TestHuman against the
+test bots. Test modules change the defaults by overriding the
+`ai_turn_delay` or `game_store` fixtures.
+"""
+
+import os
+import sys
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+os.environ['METRICS_ENABLED'] = '1'
+
+for mod_name in [
+    'supabase', 'cerebras', 'cerebras.cloud', 'cerebras.cloud.sdk',
+    'google_chipr_api', 'openai',
+]:
+    sys.modules[mod_name] = MagicMock()
+
+TEST_BOTS = [
+    {'name': 'Bot_Easy', 'ai_bot_id': 'test_easy', 'difficulty': 'easy'},
+    {'name': 'Bot_Medium', 'ai_bot_id': 'test_medium', 'difficulty': 'medium'},
+    {'name': 'Bot_Hard', 'ai_bot_id': 'test_hard', 'difficulty': 'hard'},
+]
+
+
+class WebEnv:
+    """web_app as one test sees it."""
+
+    def __init__(self, monkeypatch, games, ai_turn_delay):
+        # Imported here so non-web tests (RL/, agents) never load the Flask app
+        import web_app
+        import game
+        import headless_api
+        from game_events import GameEventHub
+        from hint_precompute import HintPrecomputer
+        from metrics import metrics, HISTOGRAMS
+        from session_store import SessionStore
+
+        self.web_app = web_app
+        self.app = web_app.app
+        self.app.config['TESTING'] = True
+        self.games = games
+        self.game_locks = {}
+        self.event_hub = GameEventHub()
+        self.session_store = SessionStore(games, self.game_locks,
+                                          in_use=lambda gid: self.event_hub.subscriber_count(gid) > 0)
+        self.session_store.on_evict(web_app.cleanup_evicted_game)
+        self.hint_precomputer = HintPrecomputer()
+        self.upload = MagicMock(return_value=None)       # web_app.upload_game_state
+        self.game_upload = MagicMock(return_value=None)  # game.upload_game_state
+
+        for name, value in [('games', games), ('game_locks', self.game_locks), ('event_hub', self.event_hub),
+                            ('session_store', self.session_store), ('hint_precomputer', self.hint_precomputer),
+                            ('custom_bot_cache', {}), ('custom_bot_games', {}), ('upload_game_state', self.upload),
+                            ('AI_TURN_DELAY', ai_turn_delay)]:
+            monkeypatch.setattr(web_app, name, value)
+        monkeypatch.setattr(web_app.chat_handler, 'games', games)
+        monkeypatch.setattr(game, 'upload_game_state', self.game_upload)
+        monkeypatch.setattr(headless_api, 'matches', headless_api.HeadlessMatches())
+        monkeypatch.setattr(metrics, 'series', {name: {} for name in HISTOGRAMS})
+        self.client = self.app.test_client()
+
+    def new_game(self, num_bots=1, bots=None, num_games=1):
+        """POST /create_game for TestHuman against the first num_bots TEST_BOTS (or `bots`); returns the game id."""
+        data = self.client.post('/create_game', json={
+            'player_name': 'TestHuman',
+            'num_games': num_games,
+            'selected_bots': bots if bots is not None else TEST_BOTS[:num_bots],
+        }).get_json()
+        assert data['success'], f"create_game failed: {data}"
+        return data['game_id']
+
+    def close(self):
+        self.hint_precomputer.executor.shutdown(wait=True)
+
+
+@pytest.fixture
+def ai_turn_delay():
+    """Seconds between revealed AI moves; 0 unless a test module overrides it."""
+    return 0
+
+
+@pytest.fixture
+def game_store():
+    """The store web_app keeps sessions in; a process-local dict unless overridden."""
+    from game_store import InProcessGameStore
+    return InProcessGameStore()
+
+
+@pytest.fixture
+def web(monkeypatch, game_store, ai_turn_delay):
+    env = WebEnv(monkeypatch, game_store, ai_turn_delay)
+    yield env
+    env.close()
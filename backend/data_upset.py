@@ -6,7 +6,10 @@ from supabase import create_client, Client
 from datetime import datetime
 
 from dotenv import load_dotenv
+from metrics import metrics
+from app_log import get_logger
 load_dotenv()
+log = get_logger('data_upset')
 
 url = os.getenv("SUPABASE_URL")
 # Try legacy secret first, fall back to public key
@@ -86,7 +89,7 @@ def upload_llm_call_info(
         response = supabase.table("llm_calls").insert(data).execute()
         return response
     except Exception as e:
-        print(f"Error uploading LLM call info: {e}")
+        log.error(f"Error uploading LLM call info: {e}")
         return None
 
 
@@ -158,7 +161,7 @@ def get_llm_usage_analytics(start_date=None, end_date=None, model=None, bot_name
         }
 
     except Exception as e:
-        print(f"Error getting LLM analytics: {e}")
+        log.error(f"Error getting LLM analytics: {e}")
         return None
 
 
@@ -186,7 +189,7 @@ def get_recent_llm_calls(limit=10, model=None, success_only=False):
         return response.data
 
     except Exception as e:
-        print(f"Error getting recent LLM calls: {e}")
+        log.error(f"Error getting recent LLM calls: {e}")
         return None
 
 
@@ -208,18 +211,19 @@ def save_bot_to_supabase(bot):
         bot_data['image_path'] = bot.image_path
     if bot.voice_id:
         bot_data['voice_id'] = bot.voice_id
-    print(f"🔧 CUSTOM BOT: Saving bot to supabase:")
+    log.debug(f"🔧 CUSTOM BOT: Saving bot to supabase:")
 
     response = supabase.table('custom_bots').insert(bot_data).execute()
     # if response.model_dump() possibly add error handling
     return response
 
 
+@metrics.timed('phase', 'upload_game_state')
 def upload_game_state(game_id, game_state, timestamp=None, metadata=None):
     # get_game_state returns 'current_turn', not 'current_player'
     current_player = game_state.get("current_turn") or game_state.get("current_player")
     if current_player is None:
-        print("Skipping upload: current_turn/current_player is None")
+        log.debug("Skipping upload: current_turn/current_player is None")
         return None
 
     players = game_state.get("players", [])
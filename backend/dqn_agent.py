@@ -0,0 +1,368 @@
+"""
+Small DQN agent for Golf.
+
+The network scores one (state, action) row at a time: the features.py row for
+the action plus a one-hot action type go in, a single Q-value comes out. All
+legal actions of a decision (or of many decisions, see choose_actions) are
+scored in one batched forward pass.
+
+Training needs PyTorch and runs fine on CPU. export_frozen() writes the
+trained weights to a plain .npz file that FrozenDQNPolicy evaluates with numpy
+alone, so the web app can use the model without importing torch.
+"""
+
+import os
+import random
+import numpy as np
+
+from features import STATE_DIM, ACTION_DIM, ACTION_TYPES, encode_state, encode_actions
+from probabilities import expected_value_draw_vs_discard
+from agents import LearningAgent
+from replay_buffer import PrioritizedSampler
+
+try:
+    import torch
+    import torch.nn as nn
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+ACTION_INPUT_DIM = ACTION_DIM + len(ACTION_TYPES)
+INPUT_DIM = STATE_DIM + ACTION_INPUT_DIM
+MAX_ACTIONS = 12  # take discard / draw-keep / draw-flip x 4 positions
+HIDDEN_SIZES = (64, 64)
+DEFAULT_FROZEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'RL', 'output', 'dqn_frozen.npz')
+
+
+def network_inputs(features, types):
+    """encode_actions() rows with the action type appended as a one-hot."""
+    inputs = np.zeros((len(features), INPUT_DIM), dtype=np.float32)
+    inputs[:, :features.shape[1]] = features
+    inputs[np.arange(len(types)), features.shape[1] + types] = 1.0
+    return inputs
+
+
+def encode_decision(player, game, legal_actions, ev_analysis=None):
+    """Network inputs for every legal action of one decision."""
+    if ev_analysis is None:
+        ev_analysis = expected_value_draw_vs_discard(game, player)
+    state, context = encode_state(player, game, ev_analysis)
+    features, types = encode_actions(state, context, legal_actions)
+    return network_inputs(features, types), types, ev_analysis
+
+
+class ReplayMemory:
+    """
+    Preallocated ring buffer of transitions.
+
+    The state part of a row is stored once per transition and the next
+    decision's legal actions as a padded (MAX_ACTIONS, ACTION_INPUT_DIM) block
+    with a mask, so memory is fixed at construction.
+    """
+
+    def __init__(self, capacity=20000, prioritized=False):
+        self.capacity = capacity
+        self.sampler = PrioritizedSampler(capacity) if prioritized else None
+        self.state = np.zeros((capacity, STATE_DIM), dtype=np.float32)
+        self.action = np.zeros((capacity, ACTION_INPUT_DIM), dtype=np.float32)
+        self.reward = np.zeros(capacity, dtype=np.float32)
+        self.done = np.zeros(capacity, dtype=np.float32)
+        self.next_state = np.zeros((capacity, STATE_DIM), dtype=np.float32)
+        self.next_actions = np.zeros((capacity, MAX_ACTIONS, ACTION_INPUT_DIM), dtype=np.float32)
+        self.next_mask = np.zeros((capacity, MAX_ACTIONS), dtype=bool)
+        self.position = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, inputs, reward, done, next_inputs=None):
+        """Store one transition; inputs is the chosen action's row, next_inputs the next legal rows."""
+        i = self.position
+        self.state[i] = inputs[:STATE_DIM]
+        self.action[i] = inputs[STATE_DIM:]
+        self.reward[i] = reward
+        self.done[i] = float(done)
+        self.next_mask[i] = False
+        if next_inputs is not None and len(next_inputs):
+            n = min(len(next_inputs), MAX_ACTIONS)
+            self.next_state[i] = next_inputs[0, :STATE_DIM]
+            self.next_actions[i, :n] = next_inputs[:n, STATE_DIM:]
+            self.next_mask[i, :n] = True
+        if self.sampler is not None:
+            self.sampler.mark_new(i)
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def sample(self, batch_size):
+        """Indices of a minibatch and their importance weights (None when uniform)."""
+        if self.sampler is not None:
+            return self.sampler.sample(batch_size, self.size)
+        return np.random.randint(0, self.size, size=batch_size), None
+
+
+if TORCH_AVAILABLE:
+    class QNetwork(nn.Module):
+        """MLP mapping one (state, action) row to its Q-value."""
+
+        def __init__(self, input_dim=INPUT_DIM, hidden_sizes=HIDDEN_SIZES):
+            super().__init__()
+            layers = []
+            for size in hidden_sizes:
+                layers += [nn.Linear(input_dim, size), nn.ReLU()]
+                input_dim = size
+            layers.append(nn.Linear(input_dim, 1))
+            self.layers = nn.Sequential(*layers)
+
+        def forward(self, x):
+            return self.layers(x).squeeze(-1)
+
+
+class DQNAgent(LearningAgent):
+    """
+    Deep Q-learning agent: small MLP, replay memory and target network.
+
+    Each finished game is pushed to the replay memory, followed by
+    train_steps_per_game minibatch updates, sampled by TD-error priority when
+    prioritized_replay is set. The target network is synced every
+    target_update updates.
+    """
+    def __init__(self, learning_rate=1e-3, discount_factor=0.9, epsilon=0.2, n_bootstrap_games=0,
+                 replay_capacity=20000, batch_size=128, train_steps_per_game=4, target_update=200,
+                 hidden_sizes=HIDDEN_SIZES, prioritized_replay=False):
+        if not TORCH_AVAILABLE:
+            raise ImportError("PyTorch is required for DQNAgent (FrozenDQNPolicy only needs numpy)")
+        super().__init__(learning_rate, discount_factor, epsilon, n_bootstrap_games)
+        self.hidden_sizes = hidden_sizes
+        self.network = QNetwork(hidden_sizes=hidden_sizes)
+        self.target_network = QNetwork(hidden_sizes=hidden_sizes)
+        self.target_network.load_state_dict(self.network.state_dict())
+        self.optimizer = torch.optim.Adam(self.network.parameters(), lr=learning_rate)
+        self.criterion = nn.SmoothL1Loss()
+        self.replay = ReplayMemory(replay_capacity, prioritized=prioritized_replay)
+        self.batch_size = batch_size
+        self.train_steps_per_game = train_steps_per_game
+        self.target_update = target_update
+        self.updates = 0
+
+    def choose_action(self, player, game_state, trajectory=None):
+        return self.choose_actions([player], [game_state], [trajectory])[0]
+
+    def choose_actions(self, players, games, trajectories=None):
+        """
+        Choose actions for several decisions at once (e.g. one per concurrent
+        game) with a single forward pass over all their legal actions.
+        """
+        if trajectories is None:
+            trajectories = [None] * len(players)
+        decisions = []
+        for player, game in zip(players, games):
+            legal_actions = self.get_legal_actions(player, game)
+            if legal_actions:
+                inputs, types, ev_analysis = encode_decision(player, game, legal_actions,
+                                                             self.teacher_cache.ev(player, game))
+                decisions.append((legal_actions, inputs, types, ev_analysis))
+            else:
+                decisions.append(None)
+
+        batch = [d[1] for d in decisions if d is not None]
+        if batch:
+            with torch.no_grad():
+                q_all = self.network(torch.from_numpy(np.concatenate(batch))).numpy()
+
+        actions, offset = [], 0
+        for player, game, trajectory, decision in zip(players, games, trajectories, decisions):
+            if decision is None:
+                actions.append(None)
+                continue
+            legal_actions, inputs, types, ev_analysis = decision
+            q_values = q_all[offset:offset + len(legal_actions)]
+            offset += len(legal_actions)
+
+            if self.games_played < self.n_bootstrap_games:
+                action = self.teacher_cache.teacher_action(player, game)
+                index = legal_actions.index(action) if action in legal_actions else 0
+            elif self.training_mode and random.random() < self.epsilon:
+                chosen_type = random.choice(sorted(set(types.tolist())))
+                index = random.choice(np.flatnonzero(types == chosen_type).tolist())
+            else:
+                index = int(np.argmax(q_values))
+            action = legal_actions[index]
+            actions.append(action)
+
+            if trajectory is not None:
+                trajectory.append({
+                    'state_key': self.get_state_key(player, game, ev_analysis),
+                    'action_key': self.get_action_key(action),
+                    'action': action,
+                    'round': getattr(game, 'round', None),
+                    'inputs': inputs[index],
+                    'legal_inputs': inputs,
+                })
+        return actions
+
+    def remember(self, trajectory, final_reward):
+        """Push one game's transitions to the replay memory (same rewards as the tabular agent)."""
+        for i, step in enumerate(trajectory):
+            last = i == len(trajectory) - 1
+            reward = 0.1 + (final_reward if last else 0.0)
+            next_inputs = None if last else trajectory[i + 1]['legal_inputs']
+            self.replay.push(step['inputs'], reward, last, next_inputs)
+
+    def train_step(self, indices=None, weights=None):
+        """
+        One minibatch update. indices/weights let a prioritized buffer choose
+        the batch and importance weights; returns the per-sample TD errors.
+        """
+        replay = self.replay
+        if indices is None:
+            indices, weights = replay.sample(self.batch_size)
+        inputs = torch.from_numpy(np.concatenate([replay.state[indices], replay.action[indices]], axis=1))
+        next_state = replay.next_state[indices]
+        next_actions = replay.next_actions[indices]
+        next_mask = torch.from_numpy(replay.next_mask[indices])
+        next_inputs = np.concatenate([np.repeat(next_state[:, None, :], MAX_ACTIONS, axis=1), next_actions], axis=2)
+
+        with torch.no_grad():
+            next_q = self.target_network(torch.from_numpy(next_inputs))
+            next_q = next_q.masked_fill(~next_mask, float('-inf')).max(dim=1).values
+            next_q = torch.where(next_mask.any(dim=1), next_q, torch.zeros_like(next_q))
+            target = (torch.from_numpy(replay.reward[indices]) +
+                      self.discount_factor * (1.0 - torch.from_numpy(replay.done[indices])) * next_q)
+
+        q = self.network(inputs)
+        if weights is None:
+            loss = self.criterion(q, target)
+        else:
+            loss = (torch.from_numpy(np.asarray(weights, dtype=np.float32)) *
+                    nn.functional.smooth_l1_loss(q, target, reduction='none')).mean()
+        self.optimizer.zero_grad()
+        loss.backward()
+        self.optimizer.step()
+
+        self.updates += 1
+        if self.updates % self.target_update == 0:
+            self.target_network.load_state_dict(self.network.state_dict())
+        return (target - q.detach()).numpy()
+
+    def train_on_trajectory(self, trajectory, final_reward, final_score):
+        if not trajectory:
+            return
+        self.remember(trajectory, final_reward)
+        if len(self.replay) < self.batch_size:
+            return
+        for _ in range(self.train_steps_per_game):
+            indices, weights = self.replay.sample(self.batch_size)
+            td_errors = self.train_step(indices, weights)
+            if self.replay.sampler is not None:
+                self.replay.sampler.update_priorities(indices, td_errors)
+
+    def get_q_table_size(self):
+        """(transitions in replay, network parameters)"""
+        return len(self.replay), sum(p.numel() for p in self.network.parameters())
+
+    def export_frozen(self, path=DEFAULT_FROZEN_PATH):
+        """Write the network weights as a numpy-only model for FrozenDQNPolicy."""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        linear_layers = [m for m in self.network.layers if isinstance(m, nn.Linear)]
+        arrays = {}
+        for i, layer in enumerate(linear_layers):
+            arrays[f'w{i}'] = layer.weight.detach().numpy().T.copy()
+            arrays[f'b{i}'] = layer.bias.detach().numpy().copy()
+        np.savez(path, num_layers=len(linear_layers), input_dim=INPUT_DIM, **arrays)
+        print(f"Frozen DQN model saved to {path}")
+        return path
+
+
+class FrozenDQNPolicy:
+    """Greedy policy from an exported DQN model; numpy only, no training."""
+
+    def __init__(self, layers):
+        self.layers = layers  # [(weight, bias), ...]
+
+    @classmethod
+    def load(cls, path=DEFAULT_FROZEN_PATH):
+        data = np.load(path)
+        if int(data['input_dim']) != INPUT_DIM:
+            raise ValueError(f"Frozen DQN at {path} expects {int(data['input_dim'])} inputs, features give {INPUT_DIM}")
+        layers = [(data[f'w{i}'], data[f'b{i}']) for i in range(int(data['num_layers']))]
+        return cls(layers)
+
+    def q_values(self, inputs):
+        x = inputs
+        for i, (weight, bias) in enumerate(self.layers):
+            x = x @ weight + bias
+            if i < len(self.layers) - 1:
+                x = np.maximum(x, 0.0)
+        return x[:, 0]
+
+    def choose_action(self, player, game_state, trajectory=None):
+        legal_actions = LearningAgent.get_legal_actions(player, game_state)
+        if not legal_actions:
+            return None
+        inputs, _, _ = encode_decision(player, game_state, legal_actions)
+        return legal_actions[int(np.argmax(self.q_values(inputs)))]
+
+
+_frozen_policies = {}
+
+
+def load_frozen_policy(path=DEFAULT_FROZEN_PATH):
+    """Frozen policy for path, loaded once per process. None if no model has been exported."""
+    if path not in _frozen_policies:
+        if not os.path.exists(path):
+            return None
+        _frozen_policies[path] = FrozenDQNPolicy.load(path)
+    return _frozen_policies[path]
+
+
+def play_games_batched(agent, num_games, opponent_type="random", concurrent=32, train=True):
+    """
+    Play num_games two-player games of agent vs opponent_type, keeping up to
+    `concurrent` games in flight so the agent's decisions are batched through
+    choose_actions(). Returns the list of (agent_score, opponent_score).
+    """
+    from game import GolfGame
+
+    results = []
+    started = 0
+    active = []  # [game, step, trajectory]
+    while started < num_games or active:
+        while started < num_games and len(active) < concurrent:
+            game = GolfGame(num_players=2, agent_types=["dqn", opponent_type], q_agents=[agent, None])
+            active.append([game, 0, []])
+            started += 1
+
+        # Mirror GolfGame.play_game: max_rounds passes over every seat
+        agent_turns = []
+        for entry in active:
+            game, step, trajectory = entry
+            player = game.players[game.turn]
+            if game.turn == 0 and not all(player.known):
+                agent_turns.append(entry)
+            elif not all(player.known):
+                game.play_turn(player)
+        if agent_turns:
+            actions = agent.choose_actions([e[0].players[0] for e in agent_turns],
+                                           [e[0] for e in agent_turns],
+                                           [e[2] if train else None for e in agent_turns])
+            for entry, action in zip(agent_turns, actions):
+                entry[0].apply_action(entry[0].players[0], action)
+
+        still_active = []
+        for entry in active:
+            game = entry[0]
+            game.next_player()
+            entry[1] += 1
+            if entry[1] % game.num_players == 0:
+                game.round += 1
+            if entry[1] < game.max_rounds * game.num_players:
+                still_active.append(entry)
+                continue
+            scores = [game.calculate_score(p.grid) for p in game.players]
+            if train:
+                agent.train_on_trajectory(entry[2], 1.0 if scores[0] <= scores[1] else -1.0, scores[0])
+            agent.notify_game_end()
+            results.append((scores[0], scores[1]))
+        active = still_active
+    return results
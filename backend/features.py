@@ -0,0 +1,167 @@
+"""
+Fixed-size numeric features for function-approximation agents.
+
+encode_state() turns one player's view of the game into a state vector built
+from the same information the tabular Q-learning key uses: expected hand
+score, unseen-rank counts, draw advantage (expected_value_draw_vs_discard),
+discard rank and round. encode_actions() adds per-action features (what the
+touched position holds, what replaces it, whether it forms or breaks a pair)
+and returns one row per legal action, so all actions are scored with a single
+matrix product.
+
+Continuous values (draw advantage, hand score) are also tile coded: several
+offset one-hot bucketings, which lets a linear model represent non-linear
+responses while staying fixed-size.
+"""
+
+import numpy as np
+
+from probabilities import expected_value_draw_vs_discard
+
+RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+RANK_INDEX = {rank: i for i, rank in enumerate(RANKS)}
+RANK_SCORES = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 0, 10, 10], dtype=np.float32)
+
+# Action types, used to pick a weight block per type
+ACTION_TYPES = ('take_discard', 'draw_deck_keep', 'draw_deck_flip')
+TAKE_DISCARD, DRAW_KEEP, DRAW_FLIP = range(3)
+
+NUM_TILINGS = 3
+ADVANTAGE_TILES = (-10.0, 10.0, 8)   # low, high, tiles per tiling
+HAND_TILES = (-5.0, 40.0, 9)
+NUM_ROUNDS = 4
+
+
+def tile_code(value, low, high, num_tiles, num_tilings=NUM_TILINGS):
+    """One-hot tile activations (num_tilings * num_tiles) for a scalar value."""
+    out = np.zeros(num_tilings * num_tiles, dtype=np.float32)
+    width = (high - low) / num_tiles
+    for t in range(num_tilings):
+        offset = width * t / num_tilings
+        tile = int((value - low + offset) // width)
+        out[t * num_tiles + min(max(tile, 0), num_tiles - 1)] = 1.0
+    return out
+
+
+STATE_DIM = (1                                      # bias
+             + 4                                    # hand score, draw advantage, discard score, hidden count
+             + len(RANKS)                           # unseen rank counts
+             + len(RANKS) + 1                       # discard rank one-hot (+ none)
+             + NUM_ROUNDS                           # round one-hot
+             + NUM_TILINGS * ADVANTAGE_TILES[2]
+             + NUM_TILINGS * HAND_TILES[2])
+ACTION_DIM = 6
+FEATURE_DIM = STATE_DIM + ACTION_DIM
+
+
+def unseen_rank_counts(player, game):
+    """Copies of each rank this player has not seen (public cards, discards, own private cards)."""
+    counts = np.full(len(RANKS), 4.0, dtype=np.float32)
+    for p in game.players:
+        for i, card in enumerate(p.grid):
+            if card and (p.known[i] or (p is player and p.privately_visible[i])):
+                counts[RANK_INDEX[card.rank]] -= 1
+    for card in game.discard_pile:
+        counts[RANK_INDEX[card.rank]] -= 1
+    return np.maximum(counts, 0.0)
+
+
+def visible_ranks(player):
+    """Rank this player can see at each grid position, or None for a hidden card."""
+    return [card.rank if card and (player.known[i] or player.privately_visible[i]) else None
+            for i, card in enumerate(player.grid)]
+
+
+def encode_state(player, game, ev_analysis=None):
+    """
+    State vector (STATE_DIM,) plus the context encode_actions() needs.
+    ev_analysis can be passed in when the caller already computed it.
+    """
+    if ev_analysis is None:
+        ev_analysis = expected_value_draw_vs_discard(game, player)
+    hand_score = float(ev_analysis.get('current_hand_score', 0.0))
+    draw_advantage = float(ev_analysis.get('draw_advantage', 0.0))
+
+    unseen = unseen_rank_counts(player, game)
+    total_unseen = unseen.sum()
+    unseen_probs = unseen / total_unseen if total_unseen else unseen
+    expected_unseen = float(unseen_probs @ RANK_SCORES)
+
+    discard = game.discard_pile[-1] if game.discard_pile else None
+    discard_onehot = np.zeros(len(RANKS) + 1, dtype=np.float32)
+    discard_onehot[RANK_INDEX[discard.rank] if discard else len(RANKS)] = 1.0
+    round_onehot = np.zeros(NUM_ROUNDS, dtype=np.float32)
+    round_onehot[min(max(game.round, 1), NUM_ROUNDS) - 1] = 1.0
+
+    hidden = sum(1 for known in player.known if not known)
+    state = np.concatenate([
+        [1.0, hand_score / 10.0, draw_advantage / 10.0,
+         (discard.score() if discard else 0) / 10.0, hidden / 4.0],
+        unseen / 4.0,
+        discard_onehot,
+        round_onehot,
+        tile_code(draw_advantage, *ADVANTAGE_TILES),
+        tile_code(hand_score, *HAND_TILES),
+    ]).astype(np.float32)
+
+    context = {
+        'ranks': visible_ranks(player),
+        'unseen_probs': unseen_probs,
+        'expected_unseen': expected_unseen,
+        'discard': discard,
+    }
+    return state, context
+
+
+def action_type(action):
+    if action['type'] == 'take_discard':
+        return TAKE_DISCARD
+    return DRAW_KEEP if action.get('keep', True) else DRAW_FLIP
+
+
+def _pair_partner(ranks, position):
+    """True if the card at position pairs with another visible card."""
+    rank = ranks[position]
+    return rank is not None and any(r == rank for i, r in enumerate(ranks) if i != position)
+
+
+def encode_actions(state, context, legal_actions):
+    """
+    Feature matrix (len(legal_actions), FEATURE_DIM) and the action type of each row.
+    """
+    ranks = context['ranks']
+    unseen_probs = context['unseen_probs']
+    expected_unseen = context['expected_unseen']
+    discard = context['discard']
+
+    features = np.empty((len(legal_actions), FEATURE_DIM), dtype=np.float32)
+    features[:, :STATE_DIM] = state
+    types = np.empty(len(legal_actions), dtype=np.int64)
+    for row, action in enumerate(legal_actions):
+        kind = action_type(action)
+        position = action['flip_position'] if kind == DRAW_FLIP else action['position']
+        rank = ranks[position]
+        current_value = RANK_SCORES[RANK_INDEX[rank]] if rank is not None else expected_unseen
+        others = [r for i, r in enumerate(ranks) if i != position and r is not None]
+
+        if kind == TAKE_DISCARD and discard:
+            new_value = discard.score()
+            forms_pair = float(discard.rank in others)
+        elif kind == DRAW_KEEP:
+            new_value = expected_unseen
+            forms_pair = float(sum(unseen_probs[RANK_INDEX[r]] for r in set(others)))
+        else:
+            # Flipping keeps the card in place; it only becomes public
+            new_value = current_value
+            forms_pair = 0.0
+
+        features[row, STATE_DIM:] = (
+            current_value / 10.0,
+            float(rank is None),
+            new_value / 10.0,
+            forms_pair,
+            float(_pair_partner(ranks, position)),
+            (new_value - current_value) / 10.0,
+        )
+        types[row] = kind
+    return features, types
@@ -2,12 +2,19 @@ import itertools
 import random
 # Import from same directory
 from models import Player, Card
-from agents import RandomAgent, HeuristicAgent, QLearningAgent, HumanAgent, EVAgent, AdvancedEVAgent
+from agents import RandomAgent, HeuristicAgent, QLearningAgent, HumanAgent, EVAgent, AdvancedEVAgent, LinearQAgent
 from data_upset import upload_game_state
+from metrics import metrics
+from app_log import get_logger
+
+log = get_logger('game')
+
+ACTION_TAKE_DISCARD, ACTION_DRAW_KEEP, ACTION_DRAW_DISCARD = 0, 1, 2
 
 class GolfGame:
     RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
     SUITS = ['♠', '♥', '♦', '♣']
+    upload_state = True  # upload the state after every action (off for headless matches)
 
     def __init__(self, num_players=4, agent_types=None, q_agents=None):
         self.num_players = num_players
@@ -24,8 +31,20 @@ class GolfGame:
         self.last_action = None
         self.action_history = []
         self.last_action_turn = None
+        self.action_log = []  # (turn, round, player index, ACTION_*, position, new card, old card, flip position, flipped card)
         self.drawn_card = None  # Add this line
 
+    def __getstate__(self):
+        # Agents are rebuilt from the players' agent types when a stored game is
+        # loaded; they can hold whole models and are not part of the game state
+        state = self.__dict__.copy()
+        state.pop('agents', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.agents = self.create_agents([player.agent_type for player in self.players])
+
     def create_agents(self, agent_types, q_agents=None):
         agents = []
         for i, agent_type in enumerate(agent_types):
@@ -39,6 +58,22 @@ class GolfGame:
                     agents.append(q_agents[i])
                 else:
                     agents.append(QLearningAgent())
+            elif agent_type == "linear":
+                # Linear function-approximation agent, shared the same way as qlearning
+                if q_agents and i < len(q_agents) and q_agents[i] is not None:
+                    agents.append(q_agents[i])
+                else:
+                    agents.append(LinearQAgent())
+            elif agent_type == "dqn":
+                if q_agents and i < len(q_agents) and q_agents[i] is not None:
+                    agents.append(q_agents[i])
+                else:
+                    from dqn_agent import load_frozen_policy
+                    policy = load_frozen_policy()
+                    if policy is None:
+                        log.warning("❌ No exported DQN model found, using EV agent instead")
+                        policy = EVAgent()
+                    agents.append(policy)
             elif agent_type == "ev_ai":
                 agents.append(EVAgent())
             elif agent_type == "advanced_ev":
@@ -83,8 +118,12 @@ class GolfGame:
 
     def play_turn(self, player, trajectory=None):
         agent = self.agents[self.turn]
-        action = agent.choose_action(player, self, trajectory)
+        with metrics.timer('choose_action', type(agent).__name__):
+            action = agent.choose_action(player, self, trajectory)
+        self.apply_action(player, action)
 
+    def apply_action(self, player, action):
+        """Apply an already chosen action for the player whose turn it is."""
         if not action:
             return  # No moves left
 
@@ -98,13 +137,7 @@ class GolfGame:
             player.known[action['position']] = True
             player.add_to_discard_memory(old_card)
             self.discard_pile.append(old_card)
-            self.last_action = f"<strong>{player.name}</strong> took {new_card} from discard and placed it at position {action['position']+1}, discarding {old_card}"
-            current_turn_id = (self.turn, self.round)
-            if self.action_history and self.last_action_turn == current_turn_id:
-                self.action_history[-1] = self.last_action
-            else:
-                self.action_history.append(self.last_action)
-            self.last_action_turn = current_turn_id
+            self.record_action(player, ACTION_TAKE_DISCARD, new_card, old_card, action['position'])
         elif action['type'] == 'draw_deck' and self.deck:
             # Draw from deck
             new_card = self.deck.pop()
@@ -118,56 +151,30 @@ class GolfGame:
                 player.known[action['position']] = True
                 player.add_to_discard_memory(old_card)
                 self.discard_pile.append(old_card)
-                self.last_action = f"<strong>{player.name}</strong> drew {new_card} and kept it at position {action['position']+1}, discarding {old_card}"
-                current_turn_id = (self.turn, self.round)
-                if self.action_history and self.last_action_turn == current_turn_id:
-                    self.action_history[-1] = self.last_action
-                else:
-                    self.action_history.append(self.last_action)
-                self.last_action_turn = current_turn_id
+                self.record_action(player, ACTION_DRAW_KEEP, new_card, old_card, action['position'])
                 self.drawn_card = None  # Reset after decision
             else:
                 # Discard the drawn card and flip a grid card
                 player.add_to_discard_memory(new_card)
                 self.discard_pile.append(new_card)
-                self.last_action = f"<strong>{player.name}</strong> drew {new_card} and discarded it"
-                current_turn_id = (self.turn, self.round)
-                if self.action_history and self.last_action_turn == current_turn_id:
-                    self.action_history[-1] = self.last_action
-                else:
-                    self.action_history.append(self.last_action)
-                self.last_action_turn = current_turn_id
                 self.drawn_card = None  # Reset after decision
 
                 # If player chose to flip one of their own cards, just flip it
-                if 'flip_position' in action:
-                    flip_pos = action['flip_position']
+                flip_pos = action.get('flip_position')
+                flipped_card = None
+                if flip_pos is not None:
                     # Get the card that was flipped
                     flipped_card = player.grid[flip_pos]
                     # Make the card at flip_position visible to ALL players - only for this player's grid
                     player.known[flip_pos] = True
-                    
-                    if flipped_card:
-                        self.last_action += f", and flipped their card at position {flip_pos+1} ({flipped_card})"
-                        current_turn_id = (self.turn, self.round)
-                        if self.action_history and self.last_action_turn == current_turn_id:
-                            self.action_history[-1] = self.last_action
-                        else:
-                            self.action_history.append(self.last_action)
-                        self.last_action_turn = current_turn_id
-                    else:
-                        self.last_action += f", and flipped their card at position {flip_pos+1}"
-                        current_turn_id = (self.turn, self.round)
-                        if self.action_history and self.last_action_turn == current_turn_id:
-                            self.action_history[-1] = self.last_action
-                        else:
-                            self.action_history.append(self.last_action)
-                        self.last_action_turn = current_turn_id
+                self.record_action(player, ACTION_DRAW_DISCARD, new_card, None, -1, flip_pos, flipped_card)
 
         # Display updated grids after the action
         # self.display_all_grids() # tst
 
         # --- Upload game state after every action ---
+        if not self.upload_state:
+            return
         try:
             game_state = {
                 "round": self.round,
@@ -185,7 +192,44 @@ class GolfGame:
                 game_state=game_state
             )
         except Exception as e:
-            print(f"Game state upload failed (non-fatal): {e}")
+            log.warning(f"Game state upload failed (non-fatal): {e}")
+
+    def record_action(self, player, kind, new_card, old_card, position, flip_position=None, flipped_card=None):
+        """Append an action to the structured log and update the text history shown to players."""
+        entry = (self.turn, self.round, self.players.index(player), kind, position,
+                 new_card, old_card, flip_position, flipped_card)
+        self.action_log.append(entry)
+        self._describe_logged(entry)
+
+    def _describe_logged(self, entry):
+        turn, round_number, player_index, kind, position, new_card, old_card, flip_position, flipped_card = entry
+        name = self.players[player_index].name
+        if kind == ACTION_TAKE_DISCARD:
+            text = f"<strong>{name}</strong> took {new_card} from discard and placed it at position {position+1}, discarding {old_card}"
+        elif kind == ACTION_DRAW_KEEP:
+            text = f"<strong>{name}</strong> drew {new_card} and kept it at position {position+1}, discarding {old_card}"
+        else:
+            text = f"<strong>{name}</strong> drew {new_card} and discarded it"
+            if flip_position is not None and flipped_card:
+                text += f", and flipped their card at position {flip_position+1} ({flipped_card})"
+            elif flip_position is not None:
+                text += f", and flipped their card at position {flip_position+1}"
+        self.last_action = text
+        # Several actions in one turn show as a single history line
+        current_turn_id = (turn, round_number)
+        if self.action_history and self.last_action_turn == current_turn_id:
+            self.action_history[-1] = text
+        else:
+            self.action_history.append(text)
+        self.last_action_turn = current_turn_id
+
+    def rebuild_action_history(self):
+        """Regenerate last_action / action_history text from action_log (e.g. after decoding)."""
+        self.last_action = None
+        self.action_history = []
+        self.last_action_turn = None
+        for entry in self.action_log:
+            self._describe_logged(entry)
 
     def all_players_done(self):
         return all(all(p.known) for p in self.players)
@@ -0,0 +1,177 @@
+"""
+Server-Sent Events hub for game state updates.
+
+After every committed change to a game, web_app publishes the new state
+once: it is serialized a single time into an SSE frame and every subscriber
+of that game receives the same bytes. Subscribers block on a condition
+variable between updates, so an idle game costs nothing.
+
+Each open stream does hold one gunicorn thread, though (gthread workers
+have no async I/O). So a process serves at most SSE_MAX_STREAMS of them;
+past that subscribe() returns None, the route answers 503 and the client
+falls back to polling /game_state. A client that went away is only noticed
+when the next keepalive write fails, so keepalives are short.
+"""
+
+import json
+import os
+import threading
+
+KEEPALIVE_SECONDS = 5
+SSE_MAX_STREAMS = int(os.getenv('SSE_MAX_STREAMS', 6))
+
+
+class GameEventHub:
+    """
+    Args:
+        max_streams: Most streams open at once in this process (None for no limit)
+    """
+
+    def __init__(self, max_streams=SSE_MAX_STREAMS):
+        self._lock = threading.Lock()
+        self._channels = {}  # game_id -> _Channel
+        self.max_streams = max_streams
+        self.open_streams = 0
+        self.rejected = 0
+
+    def _channel(self, game_id):
+        with self._lock:
+            channel = self._channels.get(game_id)
+            if channel is None:
+                channel = self._channels[game_id] = _Channel()
+            return channel
+
+    def publish(self, game_id, state, version=None):
+        """
+        Serialize state once (or take already-serialized JSON bytes) and wake
+        every subscriber of game_id. Returns the event id.
+        """
+        return self._channel(game_id).publish(state, version)
+
+    def invalidate(self, game_id):
+        """Drop the stored frame after a change nobody was listening for."""
+        channel = self._channels.get(game_id)
+        if channel:
+            with channel.condition:
+                channel.frame = None
+
+    def latest(self, game_id):
+        """(event_id, frame bytes) of the last published state, or (0, None)."""
+        channel = self._channels.get(game_id)
+        return (channel.event_id, channel.frame) if channel else (0, None)
+
+    def subscribe(self, game_id, last_event_id=0, keepalive=KEEPALIVE_SECONDS, on_idle=None):
+        """
+        Iterator of SSE frames for game_id: the latest state right away (if
+        newer than last_event_id), then each new state as it is published.
+        Yields a comment line every `keepalive` seconds so proxies keep the
+        connection open. on_idle(), if given, runs after each quiet interval
+        and may publish (e.g. changes committed by another worker).
+
+        Returns None when max_streams streams are already open. The slot is
+        taken here and given back when the stream ends or is closed.
+        """
+        with self._lock:
+            if self.max_streams is not None and self.open_streams >= self.max_streams:
+                self.rejected += 1
+                return None
+            self.open_streams += 1
+        return _Stream(self, self._frames(game_id, last_event_id, keepalive, on_idle))
+
+    def _release_stream(self):
+        with self._lock:
+            self.open_streams -= 1
+
+    def _frames(self, game_id, last_event_id, keepalive, on_idle):
+        channel = self._channel(game_id)
+        seen = last_event_id
+        with channel.condition:
+            channel.subscribers += 1
+        try:
+            while not channel.closed:
+                with channel.condition:
+                    if channel.event_id == seen or channel.frame is None:
+                        channel.condition.wait(timeout=keepalive)
+                    event_id, frame = channel.event_id, channel.frame
+                if on_idle is not None and event_id == seen and not channel.closed:
+                    on_idle()
+                    event_id, frame = channel.event_id, channel.frame
+                if channel.closed:
+                    return
+                if event_id != seen and frame is not None:
+                    seen = event_id
+                    yield frame
+                else:
+                    yield b': keepalive\n\n'
+        finally:
+            with channel.condition:
+                channel.subscribers -= 1
+
+    def close(self, game_id):
+        """End all streams for game_id (e.g. when the game is removed)."""
+        with self._lock:
+            channel = self._channels.pop(game_id, None)
+        if channel:
+            channel.close()
+
+    def subscriber_count(self, game_id):
+        channel = self._channels.get(game_id)
+        return channel.subscribers if channel else 0
+
+    def stats(self):
+        with self._lock:
+            return {'open_streams': self.open_streams, 'max_streams': self.max_streams, 'rejected': self.rejected}
+
+
+class _Stream:
+    """A subscriber's frames; gives its stream slot back exactly once, however it ends."""
+
+    def __init__(self, hub, frames):
+        self.hub = hub
+        self.frames = frames
+        self.released = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self.frames)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        if self.released:
+            return
+        self.released = True
+        try:
+            self.frames.close()
+        finally:
+            self.hub._release_stream()
+
+    def __del__(self):
+        self.close()
+
+
+class _Channel:
+    def __init__(self):
+        self.condition = threading.Condition()
+        self.event_id = 0
+        self.frame = None
+        self.closed = False
+        self.subscribers = 0
+
+    def publish(self, state, version=None):
+        with self.condition:
+            self.event_id = version if version is not None else self.event_id + 1
+            if not isinstance(state, bytes):
+                state = json.dumps(state, separators=(',', ':')).encode('utf-8')
+            self.frame = f"id: {self.event_id}\nevent: state\ndata: ".encode('utf-8') + state + b'\n\n'
+            self.condition.notify_all()
+            return self.event_id
+
+    def close(self):
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
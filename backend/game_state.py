@@ -1,18 +1,141 @@
+import json
+import time
 
+from metrics import metrics
+from app_log import get_logger
+from state_delta import diff
+
+log = get_logger('game_state')
+
+STATE_HISTORY = 8  # past versions kept per session to diff against; older clients get the full state
+
+
+def bump_version(game_session):
+    """Mark a session as changed; call after every mutation so get_game_state rebuilds it."""
+    game_session['version'] = game_session.get('version', 0) + 1
+    return game_session['version']
+
+
+@metrics.timed('phase', 'get_game_state')
 def get_game_state(game_id, games):
-    # print(f"DEBUG: get_game_state called with game_id={game_id}")
-    """Get formatted game state for frontend"""
-    from probabilities import get_probabilities, get_deck_counts, expected_value_draw_vs_discard
-    from web_app import get_public_score, get_private_score
+    """
+    Get formatted game state for frontend.
+
+    The state is built once per session version and cached on the session, so
+    repeat reads between moves are O(1). Only the AI reveal countdown depends
+    on the clock; it is refreshed on each read while it is still running.
+    """
     if game_id not in games:
-        # print(f"DEBUG: game_id {game_id} not found in games dict")
         return None
-    # print(f"DEBUG: games[{game_id}] = {games[game_id]}")
     game_session = games[game_id]
     if 'game' not in game_session:
-        print(f"DEBUG: 'game' key not found in games[{game_id}]")
+        log.debug(f"DEBUG: 'game' key not found in games[{game_id}]")
         return None
 
+    version = game_session.get('version', 0)
+    cache = game_session.get('_state_cache')
+    if cache is None or cache['version'] != version:
+        if cache is not None:
+            _remember_version(game_session, cache)
+        cache = game_session['_state_cache'] = {
+            'version': version,
+            'state': _build_game_state(game_id, game_session),
+            'json': None,
+            'deltas': {},
+        }
+
+    state = cache['state']
+    if state['reveal_in_ms'] > 0:
+        reveal_in_ms = _reveal_in_ms(game_session)
+        if reveal_in_ms == 0:
+            # The countdown only runs down, so the settled state can be cached for good
+            state = cache['state'] = dict(state, ai_thinking=False, reveal_in_ms=0)
+            cache['json'] = None
+            cache['deltas'] = {}
+        else:
+            state = dict(state, ai_thinking=True, reveal_in_ms=reveal_in_ms)
+    return state
+
+
+def get_game_state_json(game_id, games):
+    """get_game_state serialized to JSON bytes, cached per version alongside the dict."""
+    state = get_game_state(game_id, games)
+    if state is None:
+        return None
+    cache = games[game_id]['_state_cache']
+    if state is not cache['state']:
+        return json.dumps(state, separators=(',', ':')).encode('utf-8')  # countdown still running
+    if cache['json'] is None:
+        cache['json'] = json.dumps(state, separators=(',', ':')).encode('utf-8')
+    return cache['json']
+
+
+def get_game_state_delta(game_id, games, since_version):
+    """
+    {'version', 'base_version', 'delta'} turning the client's since_version
+    state into the current one, or the full state when that version is no
+    longer kept (or was never sent). The reveal countdown is always included
+    since clients zero it locally once it has run out.
+    """
+    state = get_game_state(game_id, games)
+    if state is None or since_version is None:
+        return state
+    game_session = games[game_id]
+    cache = game_session['_state_cache']
+    if since_version == cache['version']:
+        base = _settled(cache['state'])
+    else:
+        base = game_session.get('_state_history', {}).get(since_version)
+    if base is None:
+        return state
+
+    cacheable = state is cache['state']
+    if cacheable and since_version in cache['deltas']:
+        return cache['deltas'][since_version][0]
+    patch = diff(base, state) or {'$obj': {}}
+    patch['$obj']['ai_thinking'] = {'$set': state['ai_thinking']}
+    patch['$obj']['reveal_in_ms'] = {'$set': state['reveal_in_ms']}
+    delta = {'version': cache['version'], 'base_version': since_version, 'delta': patch}
+    if cacheable:
+        cache['deltas'][since_version] = [delta, None]
+    return delta
+
+
+def get_game_state_delta_json(game_id, games, since_version):
+    """get_game_state_delta serialized to JSON bytes, cached like get_game_state_json."""
+    delta = get_game_state_delta(game_id, games, since_version)
+    if delta is None or 'delta' not in delta:
+        return get_game_state_json(game_id, games)
+    entry = games[game_id]['_state_cache']['deltas'].get(since_version)
+    if entry is None or entry[0] is not delta:
+        return json.dumps(delta, separators=(',', ':')).encode('utf-8')
+    if entry[1] is None:
+        entry[1] = json.dumps(delta, separators=(',', ':')).encode('utf-8')
+    return entry[1]
+
+
+def _settled(state):
+    if state['reveal_in_ms'] == 0:
+        return state
+    return dict(state, ai_thinking=False, reveal_in_ms=0)
+
+
+def _remember_version(game_session, cache):
+    history = game_session.setdefault('_state_history', {})
+    history[cache['version']] = _settled(cache['state'])
+    while len(history) > STATE_HISTORY:
+        del history[min(history)]
+
+
+def _reveal_in_ms(game_session):
+    return max(0, int((game_session.get('ai_reveal_at', 0) - time.time()) * 1000))
+
+
+def _build_game_state(game_id, game_session):
+    from probabilities import get_probabilities, get_deck_counts, expected_value_draw_vs_discard
+    from hint_precompute import ready_hints, hints_pending
+    from web_app import get_public_score, get_private_score
+
     game = game_session['game']
 
     # Format player grids - show what the human player can see
@@ -94,17 +217,23 @@ def get_game_state(game_id, games):
     if game_session['game_over']:
         winner = public_scores.index(min(public_scores))  # Use public scores for winner determination
 
+    # On the human's turn the EV analysis is computed in the background; while that
+    # is still running it is left out here and the client fetches it from /hints
+    hints = ready_hints(game_session) if game.turn == 0 else None
+    ev_analysis = hints['ev_analysis'] if hints else None
+    ev_pending = ev_analysis is None and game.turn == 0 and hints_pending(game_session)
+
     # Probabilities/statistics from probabilities.py
-    probabilities = get_probabilities(game)
+    probabilities = get_probabilities(game, ev_analysis=ev_analysis, include_ev=not ev_pending)
 
     # Add deck counts (public cards only)
     deck_counts = get_deck_counts(game)
 
     # Calculate expected value analysis for current player only
     current_player_ev_analysis = None
-    if not game_session['game_over'] and game.turn < len(game.players):
+    if not game_session['game_over'] and game.turn < len(game.players) and not ev_pending:
         current_player = game.players[game.turn]
-        current_player_ev_analysis = expected_value_draw_vs_discard(game, current_player)
+        current_player_ev_analysis = ev_analysis or expected_value_draw_vs_discard(game, current_player)
 
     # Add cumulative scores and match info
     cumulative_scores = game_session.get('cumulative_scores')
@@ -126,6 +255,8 @@ def get_game_state(game_id, games):
             'score': card.score()
         }
 
+    reveal_in_ms = _reveal_in_ms(game_session)
+
     state = {
         'players': players_data,
         'current_turn': game.turn,
@@ -142,17 +273,21 @@ def get_game_state(game_id, games):
         'probabilities': probabilities,
         'dictionary_of_cards_left_in_deck': deck_counts,
         'current_player_ev_analysis': current_player_ev_analysis,
-        'ai_thinking': game_session.get('ai_thinking', False),
-        'cumulative_scores': display_cumulative_scores,
+        'hints_pending': ev_pending,
+        # AI moves are applied immediately; the client shows them once reveal_in_ms has passed
+        'ai_thinking': reveal_in_ms > 0,
+        'reveal_in_ms': reveal_in_ms,
+        'cumulative_scores': list(display_cumulative_scores),  # copied: old versions are kept for deltas
         'current_game': current_game,
         'num_games': num_games,
         'match_winner': match_winner,
         'deck_top_card': deck_top_card,
         'waiting_for_next_game': game_session.get('waiting_for_next_game', False),
         'last_action': getattr(game, 'last_action', None),
-        'action_history': getattr(game, 'action_history', []),
+        'action_history': list(getattr(game, 'action_history', [])),
         'game_id': game_id,  # where game_id is the UUID string
         'whos_first': game_session.get('whos_first', 0),
+        'version': game_session.get('version', 0),
     }
         # Set winner for current game if over
     if game_session['game_over']:
@@ -172,6 +307,6 @@ def get_game_state(game_id, games):
         game_session['waiting_for_next_game'] = True
     else:
         game_session['waiting_for_next_game'] = False
+    state['waiting_for_next_game'] = game_session['waiting_for_next_game']
 
-    # print(f"DEBUG: get_game_state returning state for {game_id}")
     return state
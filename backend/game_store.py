@@ -0,0 +1,158 @@
+"""
+Where web_app keeps its game sessions.
+
+Both stores behave like the plain `games` dict the routes already use
+(games[game_id], game_id in games, games.values(), ...), and add commit(),
+which routes call after mutating a session:
+
+- InProcessGameStore: sessions live in this process only (the default;
+  requires a single gunicorn worker).
+- SQLiteGameStore: sessions are encoded with session_codec into a SQLite
+  database in WAL mode that every worker on the machine shares. Each process
+  keeps the decoded session it last read and only decodes again when another
+  process has committed a newer version. commit() is an optimistic
+  compare-and-set on the session version: if another worker committed
+  first, it raises VersionConflict and the local copy is dropped.
+
+Choose with the GAME_STORE environment variable: unset or 'memory', or
+'sqlite:///path/to/games.db'.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from collections.abc import MutableMapping
+
+from app_log import get_logger
+from session_codec import encode_session, decode_session
+
+
+log = get_logger('game_store')
+
+
+class VersionConflict(Exception):
+    """Another worker committed the session since it was read."""
+
+
+class InProcessGameStore(dict):
+    """The process-local games dict."""
+
+    shared = False
+
+    def commit(self, game_id, session, expected_version):
+        pass  # routes mutate the stored object itself and hold its game lock
+
+    def last_modified(self, game_id):
+        return None
+
+
+class SQLiteGameStore(MutableMapping):
+    """Sessions in a SQLite database shared by all workers on the host."""
+
+    shared = True
+
+    def __init__(self, path, encode=encode_session, decode=decode_session):
+        self.path = path
+        self.encode = encode
+        self.decode = decode
+        self._local = threading.local()
+        self._cache = {}  # game_id -> (version, session) as last read or written by this process
+        self._cache_lock = threading.Lock()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        db = self._db()
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute("""CREATE TABLE IF NOT EXISTS sessions (
+                          game_id TEXT PRIMARY KEY,
+                          version INTEGER NOT NULL,
+                          data BLOB NOT NULL,
+                          updated_at REAL NOT NULL)""")
+
+    def _db(self):
+        # One connection per thread; sqlite3 connections are not shared across threads
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            db.execute('PRAGMA synchronous=NORMAL')
+            self._local.db = db
+        return db
+
+    def __getitem__(self, game_id):
+        row = self._db().execute('SELECT version FROM sessions WHERE game_id = ?', (game_id,)).fetchone()
+        if row is None:
+            with self._cache_lock:
+                self._cache.pop(game_id, None)
+            raise KeyError(game_id)
+        cached = self._cache.get(game_id)
+        if cached is not None and cached[0] == row[0]:
+            return cached[1]
+        row = self._db().execute('SELECT version, data FROM sessions WHERE game_id = ?', (game_id,)).fetchone()
+        if row is None:
+            raise KeyError(game_id)
+        session = self.decode(row[1])
+        with self._cache_lock:
+            self._cache[game_id] = (row[0], session)
+        return session
+
+    def __setitem__(self, game_id, session):
+        """Create or overwrite a session unconditionally (new games)."""
+        version = session.get('version', 0)
+        self._db().execute('INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?)',
+                           (game_id, version, self.encode(session), time.time()))
+        with self._cache_lock:
+            self._cache[game_id] = (version, session)
+
+    def __delitem__(self, game_id):
+        cursor = self._db().execute('DELETE FROM sessions WHERE game_id = ?', (game_id,))
+        with self._cache_lock:
+            self._cache.pop(game_id, None)
+        if cursor.rowcount == 0:
+            raise KeyError(game_id)
+
+    def __contains__(self, game_id):
+        return self._db().execute('SELECT 1 FROM sessions WHERE game_id = ?', (game_id,)).fetchone() is not None
+
+    def __iter__(self):
+        return iter([row[0] for row in self._db().execute('SELECT game_id FROM sessions')])
+
+    def __len__(self):
+        return self._db().execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+
+    def commit(self, game_id, session, expected_version):
+        """Write a mutated session if nobody else committed since expected_version."""
+        version = session.get('version', 0)
+        cursor = self._db().execute(
+            'UPDATE sessions SET version = ?, data = ?, updated_at = ? WHERE game_id = ? AND version = ?',
+            (version, self.encode(session), time.time(), game_id, expected_version))
+        with self._cache_lock:
+            if cursor.rowcount == 1:
+                self._cache[game_id] = (version, session)
+                return
+            self._cache.pop(game_id, None)  # our copy is stale; reload on next read
+        raise VersionConflict(f"{game_id}: expected version {expected_version} was already replaced")
+
+    def drop_cached(self, game_id):
+        """Forget this process's copy (e.g. after a failed mutation) so the next read reloads it."""
+        with self._cache_lock:
+            self._cache.pop(game_id, None)
+
+    def last_modified(self, game_id):
+        row = self._db().execute('SELECT updated_at FROM sessions WHERE game_id = ?', (game_id,)).fetchone()
+        return row[0] if row else None
+
+    def version_of(self, game_id):
+        row = self._db().execute('SELECT version FROM sessions WHERE game_id = ?', (game_id,)).fetchone()
+        return row[0] if row else None
+
+
+def create_game_store(url=None):
+    """Game store for a GAME_STORE url ('memory' or 'sqlite:///path')."""
+    url = url if url is not None else os.getenv('GAME_STORE', 'memory')
+    if url in ('', 'memory'):
+        return InProcessGameStore()
+    if url.startswith('sqlite:///'):
+        path = url[len('sqlite:///'):]
+        log.info(f"Using shared SQLite game store at {path}")
+        return SQLiteGameStore(path)
+    raise ValueError(f"Unsupported GAME_STORE {url!r}; use 'memory' or 'sqlite:///path'")
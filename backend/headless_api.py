@@ -0,0 +1,280 @@
+"""
+Headless bot-vs-bot API, for running external bot competitions against the engine.
+
+Matches here have no human seat, no AI pacing, no chat, no uploads and no
+SSE: every seat is either an engine agent ('random', 'heuristic', 'ev_ai',
+...) that plays as soon as it is its turn, or 'external', played by the API
+caller. Callers can submit several actions in one request, and creating a
+match where every seat is an engine agent plays it to the end at once.
+
+    POST   /headless/matches                {seats: [...], count?: n, seat?: i}
+    GET    /headless/matches/<id>?seat=i
+    POST   /headless/matches/<id>/actions   {actions: [{seat, type, position?, keep?, flip_position?}, ...], seat?: i}
+    DELETE /headless/matches/<id>
+    GET    /headless/stats
+
+A match view shows the cards the given seat may see (public cards, its own
+private ones, and the deck top when it is that seat's turn, as /draw_card
+shows the human), or only public cards without a seat.
+
+Matches live in this process only, at most HEADLESS_MAX_MATCHES of them
+(least recently used dropped first).
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from flask import Blueprint, jsonify, request
+
+from game import GolfGame
+
+HEADLESS_MAX_MATCHES = int(os.getenv('HEADLESS_MAX_MATCHES', 2000))
+MAX_MATCHES_PER_REQUEST = 500
+MAX_MOVES = 400  # a match still going after this many moves ends where it stands
+ENGINE_SEATS = {'random', 'heuristic', 'qlearning', 'linear', 'dqn', 'ev_ai', 'advanced_ev'}
+EXTERNAL = 'external'
+
+headless = Blueprint('headless', __name__, url_prefix='/headless')
+
+
+class HeadlessMatch:
+    def __init__(self, seats):
+        self.match_id = str(uuid.uuid4())
+        self.seats = seats
+        # External seats get a placeholder agent; their moves always come from the API
+        self.game = GolfGame(num_players=len(seats),
+                             agent_types=['random' if seat == EXTERNAL else seat for seat in seats])
+        self.game.upload_state = False
+        for i, player in enumerate(self.game.players):
+            player.name = f'Seat {i}'
+            player.agent_type = self.seats[i]
+        self.moves = 0
+        self.game_over = False
+        self.end_reason = None
+        self.lock = threading.Lock()
+
+    def advance(self):
+        """Play engine seats (and pass seats with nothing left to flip) until an external seat must act."""
+        game = self.game
+        moves = 0
+        while not self.game_over:
+            if game.all_players_done():
+                self._finish('all_cards_revealed')
+                break
+            if self.moves >= MAX_MOVES:
+                self._finish('move_limit')
+                break
+            player = game.players[game.turn]
+            if all(player.known):
+                game.next_player()
+                continue
+            if self.seats[game.turn] == EXTERNAL:
+                break
+            game.play_turn(player)
+            game.next_player()
+            self.moves += 1
+            moves += 1
+        return moves
+
+    def apply(self, action):
+        """Apply one external action. Returns an error string, or None once applied."""
+        game = self.game
+        if self.game_over:
+            return 'Match is over'
+        seat = action.get('seat', game.turn)
+        if seat != game.turn:
+            return f'Not seat {seat}\'s turn (seat {game.turn} to move)'
+        if self.seats[seat] != EXTERNAL:
+            return f'Seat {seat} is played by the engine'
+        player = game.players[seat]
+        hidden = [i for i, known in enumerate(player.known) if not known]
+
+        if action.get('type') == 'take_discard':
+            if action.get('position') not in hidden:
+                return 'take_discard needs the position of a face-down card'
+            game_action = {'type': 'take_discard', 'position': action['position']}
+        elif action.get('type') == 'draw_deck':
+            if not game.deck:
+                return 'No cards left in deck'
+            if action.get('keep', False):
+                if action.get('position') not in hidden:
+                    return 'Keeping a drawn card needs the position of a face-down card'
+                game_action = {'type': 'draw_deck', 'position': action['position'], 'keep': True}
+            else:
+                game_action = {'type': 'draw_deck', 'position': -1, 'keep': False}
+                if action.get('flip_position') is not None:
+                    if action['flip_position'] not in hidden:
+                        return 'flip_position must be a face-down card'
+                    game_action['flip_position'] = action['flip_position']
+        else:
+            return f"Unknown action type {action.get('type')!r}"
+
+        game.apply_action(player, game_action)
+        game.next_player()
+        self.moves += 1
+        return None
+
+    def _finish(self, reason):
+        self.game_over = True
+        self.end_reason = reason
+
+    def view(self, seat=None):
+        game = self.game
+        players = []
+        for i, player in enumerate(game.players):
+            visible = [self.game_over or player.known[j] or (seat == i and player.privately_visible[j])
+                       for j in range(4)]
+            players.append({
+                'seat': i,
+                'type': self.seats[i],
+                'grid': [str(card) if card and visible[j] else None for j, card in enumerate(player.grid)],
+                'known': list(player.known),
+            })
+        view = {
+            'match_id': self.match_id,
+            'turn': game.turn,
+            'round': game.round,
+            'moves': self.moves,
+            'game_over': self.game_over,
+            'discard_top': str(game.discard_pile[-1]) if game.discard_pile else None,
+            'deck_size': len(game.deck),
+            'players': players,
+        }
+        if seat is not None and seat == game.turn and game.deck and not self.game_over:
+            view['deck_top'] = str(game.deck[-1])
+        if self.game_over:
+            scores = [game.calculate_score(p.grid) for p in game.players]
+            view['scores'] = scores
+            view['winners'] = [i for i, score in enumerate(scores) if score == min(scores)]
+            view['end_reason'] = self.end_reason
+        return view
+
+
+class HeadlessMatches:
+    """Live headless matches, least recently used first."""
+
+    def __init__(self, max_matches=HEADLESS_MAX_MATCHES):
+        self.max_matches = max_matches
+        self.matches = OrderedDict()
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.metrics = {'matches_created': 0, 'matches_finished': 0, 'moves': 0, 'evicted': 0}
+
+    def add(self, match):
+        with self._lock:
+            self.matches[match.match_id] = match
+            self.metrics['matches_created'] += 1
+            while len(self.matches) > self.max_matches:
+                self.matches.popitem(last=False)
+                self.metrics['evicted'] += 1
+
+    def get(self, match_id):
+        with self._lock:
+            match = self.matches.get(match_id)
+            if match is not None:
+                self.matches.move_to_end(match_id)
+            return match
+
+    def remove(self, match_id):
+        with self._lock:
+            return self.matches.pop(match_id, None) is not None
+
+    def count(self, key, n=1):
+        with self._lock:
+            self.metrics[key] += n
+
+    def stats(self):
+        with self._lock:
+            elapsed = max(time.time() - self.started, 1e-9)
+            return dict(self.metrics, live_matches=len(self.matches),
+                        moves_per_second_since_start=round(self.metrics['moves'] / elapsed, 1))
+
+
+matches = HeadlessMatches()
+
+
+def _seat_arg(value):
+    return None if value is None else int(value)
+
+
+def _play(match):
+    """Advance a match after a change and record its moves / finish."""
+    was_over = match.game_over
+    matches.count('moves', match.advance())
+    if match.game_over and not was_over:
+        matches.count('matches_finished')
+
+
+@headless.route('/matches', methods=['POST'])
+def create_matches():
+    data = request.get_json() or {}
+    seats = data.get('seats') or []
+    count = int(data.get('count', 1))
+    if not 2 <= len(seats) <= 6:
+        return jsonify({'success': False, 'error': 'A match needs 2 to 6 seats'}), 400
+    unknown = [seat for seat in seats if seat != EXTERNAL and seat not in ENGINE_SEATS]
+    if unknown:
+        return jsonify({'success': False, 'error': f'Unknown seat types {unknown}',
+                        'seat_types': sorted(ENGINE_SEATS | {EXTERNAL})}), 400
+    if not 1 <= count <= MAX_MATCHES_PER_REQUEST:
+        return jsonify({'success': False, 'error': f'count must be 1 to {MAX_MATCHES_PER_REQUEST}'}), 400
+
+    seat = _seat_arg(data.get('seat'))
+    views = []
+    for _ in range(count):
+        match = HeadlessMatch(list(seats))
+        _play(match)
+        if not match.game_over:
+            matches.add(match)  # all-engine matches are already finished: nothing to keep
+        else:
+            matches.count('matches_created')
+        views.append(match.view(seat))
+    return jsonify({'success': True, 'matches': views})
+
+
+@headless.route('/matches/<match_id>', methods=['GET'])
+def get_match(match_id):
+    match = matches.get(match_id)
+    if match is None:
+        return jsonify({'success': False, 'error': 'Match not found'}), 404
+    return jsonify({'success': True, 'match': match.view(_seat_arg(request.args.get('seat')))})
+
+
+@headless.route('/matches/<match_id>/actions', methods=['POST'])
+def submit_actions(match_id):
+    """Apply actions in order (engine seats play in between); stops at the first invalid one."""
+    match = matches.get(match_id)
+    if match is None:
+        return jsonify({'success': False, 'error': 'Match not found'}), 404
+    data = request.get_json() or {}
+    actions = data.get('actions') or []
+
+    with match.lock:
+        applied = 0
+        error = None
+        for action in actions:
+            error = match.apply(action)
+            if error:
+                break
+            applied += 1
+            matches.count('moves')
+            _play(match)
+        view = match.view(_seat_arg(data.get('seat')))
+
+    response = {'success': error is None, 'applied': applied, 'match': view}
+    if error:
+        response['error'] = error
+    return jsonify(response), (200 if error is None else 400)
+
+
+@headless.route('/matches/<match_id>', methods=['DELETE'])
+def delete_match(match_id):
+    return jsonify({'success': matches.remove(match_id)})
+
+
+@headless.route('/stats')
+def headless_stats():
+    return jsonify(matches.stats())
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Load test for the headless bot-vs-bot API.
+
+Two workloads:
+  engine    all seats are engine agents; each request creates --batch matches
+            and the server plays them to the end
+  external  every seat is 'external'; each match is created, then played to
+            the end with one bulk /actions request
+
+By default the API runs in this process (a bare Flask app with only the
+headless blueprint, so no Supabase / LLM setup is needed). Point --url at a
+running server (e.g. gunicorn) to measure a real worker.
+
+    python headless_load_test.py
+    python headless_load_test.py --url http://localhost:5000 --concurrency 8 --seconds 20
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+class InProcessClient:
+    def __init__(self):
+        from flask import Flask
+        from headless_api import headless
+        app = Flask(__name__)
+        app.register_blueprint(headless)
+        self.client = app.test_client()
+
+    def post(self, path, payload):
+        resp = self.client.post(path, json=payload)
+        return resp.status_code, resp.get_json()
+
+
+class HttpClient:
+    def __init__(self, url):
+        import requests
+        self.url = url.rstrip('/')
+        self.local = threading.local()
+        self.requests = requests
+
+    def post(self, path, payload):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = self.requests.Session()
+        resp = session.post(self.url + path, json=payload, timeout=30)
+        return resp.status_code, resp.json()
+
+
+def engine_round(client, seats, batch):
+    """One request creating and finishing `batch` all-engine matches. Returns (requests, moves)."""
+    status, data = client.post('/headless/matches', {'seats': seats, 'count': batch})
+    assert status == 200, data
+    assert all(match['game_over'] for match in data['matches'])
+    return 1, sum(match['moves'] for match in data['matches'])
+
+
+def external_round(client, seats, batch):
+    """Create one match of external seats and finish it with a single bulk request."""
+    status, data = client.post('/headless/matches', {'seats': seats})
+    assert status == 200, data
+    match_id = data['matches'][0]['match_id']
+    # Every seat takes the discard into each of its face-down positions in turn
+    actions = [{'seat': seat, 'type': 'take_discard', 'position': position}
+               for position in range(4) for seat in range(len(seats))]
+    status, data = client.post(f'/headless/matches/{match_id}/actions', {'actions': actions})
+    assert status == 200 and data['match']['game_over'], data
+    return 2, data['applied']
+
+
+def run(client, workload, seats, batch, concurrency, seconds):
+    round_fn = engine_round if workload == 'engine' else external_round
+    totals = {'requests': 0, 'moves': 0}
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            n_requests, moves = round_fn(client, seats, batch)
+            elapsed = time.perf_counter() - start
+            with lock:
+                totals['requests'] += n_requests
+                totals['moves'] += moves
+                latencies.append(elapsed / n_requests)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in [pool.submit(worker) for _ in range(concurrency)]:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'workload': workload,
+        'seats': seats,
+        'seconds': round(elapsed, 1),
+        'requests': totals['requests'],
+        'moves': totals['moves'],
+        'moves_per_second': round(totals['moves'] / elapsed),
+        'requests_per_second': round(totals['requests'] / elapsed),
+        'p50_ms': round(statistics.median(latencies) * 1000, 2),
+        'p95_ms': round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the headless bot-vs-bot API')
+    parser.add_argument('--url', help='Server to test (default: run the API in this process)')
+    parser.add_argument('--workload', choices=['engine', 'external', 'both'], default='both')
+    parser.add_argument('--seats', default='random,heuristic,random,heuristic',
+                        help='Engine seat types for the engine workload')
+    parser.add_argument('--external-seats', type=int, default=2)
+    parser.add_argument('--batch', type=int, default=20, help='Matches per create request (engine workload)')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=5)
+    args = parser.parse_args()
+
+    client = HttpClient(args.url) if args.url else InProcessClient()
+    workloads = ['engine', 'external'] if args.workload == 'both' else [args.workload]
+    for workload in workloads:
+        seats = args.seats.split(',') if workload == 'engine' else ['external'] * args.external_seats
+        result = run(client, workload, seats, args.batch, args.concurrency, args.seconds)
+        print(f"🏌️ {workload}: {result['moves']} moves in {result['seconds']}s = "
+              f"{result['moves_per_second']} moves/s, {result['requests_per_second']} req/s, "
+              f"p50 {result['p50_ms']} ms, p95 {result['p95_ms']} ms per request")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""
+Speculative hints for the human's next decision.
+
+When a bot move hands the turn back to the human, the EV analysis, win odds
+and the best action for every card the human could draw are computed on a
+small background pool while the human is thinking. Results are keyed by
+session version: the human's next state build, /draw_card and /hints pick
+them up instead of computing inside the request, and once the session moves
+on to a newer version they are simply ignored. commit_session schedules them
+before the new state is built, so a state sent while they are still running
+leaves the EV out (hints_pending) and the client reads it from /hints.
+
+Workers read a copy of the game taken when the hints are scheduled, never
+the live game, so they can't see a move half applied.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from app_log import get_logger
+from probabilities import expected_value_draw_vs_discard, win_probabilities, drawn_card_hints
+
+log = get_logger('hint_precompute')
+
+HINT_WORKERS = int(os.getenv('HINT_WORKERS', 2))
+WIN_SIMULATIONS = 1000
+
+
+def snapshot_game(game):
+    """Copy of the parts of a GolfGame the hint functions read (no agents, no history)."""
+    from game import GolfGame
+    from models import Player
+
+    copy = GolfGame.__new__(GolfGame)
+    copy.num_players = game.num_players
+    copy.turn = game.turn
+    copy.round = game.round
+    copy.max_rounds = game.max_rounds
+    copy.deck = list(game.deck)
+    copy.discard_pile = list(game.discard_pile)
+    copy.players = []
+    for player in game.players:
+        player_copy = Player(player.name, player.agent_type)
+        player_copy.grid = list(player.grid)
+        player_copy.known = list(player.known)
+        player_copy.privately_visible = list(player.privately_visible)
+        copy.players.append(player_copy)
+    return copy
+
+
+def compute_hints(game):
+    """EV analysis, win odds and per-drawn-card best actions for the human (seat 0)."""
+    human = game.players[0]
+    return {
+        'ev_analysis': expected_value_draw_vs_discard(game, human),
+        'win_probabilities': [round(p, 3) for p in win_probabilities(game, WIN_SIMULATIONS)],
+        'drawn_card_hints': drawn_card_hints(game, human),
+    }
+
+
+def ready_hints(game_session):
+    """Hints for the session's current version if they are already computed, else None (never waits)."""
+    pending = game_session.get('_hints')
+    if pending is None or pending[0] != game_session.get('version', 0):
+        return None
+    future = pending[1]
+    if not future.done() or future.exception() is not None:
+        return None
+    return future.result()
+
+
+def hints_pending(game_session):
+    """True while hints for the session's current version are scheduled but not yet computed."""
+    pending = game_session.get('_hints')
+    return pending is not None and pending[0] == game_session.get('version', 0) and not pending[1].done()
+
+
+class HintPrecomputer:
+    """
+    Args:
+        max_workers: Background threads computing hints
+    """
+
+    def __init__(self, max_workers=HINT_WORKERS):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='hints')
+        self._lock = threading.Lock()
+        self.metrics = {'scheduled': 0, 'ready': 0, 'waited': 0, 'computed_inline': 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.metrics[key] += 1
+
+    def schedule(self, game_session):
+        """Start computing hints for the current version if it is the human's move. Returns the future or None."""
+        game = game_session['game']
+        if game.turn != 0 or game_session.get('game_over'):
+            return None
+        version = game_session.get('version', 0)
+        pending = game_session.get('_hints')
+        if pending is not None and pending[0] == version:
+            return pending[1]
+        future = self.executor.submit(compute_hints, snapshot_game(game))
+        game_session['_hints'] = (version, future)
+        self._count('scheduled')
+        return future
+
+    def get(self, game_session, timeout=2):
+        """Hints for the current version, waiting up to timeout for the precompute; None if it isn't the human's move."""
+        future = self.schedule(game_session)
+        if future is None:
+            return None
+        self._count('ready' if future.done() else 'waited')
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeout:
+            pass
+        except Exception as e:
+            log.error(f"❌ Hint precompute failed: {e}")
+        self._count('computed_inline')
+        return compute_hints(snapshot_game(game_session['game']))
+
+    def stats(self):
+        with self._lock:
+            return dict(self.metrics)
@@ -4,7 +4,11 @@ from cerebras.cloud.sdk import Cerebras
 from dotenv import load_dotenv
 import time
 
+from metrics import metrics
+from app_log import get_logger
+
 load_dotenv()
+log = get_logger('llm_cerebras')
 
 CEREBRAS_API_KEY = os.getenv("CEREBRAS_API_KEY")
 CEREBRAS_MODEL = "llama3.1-8b"
@@ -20,6 +24,7 @@ try:
 except ImportError:
     pass
 
+@metrics.timed('external_call', 'cerebras')
 def call_cerebras_llm(
     prompt: str,
     model: str = CEREBRAS_MODEL,
@@ -59,10 +64,10 @@ def call_cerebras_llm(
             full_text = ""
             for chunk in response:
                 content = getattr(chunk.choices[0].delta, "content", "") or ""
-                print(content, end="", flush=True)
                 full_text += content
                 if stream_delay > 0:
                     time.sleep(stream_delay)
+            log.debug("Streamed response: %s", full_text)
             return full_text
         else:
             message = response.choices[0].message.content # for just getting the response message.
@@ -0,0 +1,145 @@
+"""
+In-process latency metrics, served at /metrics in the Prometheus text format.
+
+Off unless METRICS_ENABLED=1. When off, metrics.timed() hands back the
+function it was given and metrics.timer() a shared do-nothing context, so
+instrumented code runs as it did before.
+
+Histograms (all in seconds):
+    golf_request_seconds{route, method, status}   Flask request latency
+    golf_phase_seconds{phase}                     get_game_state, get_probabilities, expected_value, upload_game_state
+    golf_choose_action_seconds{agent}             agent.choose_action in play_turn
+    golf_lock_wait_seconds{endpoint}              waiting for a game lock
+    golf_external_call_seconds{service}           LLM, TTS and Giphy calls
+
+Each process keeps its own numbers: with several gunicorn workers a scrape
+sees whichever worker answers it.
+"""
+
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', '').lower() in ('1', 'true', 'yes')
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+HISTOGRAMS = {
+    'request': ('route', 'method', 'status'),
+    'phase': ('phase',),
+    'choose_action': ('agent',),
+    'lock_wait': ('endpoint',),
+    'external_call': ('service',),
+}
+HELP = {
+    'request': 'Flask request latency by route',
+    'phase': 'Time spent in game state, probability, EV and upload code',
+    'choose_action': 'Time for an agent to choose its move',
+    'lock_wait': 'Time spent waiting for a game lock',
+    'external_call': 'Time spent in LLM, TTS and Giphy calls',
+}
+
+
+class _NoTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_TIMER = _NoTimer()
+
+
+class _Timer:
+    __slots__ = ('metrics', 'name', 'labels', 'start')
+
+    def __init__(self, metrics, name, labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.start, *self.labels)
+        return False
+
+
+class Metrics:
+    def __init__(self, enabled=METRICS_ENABLED, buckets=BUCKETS):
+        self.enabled = enabled
+        self.buckets = buckets
+        self.series = {name: {} for name in HISTOGRAMS}  # name -> label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds, *labels):
+        """Record one duration; labels are the values for HISTOGRAMS[name], in order."""
+        if not self.enabled:
+            return
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            counts = self.series[name].get(labels)
+            if counts is None:
+                counts = self.series[name][labels] = [0] * (len(self.buckets) + 2)
+            if index < len(self.buckets):
+                counts[index] += 1
+            counts[-2] += seconds
+            counts[-1] += 1
+
+    def timer(self, name, *labels):
+        """Context manager timing its block."""
+        if not self.enabled:
+            return _NO_TIMER
+        return _Timer(self, name, labels)
+
+    def timed(self, name, *labels):
+        """Decorator timing every call; returns the function untouched when metrics are off."""
+        def decorator(func):
+            if not self.enabled:
+                return func
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - start, *labels)
+            return wrapper
+        return decorator
+
+    def render(self):
+        """All histograms in the Prometheus text exposition format."""
+        with self._lock:
+            snapshot = {name: {labels: list(counts) for labels, counts in series.items()}
+                        for name, series in self.series.items()}
+        lines = []
+        for name, series in snapshot.items():
+            metric = f'golf_{name}_seconds'
+            lines.append(f'# HELP {metric} {HELP[name]}')
+            lines.append(f'# TYPE {metric} histogram')
+            for labels, counts in sorted(series.items()):
+                label_text = ','.join(f'{key}="{_escape(value)}"' for key, value in zip(HISTOGRAMS[name], labels))
+                prefix = label_text + ',' if label_text else ''
+                cumulative = 0
+                for bound, count in zip(self.buckets, counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{{prefix}le="+Inf"}} {counts[-1]}')
+                lines.append(f'{metric}_sum{{{label_text}}} {counts[-2]:.6f}')
+                lines.append(f'{metric}_count{{{label_text}}} {counts[-1]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+metrics = Metrics()
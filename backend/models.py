@@ -38,6 +38,9 @@ class Card:
             "public": getattr(self, "public", None),  # if you use this
         }
 
+RANK_SCORES = {rank: Card(rank, '♠').score()
+               for rank in ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']}
+
 class Player:
     def __init__(self, name, agent_type="random"):
         self.name = name
@@ -102,8 +105,7 @@ class Player:
         """Calculate expected score for an unknown card position"""
         expected = 0
         for rank, prob in probabilities.items():
-            card_score = Card(rank, '♠').score()
-            expected += prob * card_score
+            expected += prob * RANK_SCORES[rank]
         return expected
 
     def to_dict(self):
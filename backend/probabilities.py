@@ -1,6 +1,8 @@
 from collections import Counter
 import random
 
+from metrics import metrics
+
 def get_deck_counts(game):
     """Return a dict of rank -> count for cards that could still be in the deck (unknown cards)."""
     # Start with a full deck (4 of each rank)
@@ -152,8 +154,16 @@ def prob_improve_hand(game, player=None):
 
 
 
-def get_probabilities(game):
-    """Return a dict of interesting probabilities/statistics for the current game state."""
+@metrics.timed('phase', 'get_probabilities')
+def get_probabilities(game, ev_analysis=None, include_ev=True):
+    """Return a dict of interesting probabilities/statistics for the current game state.
+
+    ev_analysis: expected_value_draw_vs_discard(game) if already computed (e.g. precomputed hints)
+    include_ev: False to leave the EV out (None) instead of computing it here
+    """
+    if ev_analysis is None and include_ev:
+        ev_analysis = expected_value_draw_vs_discard(game)
+
     # Calculate probabilities for each player to maintain backwards compatibility
     prob_draw_lower_results = []
     prob_draw_pair_results = []
@@ -170,7 +180,7 @@ def get_probabilities(game):
         'prob_draw_lower_than_min_faceup': prob_draw_lower_results,
         'prob_draw_pair': prob_draw_pair_results,
         'prob_improve_hand': prob_improve_hand_results,
-        'expected_value_draw_vs_discard': expected_value_draw_vs_discard(game),
+        'expected_value_draw_vs_discard': ev_analysis,
         'average_deck_score': round(average_score_of_deck(game), 2) if game.deck else 0,
     }
 
@@ -213,6 +223,7 @@ def expected_score_blind(grid, known, rank_probabilities, privately_visible=None
                     used.add(pos2)
     return total_score
 
+@metrics.timed('phase', 'expected_value')
 def expected_value_draw_vs_discard(game, player=None):
     """
     Calculate the expected value (EV) of drawing from the deck vs taking the discard card for the specified player.
@@ -316,52 +327,8 @@ def expected_value_draw_vs_discard(game, player=None):
 
         for rank, count in deck_counts.items():
             if count > 0:
-                drawn_card = Card(rank, '♠')  # Suit doesn't matter for score
-
-                # Step 1: Evaluate keeping the drawn card (swap into each available position)
-                best_draw_ev = float('inf')
-                current_best_draw_position = None
-                for pos in available_positions:
-                    # If the card is known, use its actual value
-                    if target_player.known[pos] and target_player.grid[pos]:
-                        current_card_score = target_player.grid[pos].score()
-                    else:
-                        # If unknown, use expected score
-                        current_card_score = sum(Card(r, '♠').score() * prob for r, prob in rank_probabilities.items())
-                    test_grid = target_player.grid.copy()
-                    test_grid[pos] = drawn_card
-                    test_known = target_player.known.copy()
-                    test_known[pos] = True  # After swap, this card is known
-                    test_score = expected_score_blind(test_grid, test_known, rank_probabilities, getattr(target_player, 'privately_visible', None))
-                    ev = test_score - current_score
-                    if ev < best_draw_ev:
-                        best_draw_ev = ev
-                        current_best_draw_position = pos
-
-                # Step 2: Evaluate discarding the drawn card and flipping one of your own
-                # Calculate actual expected score change when flipping each position
-                best_flip_ev = float('inf')
-                current_best_flip_position = None
-                for flip_pos in available_positions:
-                    if target_player.grid[flip_pos]:
-                        # Calculate expected score change when this card is revealed
-                        test_known = target_player.known.copy()
-                        test_known[flip_pos] = True  # This card becomes known
-                        test_score = expected_score_blind(target_player.grid, test_known, rank_probabilities, getattr(target_player, 'privately_visible', None))
-                        ev = test_score - current_score
-                        if ev < best_flip_ev:
-                            best_flip_ev = ev
-                            current_best_flip_position = flip_pos
-
-                # Choose the better option: keep drawn card or discard and flip
-                if best_draw_ev < best_flip_ev:
-                    current_best_ev = best_draw_ev
-                    current_action_type = "keep"
-                    current_best_position = current_best_draw_position
-                else:
-                    current_best_ev = best_flip_ev
-                    current_action_type = "flip"
-                    current_best_position = current_best_flip_position
+                current_best_ev, current_action_type, current_best_position = _best_move_for_drawn_rank(
+                    target_player, rank, available_positions, rank_probabilities, current_score)
 
                 # Track the overall best action across all possible draws
                 if current_best_ev < best_overall_ev:
@@ -411,6 +378,61 @@ def expected_value_draw_vs_discard(game, player=None):
         'best_action_type': best_action_type,  # "keep" or "flip"
     }
 
+def _best_move_for_drawn_rank(target_player, rank, available_positions, rank_probabilities, current_score):
+    """Best (ev, "keep"/"flip", position) after drawing a card of this rank: swap it in, or discard it and flip."""
+    from models import Card
+    drawn_card = Card(rank, '♠')  # Suit doesn't matter for score
+    privately_visible = getattr(target_player, 'privately_visible', None)
+
+    # Step 1: Evaluate keeping the drawn card (swap into each available position)
+    best_draw_ev = float('inf')
+    best_draw_position = None
+    for pos in available_positions:
+        test_grid = target_player.grid.copy()
+        test_grid[pos] = drawn_card
+        test_known = target_player.known.copy()
+        test_known[pos] = True  # After swap, this card is known
+        ev = expected_score_blind(test_grid, test_known, rank_probabilities, privately_visible) - current_score
+        if ev < best_draw_ev:
+            best_draw_ev = ev
+            best_draw_position = pos
+
+    # Step 2: Evaluate discarding the drawn card and flipping one of your own
+    best_flip_ev = float('inf')
+    best_flip_position = None
+    for flip_pos in available_positions:
+        if target_player.grid[flip_pos]:
+            test_known = target_player.known.copy()
+            test_known[flip_pos] = True  # This card becomes known
+            ev = expected_score_blind(target_player.grid, test_known, rank_probabilities, privately_visible) - current_score
+            if ev < best_flip_ev:
+                best_flip_ev = ev
+                best_flip_position = flip_pos
+
+    # Choose the better option: keep drawn card or discard and flip
+    if best_draw_ev < best_flip_ev:
+        return best_draw_ev, "keep", best_draw_position
+    return best_flip_ev, "flip", best_flip_position
+
+def drawn_card_hints(game, player=None):
+    """Best action for each rank the player could draw from the deck: {rank: {'action', 'position', 'ev'}}."""
+    target_player = player if player is not None else game.players[0]
+    available_positions = [i for i in range(4) if not target_player.known[i]]
+    deck_counts = get_private_deck_counts(game)
+    total = sum(deck_counts.values())
+    if not available_positions or total == 0:
+        return {}
+    rank_probabilities = {rank: count / total for rank, count in deck_counts.items()}
+    current_score = expected_score_blind(target_player.grid, target_player.known, rank_probabilities,
+                                         getattr(target_player, 'privately_visible', None))
+    hints = {}
+    for rank, count in deck_counts.items():
+        if count > 0:
+            ev, action, position = _best_move_for_drawn_rank(target_player, rank, available_positions,
+                                                             rank_probabilities, current_score)
+            hints[rank] = {'action': action, 'position': position, 'ev': round(ev, 2)}
+    return hints
+
 def which_card_to_swap_for_discard(game, player=None):
     """if the player wants to swap the discard card, which card should they swap it with?"""
     # get the discard card
@@ -457,7 +479,6 @@ def average_score_of_deck(game):
 
 def win_probabilities(game, n_simulations=1000):
     """Estimate win probability for each player by simulating the rest of the game with random draws."""
-    from copy import deepcopy
     from models import Card
     n_players = len(game.players)
     win_counts = [0] * n_players
@@ -471,27 +492,25 @@ def win_probabilities(game, n_simulations=1000):
             # For simulation, suit doesn't matter, so just use 'S'
             available_cards.append(Card(rank, 'S'))
 
+    # Find all unknown positions
+    unknowns = []
+    for p_idx, player in enumerate(game.players):
+        for i, card in enumerate(player.grid):
+            if card and not (player.known[i] or (hasattr(player, 'privately_visible') and player.privately_visible[i])):
+                unknowns.append((p_idx, i))
+            elif not card:
+                unknowns.append((p_idx, i))
+
     for _ in range(n_simulations):
-        sim_game = deepcopy(game)
-        # Find all unknown positions
-        unknowns = []
-        for p_idx, player in enumerate(sim_game.players):
-            for i, card in enumerate(player.grid):
-                if card and not (player.known[i] or (hasattr(player, 'privately_visible') and player.privately_visible[i])):
-                    unknowns.append((p_idx, i))
-                elif not card:
-                    unknowns.append((p_idx, i))
+        # Only the grids change between simulations, so copy those rather than the whole game
+        grids = [list(player.grid) for player in game.players]
         # Shuffle and assign available cards
         cards_to_assign = available_cards.copy()
         random.shuffle(cards_to_assign)
         for (p_idx, i), card in zip(unknowns, cards_to_assign):
-            sim_game.players[p_idx].grid[i] = card
-            sim_game.players[p_idx].known[i] = True
-        # Reveal all cards for scoring
-        for player in sim_game.players:
-            player.known = [True] * 4
-        # Calculate scores
-        scores = [sim_game.calculate_score(p.grid) for p in sim_game.players]
+            grids[p_idx][i] = card
+        # Calculate scores with all cards revealed
+        scores = [game.calculate_score(grid) for grid in grids]
         min_score = min(scores)
         winners = [i for i, s in enumerate(scores) if s == min_score]
         for w in winners:
@@ -0,0 +1,328 @@
+"""
+Q-table container with incremental size counters.
+
+Behaves like the defaultdict(lambda: defaultdict(float)) it replaces: reading
+a missing state or action inserts it with a default of 0.0. The difference is
+that every insertion bumps a counter on the table, so the number of states and
+state-action entries is always available in O(1) instead of by walking the
+whole table after each game.
+
+The table also counts how many updates each entry received (visits), which
+lets independently trained tables be merged by weighted averaging. Counts live
+on the row next to the values they belong to, so deleting an entry drops its
+count too.
+
+On disk a Q-table is a base CSV (state_key, action_key, q_value, visits) plus an
+optional delta log next to it holding entries changed since the base was
+written. The metadata file records how much of the delta log is valid. Both
+files start with the generation of the base (bumped by every full save), and
+a delta log is only replayed onto the base it was written against.
+"""
+
+import csv
+import json
+import os
+
+GENERATION_PREFIX = 'base_generation='
+
+
+class QRow(dict):
+    """
+    Action-value row for a single state; reports insertions to its table.
+    visits maps action_key -> number of updates, created on the first one.
+    """
+    __slots__ = ('_table', '_state_key', 'visits')
+
+    def __init__(self, table, state_key):
+        super().__init__()
+        self._table = table
+        self._state_key = state_key
+        self.visits = None
+
+    def __missing__(self, action_key):
+        self[action_key] = 0.0
+        return 0.0
+
+    def __setitem__(self, action_key, value):
+        if action_key not in self:
+            self._table.num_entries += 1
+        if self._table._changed is not None:
+            self._table._changed.add((self._state_key, action_key))
+        dict.__setitem__(self, action_key, value)
+
+    def __delitem__(self, action_key):
+        dict.__delitem__(self, action_key)
+        self._table.num_entries -= 1
+        if self.visits:
+            self.visits.pop(action_key, None)
+
+    def pop(self, action_key, *default):
+        if action_key in self:
+            self._table.num_entries -= 1
+            if self.visits:
+                self.visits.pop(action_key, None)
+        return dict.pop(self, action_key, *default)
+
+    def setdefault(self, action_key, default=0.0):
+        if action_key not in self:
+            self[action_key] = default
+        return dict.__getitem__(self, action_key)
+
+    def update(self, *args, **kwargs):
+        for action_key, value in dict(*args, **kwargs).items():
+            self[action_key] = value
+
+    def clear(self):
+        self._table.num_entries -= len(self)
+        self.visits = None
+        dict.clear(self)
+
+    def __reduce__(self):
+        # A row pickled on its own has no table to report to, so it comes back as a plain dict
+        return dict, (dict(self),)
+
+
+class QTable(dict):
+    """
+    Mapping of state_key -> QRow(action_key -> q_value).
+
+    num_states / num_entries are maintained as keys are inserted, and
+    interval_growth() reports how much the table grew since it was last called.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.num_states = 0
+        self.num_entries = 0
+        self._mark_states = 0
+        self._mark_entries = 0
+        self._changed = None
+
+    def __missing__(self, state_key):
+        row = QRow(self, state_key)
+        dict.__setitem__(self, state_key, row)
+        self.num_states += 1
+        return row
+
+    def __setitem__(self, state_key, actions):
+        # Assigning a whole row replaces it with a tracked copy
+        if state_key in self:
+            del self[state_key]
+        row = self[state_key]
+        row.update(actions)
+
+    def __delitem__(self, state_key):
+        row = dict.__getitem__(self, state_key)
+        self.num_entries -= len(row)
+        self.num_states -= 1
+        dict.__delitem__(self, state_key)
+
+    def pop(self, state_key, *default):
+        if state_key not in self:
+            return dict.pop(self, state_key, *default)
+        row = dict.__getitem__(self, state_key)
+        del self[state_key]
+        return row
+
+    def setdefault(self, state_key, default=None):
+        if state_key not in self:
+            self[state_key] = default or {}
+        return dict.__getitem__(self, state_key)
+
+    def update(self, *args, **kwargs):
+        for state_key, actions in dict(*args, **kwargs).items():
+            self[state_key] = actions
+
+    def clear(self):
+        dict.clear(self)
+        self.num_states = 0
+        self.num_entries = 0
+
+    def __reduce__(self):
+        rows = {state_key: dict(row) for state_key, row in self.items()}
+        visits = {state_key: dict(row.visits) for state_key, row in self.items() if row.visits}
+        return _rebuild_q_table, (rows, visits)
+
+    def record_visit(self, state_key, action_key, count=1):
+        """Count an update of (state_key, action_key)."""
+        row = self[state_key]
+        if row.visits is None:
+            row.visits = {}
+        row.visits[action_key] = row.visits.get(action_key, 0) + count
+
+    def set_visits(self, state_key, action_key, count):
+        row = self[state_key]
+        if row.visits is None:
+            row.visits = {}
+        row.visits[action_key] = count
+
+    def get_visits(self, state_key, action_key, default=None):
+        """Update count of an entry, or default if unknown; never inserts a row."""
+        return row_visits(dict.get(self, state_key), action_key, default)
+
+    def size(self):
+        """Return (states, entries) without scanning the table."""
+        return self.num_states, self.num_entries
+
+    def interval_growth(self):
+        """Return (new_states, new_entries) since the previous call."""
+        new_states = self.num_states - self._mark_states
+        new_entries = self.num_entries - self._mark_entries
+        self._mark_states = self.num_states
+        self._mark_entries = self.num_entries
+        return new_states, new_entries
+
+    def track_changes(self):
+        """Start recording which (state_key, action_key) entries are written."""
+        if self._changed is None:
+            self._changed = set()
+
+    def pop_changes(self):
+        """Return the entries written since the last call and start a new set."""
+        if self._changed is None:
+            return set()
+        changed, self._changed = self._changed, set()
+        return changed
+
+
+def row_visits(actions, action_key, default=None):
+    """Update count of action_key in a row, or default if unknown (plain dict rows have none)."""
+    visits = getattr(actions, 'visits', None)
+    if not visits:
+        return default
+    return visits.get(action_key, default)
+
+
+def _rebuild_q_table(rows, visits):
+    """Unpickle a QTable, recounting its size as the rows are inserted."""
+    q_table = QTable()
+    q_table.update(rows)
+    for state_key, counts in visits.items():
+        dict.__getitem__(q_table, state_key).visits = counts
+    return q_table
+
+
+def q_table_paths(path):
+    """Delta log and metadata paths that belong to a base Q-table CSV."""
+    stem = path[:-4] if path.endswith('.csv') else path
+    return f"{stem}.delta.csv", f"{stem}.meta.json"
+
+
+def _read_generation(path):
+    """Base generation in the first row of a base CSV or delta log (0 if missing or older)."""
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+        first = next(csv.reader(csvfile), [])
+    for cell in first:
+        if cell.startswith(GENERATION_PREFIX):
+            return int(cell[len(GENERATION_PREFIX):])
+    return 0
+
+
+def _read_rows(csvfile, q_table):
+    rows = 0
+    for row in csv.reader(csvfile):
+        if len(row) < 3:
+            continue
+        try:
+            q_table[row[0]][row[1]] = float(row[2])
+            if len(row) > 3 and row[3]:
+                # Visit counts are totals, so later rows replace earlier ones
+                q_table.set_visits(row[0], row[1], int(row[3]))
+        except ValueError:
+            continue  # header row or a malformed line
+        rows += 1
+    return rows
+
+
+def load_q_table_csv(path, q_table=None):
+    """
+    Load a base Q-table CSV and replay its delta log, if any.
+    Returns the table, or None if neither file exists.
+    """
+    delta_path, meta_path = q_table_paths(path)
+    if not os.path.exists(path) and not os.path.exists(delta_path):
+        return None
+    q_table = QTable() if q_table is None else q_table
+    if os.path.exists(path):
+        with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+            _read_rows(csvfile, q_table)
+
+    # A delta log left behind by an interrupted save is already in the new base
+    if os.path.exists(delta_path) and _read_generation(delta_path) == _read_generation(path):
+        valid_bytes = None
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                valid_bytes = json.load(f).get('delta_bytes')
+        # Anything past the recorded length was written by a checkpoint that
+        # never completed, and may end in a torn row.
+        with open(delta_path, 'rb') as f:
+            data = f.read() if valid_bytes is None else f.read(valid_bytes)
+        _read_rows(data.decode('utf-8').splitlines(), q_table)
+    return q_table
+
+
+def _update_meta(meta_path, **fields):
+    """Rewrite fields of a Q-table metadata file atomically."""
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    meta.update(fields)
+    tmp_path = f"{meta_path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, meta_path)
+
+
+def save_q_table_csv(q_table, path):
+    """
+    Write the full Q-table as a base CSV, replacing any previous file
+    atomically, and fold away its delta log.
+    """
+    delta_path, meta_path = q_table_paths(path)
+    generation = _read_generation(path) + 1
+    tmp_path = f"{path}.tmp"
+    rows = 0
+    with open(tmp_path, 'w', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(['state_key', 'action_key', 'q_value', 'visits', f'{GENERATION_PREFIX}{generation}'])
+        # Blank visits means unknown (e.g. loaded from a table saved without counts)
+        for state_key, actions in q_table.items():
+            for action_key, q_value in actions.items():
+                writer.writerow([state_key, action_key, q_value, row_visits(actions, action_key, '')])
+                rows += 1
+        csvfile.flush()
+        os.fsync(csvfile.fileno())
+    # Once the new base is in place the old delta log no longer matches its
+    # generation, so a crash anywhere below replays nothing.
+    os.replace(tmp_path, path)
+    if os.path.exists(meta_path):
+        _update_meta(meta_path, delta_bytes=0, delta_rows=0, base_rows=rows)
+    if os.path.exists(delta_path):
+        os.remove(delta_path)
+
+
+def append_q_table_delta(q_table, path, changes):
+    """
+    Append the given (state_key, action_key) entries to the delta log of the
+    base CSV at path. Returns the delta log size in bytes after the append.
+    """
+    delta_path, _ = q_table_paths(path)
+    generation = _read_generation(path)
+    if os.path.exists(delta_path) and _read_generation(delta_path) != generation:
+        os.remove(delta_path)  # left by a save interrupted after its new base was written
+    new_log = not os.path.exists(delta_path)
+    with open(delta_path, 'a', newline='', encoding='utf-8') as csvfile:
+        writer = csv.writer(csvfile)
+        if new_log:
+            writer.writerow([f'{GENERATION_PREFIX}{generation}'])
+        for state_key, action_key in changes:
+            actions = dict.get(q_table, state_key)
+            if actions is not None and action_key in actions:
+                writer.writerow([state_key, action_key, dict.__getitem__(actions, action_key),
+                                 row_visits(actions, action_key, '')])
+        csvfile.flush()
+        os.fsync(csvfile.fileno())
+    return os.path.getsize(delta_path)
@@ -0,0 +1,168 @@
+"""
+Compact Q-table artifacts for serving.
+
+A trained table holds many entries that were updated once or never moved far
+from the 0.0 default. build_deployment_artifact() drops those, optionally
+quantizes the remaining values to float16 or int8 (one scale per table), and
+writes a single .npz:
+
+    state_ids   uint64, sorted (q_table_merge.state_id of each state key)
+    offsets     start of each state's entries in the arrays below
+    action_ids  uint8 index into action_keys
+    values      float32 / float16 / int8
+    scale       multiply values by this to get Q-values (int8 only)
+
+DeployedQTable reads it back with the same table[state_key][action_key]
+interface the agents use, so a QLearningAgent can act from it directly. No
+state key strings are kept in memory.
+"""
+
+import os
+import numpy as np
+
+from q_table import row_visits
+from q_table_merge import state_id
+
+QUANTIZATION_DTYPES = {'float32': np.float32, 'float16': np.float16, 'int8': np.int8}
+
+
+class _Row(dict):
+    """Action values of one state; unknown actions read as 0.0 without being stored."""
+
+    def __missing__(self, action_key):
+        return 0.0
+
+
+class DeployedQTable:
+    """Read-only Q-table loaded from a deployment artifact."""
+
+    def __init__(self, state_ids, offsets, action_ids, values, scale, action_keys):
+        self.state_ids = state_ids
+        self.offsets = offsets
+        self.action_ids = action_ids
+        self.values = values
+        self.scale = scale
+        self.action_keys = action_keys
+
+    @classmethod
+    def load(cls, path):
+        data = np.load(path, allow_pickle=False)
+        return cls(data['state_ids'], data['offsets'], data['action_ids'], data['values'],
+                   float(data['scale']), [str(key) for key in data['action_keys']])
+
+    def __len__(self):
+        return len(self.state_ids)
+
+    def __contains__(self, state_key):
+        return self._index(state_key) is not None
+
+    def _index(self, state_key):
+        sid = np.uint64(state_id(state_key))
+        i = int(np.searchsorted(self.state_ids, sid))
+        if i < len(self.state_ids) and self.state_ids[i] == sid:
+            return i
+        return None
+
+    def __getitem__(self, state_key):
+        i = self._index(state_key)
+        row = _Row()
+        if i is None:
+            return row
+        start, end = self.offsets[i], self.offsets[i + 1]
+        values = self.values[start:end].astype(np.float32) * self.scale
+        for action_id, value in zip(self.action_ids[start:end], values):
+            row[self.action_keys[action_id]] = float(value)
+        return row
+
+    def size(self):
+        return len(self.state_ids), len(self.values)
+
+
+def prune_entries(q_table, min_visits=2, min_abs_value=1e-3):
+    """
+    Yield (state_key, action_key, q_value) entries worth keeping: updated at
+    least min_visits times (when visit counts are known) and not within
+    min_abs_value of the 0.0 default.
+    """
+    for state_key, actions in q_table.items():
+        for action_key, q_value in actions.items():
+            count = row_visits(actions, action_key)
+            if count is not None and count < min_visits:
+                continue
+            if abs(q_value) < min_abs_value:
+                continue
+            yield state_key, action_key, q_value
+
+
+def quantize(values, dtype='float32'):
+    """Return (quantized values, scale) for float32, float16 or int8 (symmetric, per table)."""
+    values = np.asarray(values, dtype=np.float32)
+    if dtype == 'int8':
+        max_abs = float(np.abs(values).max()) if len(values) else 0.0
+        scale = max_abs / 127.0 if max_abs > 0 else 1.0
+        return np.clip(np.round(values / scale), -127, 127).astype(np.int8), scale
+    return values.astype(QUANTIZATION_DTYPES[dtype]), 1.0
+
+
+def greedy_agreement(q_table, deployed):
+    """
+    Fraction of states whose best action in the full table is also the best
+    action in the deployed table (ties broken by action key order, like the
+    agents' first-wins argmax over a fixed action order).
+    """
+    agree = total = 0
+    for state_key, actions in q_table.items():
+        if not actions:
+            continue
+        action_keys = sorted(actions)
+        full_best = max(action_keys, key=lambda a: actions[a])
+        row = deployed[state_key]
+        deployed_best = max(action_keys, key=lambda a: row[a])
+        agree += full_best == deployed_best
+        total += 1
+    return agree / total if total else 1.0
+
+
+def build_deployment_artifact(q_table, path, min_visits=2, min_abs_value=1e-3, dtype='float16'):
+    """
+    Prune and quantize q_table into a deployment artifact at path.
+    Returns a report of sizes and greedy-action agreement with the full table.
+    """
+    if dtype not in QUANTIZATION_DTYPES:
+        raise ValueError(f"Unsupported dtype {dtype}; use one of {list(QUANTIZATION_DTYPES)}")
+
+    kept = sorted((state_id(state_key), action_key, q_value)
+                  for state_key, action_key, q_value in prune_entries(q_table, min_visits, min_abs_value))
+    action_keys = sorted({action_key for _, action_key, _ in kept})
+    action_index = {key: i for i, key in enumerate(action_keys)}
+    if len(action_keys) > 256:
+        raise ValueError(f"{len(action_keys)} distinct actions do not fit in uint8 action ids")
+
+    entry_state_ids = np.array([sid for sid, _, _ in kept], dtype=np.uint64)
+    state_ids, starts = np.unique(entry_state_ids, return_index=True)
+    offsets = np.append(starts, len(kept)).astype(np.int64)
+    action_ids = np.array([action_index[a] for _, a, _ in kept], dtype=np.uint8)
+    values, scale = quantize([q for _, _, q in kept], dtype)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    np.savez_compressed(path, state_ids=state_ids, offsets=offsets, action_ids=action_ids,
+                        values=values, scale=np.float64(scale), action_keys=np.array(action_keys))
+
+    deployed = DeployedQTable.load(path)
+    full_states, full_entries = (q_table.size() if hasattr(q_table, 'size') else
+                                 (len(q_table), sum(len(a) for a in q_table.values())))
+    report = {
+        'full_states': full_states,
+        'full_entries': full_entries,
+        'kept_states': len(state_ids),
+        'kept_entries': len(kept),
+        'dtype': dtype,
+        'scale': scale,
+        'artifact_bytes': os.path.getsize(path),
+        'in_memory_bytes': int(state_ids.nbytes + offsets.nbytes + action_ids.nbytes + values.nbytes),
+        'greedy_agreement': greedy_agreement(q_table, deployed),
+    }
+    print(f"Deployment artifact {path}: kept {report['kept_entries']:,}/{full_entries:,} entries "
+          f"({report['kept_states']:,}/{full_states:,} states), {dtype}, "
+          f"{report['artifact_bytes'] / 1024:.1f} KB, greedy agreement {report['greedy_agreement']:.1%}")
+    return report
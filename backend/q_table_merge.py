@@ -0,0 +1,222 @@
+"""
+Merge Q-tables trained independently (by different people, or by parallel
+actor processes) into one table.
+
+Each entry of the result is the visit-weighted average of that entry across
+the inputs, and its visit count is the sum. In a table that records visits,
+an entry without a count was only ever read (a default 0.0) and is left out.
+Tables saved before visits were recorded count one visit per entry, which
+makes their merge a plain average.
+
+Inputs are streamed in sorted state-id order (a stable 64-bit hash of the
+state key), so memory stays bounded by chunk_rows no matter how large the
+tables are:
+- .qbin shards are already sorted and are read sequentially
+- CSV tables are split into sorted runs on disk, then the runs are merged;
+  a table with a checkpoint delta log is replayed in memory first
+"""
+
+import csv
+import hashlib
+import heapq
+import os
+import struct
+import tempfile
+
+from q_table import QTable, row_visits, load_q_table_csv, q_table_paths
+
+QBIN_MAGIC = b'QBIN1\n'
+_RECORD = struct.Struct('<QdIHB')  # state_id, q_value, visits, state_key length, action_key length
+
+
+def state_id(state_key):
+    """Stable 64-bit id of a state key (same on every machine and Python run)."""
+    return int.from_bytes(hashlib.blake2b(state_key.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _has_visits_column(path):
+    """False for a base CSV saved before visit counts were recorded."""
+    if not os.path.exists(path):
+        return True
+    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+        first = next(csv.reader(csvfile), [])
+    return len(first) > 3
+
+
+def table_exists(path):
+    """Whether path names a Q-table input: a .qbin shard, or a base CSV and/or its delta log."""
+    if path.endswith('.qbin'):
+        return os.path.exists(path)
+    return os.path.exists(path) or os.path.exists(q_table_paths(path)[0])
+
+
+def _csv_entries(path):
+    """
+    (state_key, action_key, q_value, visits) for every entry of a Q-table CSV,
+    including the changes in its delta log. Blank visits are 0; rows of a
+    table without a visits column count 1.
+    """
+    if os.path.exists(q_table_paths(path)[0]):
+        # Delta rows replace earlier values, so the log is replayed through the loader
+        default = 0 if _has_visits_column(path) else 1
+        q_table = load_q_table_csv(path)
+        for state_key, actions in q_table.items():
+            for action_key, q_value in actions.items():
+                yield state_key, action_key, q_value, row_visits(actions, action_key, default)
+        return
+
+    with open(path, 'r', newline='', encoding='utf-8') as csvfile:
+        for row in csv.reader(csvfile):
+            if len(row) < 3:
+                continue
+            try:
+                q_value = float(row[2])
+                visits = (int(row[3]) if row[3] else 0) if len(row) > 3 else 1
+            except ValueError:
+                continue  # header row or a malformed line
+            yield row[0], row[1], q_value, visits
+
+
+def _write_run(entries, tmp_dir):
+    entries.sort()
+    fd, path = tempfile.mkstemp(suffix='.run.qbin', dir=tmp_dir)
+    with os.fdopen(fd, 'wb') as f:
+        write_qbin_entries(f, entries)
+    return path
+
+
+def write_qbin_entries(f, entries):
+    """Write sorted (state_id, state_key, action_key, q_value, visits) tuples to an open binary file."""
+    f.write(QBIN_MAGIC)
+    for sid, state_key, action_key, q_value, visits in entries:
+        state_bytes = state_key.encode('utf-8')
+        action_bytes = action_key.encode('utf-8')
+        f.write(_RECORD.pack(sid, q_value, visits, len(state_bytes), len(action_bytes)))
+        f.write(state_bytes)
+        f.write(action_bytes)
+
+
+def iter_qbin(path):
+    """Stream the (state_id, state_key, action_key, q_value, visits) tuples of a .qbin file."""
+    with open(path, 'rb') as f:
+        if f.read(len(QBIN_MAGIC)) != QBIN_MAGIC:
+            raise ValueError(f"{path} is not a .qbin Q-table shard")
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                return
+            sid, q_value, visits, state_len, action_len = _RECORD.unpack(header)
+            state_key = f.read(state_len).decode('utf-8')
+            action_key = f.read(action_len).decode('utf-8')
+            yield sid, state_key, action_key, q_value, visits
+
+
+def iter_sorted_entries(path, tmp_dir, chunk_rows=200000):
+    """
+    Entries of a Q-table file in (state_id, state_key, action_key) order,
+    without the never-updated (zero-visit) ones. CSV files are sorted
+    externally in runs of chunk_rows entries.
+    """
+    if path.endswith('.qbin'):
+        yield from (entry for entry in iter_qbin(path) if entry[4])
+        return
+
+    run_paths = []
+    chunk = []
+    try:
+        for state_key, action_key, q_value, visits in _csv_entries(path):
+            if not visits:
+                continue
+            chunk.append((state_id(state_key), state_key, action_key, q_value, visits))
+            if len(chunk) >= chunk_rows:
+                run_paths.append(_write_run(chunk, tmp_dir))
+                chunk = []
+        if chunk:
+            run_paths.append(_write_run(chunk, tmp_dir))
+            chunk = []
+        yield from heapq.merge(*(iter_qbin(run_path) for run_path in run_paths))
+    finally:
+        for run_path in run_paths:
+            os.remove(run_path)
+
+
+def merge_entries(sorted_streams):
+    """Visit-weighted merge of several sorted entry streams into one sorted stream."""
+    current = None
+    weighted_sum = 0.0
+    q_sum = 0.0
+    visit_total = 0
+    count = 0
+    for sid, state_key, action_key, q_value, visits in heapq.merge(*sorted_streams):
+        key = (sid, state_key, action_key)
+        if key != current:
+            if current is not None:
+                merged = weighted_sum / visit_total if visit_total else q_sum / count
+                yield (*current, merged, visit_total)
+            current, weighted_sum, q_sum, visit_total, count = key, 0.0, 0.0, 0, 0
+        weighted_sum += q_value * visits
+        q_sum += q_value
+        visit_total += visits
+        count += 1
+    if current is not None:
+        merged = weighted_sum / visit_total if visit_total else q_sum / count
+        yield (*current, merged, visit_total)
+
+
+def merge_q_tables(input_paths, output_path, chunk_rows=200000, tmp_dir=None):
+    """
+    Merge Q-table shards (.csv or .qbin) into output_path (.csv or .qbin).
+    Returns the number of (state, action) entries written.
+    """
+    tmp_dir = tmp_dir or os.path.dirname(os.path.abspath(output_path))
+    streams = [iter_sorted_entries(path, tmp_dir, chunk_rows) for path in input_paths]
+    written = 0
+    tmp_path = f"{output_path}.tmp"
+    try:
+        if output_path.endswith('.qbin'):
+            with open(tmp_path, 'wb') as f:
+                def counted():
+                    nonlocal written
+                    for entry in merge_entries(streams):
+                        written += 1
+                        yield entry
+                write_qbin_entries(f, counted())
+        else:
+            with open(tmp_path, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(['state_key', 'action_key', 'q_value', 'visits'])
+                for _, state_key, action_key, q_value, visits in merge_entries(streams):
+                    writer.writerow([state_key, action_key, q_value, visits])
+                    written += 1
+        os.replace(tmp_path, output_path)
+    finally:
+        for stream in streams:
+            stream.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return written
+
+
+def export_qbin(q_table, path):
+    """Write an in-memory QTable as a sorted .qbin shard (entries it never updated are left out)."""
+    # A table that records no visits at all predates the counts: one visit per entry
+    default = 0 if any(getattr(actions, 'visits', None) for actions in q_table.values()) else 1
+    entries = []
+    for state_key, actions in q_table.items():
+        for action_key, q_value in actions.items():
+            visits = row_visits(actions, action_key, default)
+            if visits:
+                entries.append((state_id(state_key), state_key, action_key, q_value, visits))
+    entries.sort()
+    with open(path, 'wb') as f:
+        write_qbin_entries(f, entries)
+    return len(entries)
+
+
+def load_qbin(path, q_table=None):
+    """Load a .qbin shard into a QTable (with visit counts)."""
+    q_table = QTable() if q_table is None else q_table
+    for _, state_key, action_key, q_value, visits in iter_qbin(path):
+        q_table[state_key][action_key] = q_value
+        q_table.set_visits(state_key, action_key, visits)
+    return q_table
@@ -0,0 +1,195 @@
+"""
+Prioritized experience replay.
+
+SumTree keeps one priority per buffer slot in a flat array laid out as a
+binary heap, so sampling proportionally to priority and updating priorities
+are both O(log n) and done for a whole minibatch at once with numpy.
+
+PrioritizedSampler puts a SumTree over the slots of any ring buffer (the DQN
+ReplayMemory uses it). TransitionBuffer is a ring buffer of integer-encoded
+tabular transitions (state id, action id, reward, next state id, done) with
+its own sampler, for replaying Q-table updates instead of using each game
+once.
+"""
+
+import numpy as np
+
+
+class SumTree:
+    """Binary sum tree over `capacity` leaves stored in one float64 array."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.leaf_base = 1
+        while self.leaf_base < capacity:
+            self.leaf_base *= 2
+        self.tree = np.zeros(2 * self.leaf_base, dtype=np.float64)
+
+    @property
+    def total(self):
+        return self.tree[1]
+
+    def update(self, slots, priorities):
+        """Set the priorities of the given slots and refresh their ancestors."""
+        nodes = np.asarray(slots, dtype=np.int64) + self.leaf_base
+        self.tree[nodes] = priorities
+        nodes = np.unique(nodes // 2)
+        while nodes[0] >= 1:
+            self.tree[nodes] = self.tree[2 * nodes] + self.tree[2 * nodes + 1]
+            if nodes[0] == 1:
+                break
+            nodes = np.unique(nodes // 2)
+
+    def find(self, values):
+        """Slot whose cumulative priority range contains each value."""
+        values = np.array(values, dtype=np.float64)
+        nodes = np.ones(len(values), dtype=np.int64)
+        while nodes[0] < self.leaf_base:
+            left = 2 * nodes
+            left_sum = self.tree[left]
+            go_right = values >= left_sum
+            values = np.where(go_right, values - left_sum, values)
+            nodes = np.where(go_right, left + 1, left)
+        return np.minimum(nodes - self.leaf_base, self.capacity - 1)
+
+
+class PrioritizedSampler:
+    """
+    Proportional prioritized sampling over the slots of a ring buffer.
+
+    Args:
+        capacity: Number of slots in the buffer
+        alpha: How strongly priorities skew sampling (0 = uniform)
+        beta: Importance-sampling correction (1 = full correction)
+        epsilon: Added to |TD error| so no transition gets zero priority
+    """
+
+    def __init__(self, capacity, alpha=0.6, beta=0.4, epsilon=0.01):
+        self.tree = SumTree(capacity)
+        self.alpha = alpha
+        self.beta = beta
+        self.epsilon = epsilon
+        self.max_priority = 1.0
+
+    def mark_new(self, slots):
+        """New transitions get the highest priority seen so they are replayed at least once."""
+        slots = np.atleast_1d(slots)
+        self.tree.update(slots, np.full(len(slots), self.max_priority))
+
+    def sample(self, batch_size, size):
+        """
+        Stratified sample of batch_size slots among the first `size`.
+        Returns (slots, importance_weights) with weights normalized to max 1.
+        """
+        total = self.tree.total
+        segment = total / batch_size
+        values = (np.arange(batch_size) + np.random.random(batch_size)) * segment
+        slots = np.minimum(self.tree.find(np.minimum(values, total * (1 - 1e-12))), size - 1)
+        probs = self.tree.tree[slots + self.tree.leaf_base] / total
+        weights = (size * np.maximum(probs, 1e-12)) ** -self.beta
+        return slots, (weights / weights.max()).astype(np.float32)
+
+    def update_priorities(self, slots, td_errors):
+        priorities = (np.abs(td_errors) + self.epsilon) ** self.alpha
+        self.max_priority = max(self.max_priority, float(priorities.max()))
+        self.tree.update(slots, priorities)
+
+
+class KeyIndex:
+    """
+    Interns string keys as integer ids, counting the buffer slots that use
+    each one. A key whose last slot is overwritten is dropped and its id
+    reused, so the index stays as small as the live transitions need.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.keys = []
+        self.refs = []
+        self.free = []
+
+    def __len__(self):
+        return len(self.ids)
+
+    def acquire(self, key):
+        key_id = self.ids.get(key)
+        if key_id is None:
+            if self.free:
+                key_id = self.free.pop()
+                self.keys[key_id] = key
+                self.refs[key_id] = 0
+            else:
+                key_id = len(self.keys)
+                self.keys.append(key)
+                self.refs.append(0)
+            self.ids[key] = key_id
+        self.refs[key_id] += 1
+        return key_id
+
+    def release(self, key_id):
+        self.refs[key_id] -= 1
+        if self.refs[key_id] == 0:
+            del self.ids[self.keys[key_id]]
+            self.keys[key_id] = None
+            self.free.append(key_id)
+
+
+class TransitionBuffer:
+    """
+    Fixed-size ring buffer of integer-encoded Q-learning transitions.
+
+    State and action keys are interned to ids, so each transition is 17 bytes
+    regardless of key length, and minibatches come back as numpy arrays.
+    """
+
+    def __init__(self, capacity=200000, prioritized=True, alpha=0.6, beta=0.4):
+        self.capacity = capacity
+        self.state = np.zeros(capacity, dtype=np.int32)
+        self.action = np.zeros(capacity, dtype=np.int32)
+        self.reward = np.zeros(capacity, dtype=np.float32)
+        self.next_state = np.zeros(capacity, dtype=np.int32)
+        self.done = np.zeros(capacity, dtype=bool)
+        self.states = KeyIndex()
+        self.actions = KeyIndex()
+        self.sampler = PrioritizedSampler(capacity, alpha, beta) if prioritized else None
+        self.position = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    def add_trajectory(self, trajectory, final_reward, step_reward=0.1):
+        """Add one game's steps with the same rewards train_on_trajectory uses."""
+        n = len(trajectory)
+        if n == 0:
+            return
+        slots = (self.position + np.arange(n)) % self.capacity
+        for slot, (i, step) in zip(slots, enumerate(trajectory)):
+            last = i == n - 1
+            state_id = self.states.acquire(step['state_key'])
+            next_state_id = self.states.acquire(step['state_key'] if last else trajectory[i + 1]['state_key'])
+            action_id = self.actions.acquire(step['action_key'])
+            if slot < self.size:
+                # Overwriting the oldest transition: its keys lose a reference
+                self.states.release(self.state[slot])
+                self.states.release(self.next_state[slot])
+                self.actions.release(self.action[slot])
+            self.state[slot] = state_id
+            self.action[slot] = action_id
+            self.reward[slot] = step_reward + (final_reward if last else 0.0)
+            self.next_state[slot] = next_state_id
+            self.done[slot] = last
+            self.size = max(self.size, slot + 1)
+        if self.sampler is not None:
+            self.sampler.mark_new(slots)
+        self.position = (self.position + n) % self.capacity
+
+    def sample(self, batch_size):
+        """Returns (slots, importance_weights); weights are all 1 without prioritization."""
+        if self.sampler is None:
+            return np.random.randint(0, self.size, size=batch_size), np.ones(batch_size, dtype=np.float32)
+        return self.sampler.sample(batch_size, self.size)
+
+    def update_priorities(self, slots, td_errors):
+        if self.sampler is not None:
+            self.sampler.update_priorities(slots, td_errors)
@@ -0,0 +1,242 @@
+"""
+Compact binary encoding of a web game session (the session dict and its GolfGame).
+
+Layout (little-endian, format version 1):
+
+    b'GS' version:u8
+    session scalars      struct SESSION_HEADER
+    mode, player_name    u16 length + utf-8
+    cumulative scores    u8 count + i32 each (twice: cumulative, round_cumulative)
+    extras               u32 length + compact JSON of every other session key
+                         (selected_bots, chat queues, ...), keys starting with
+                         '_' are per-process caches and are skipped
+    game                 see _encode_game
+
+Cards are one byte (rank index * 4 + suit index, 255 for no card), the
+known / privately_visible flags of a grid are 4-bit masks, agents are stored
+as agent type ids (agents are rebuilt on decode), and the action history is
+stored as GolfGame.action_log entries; its text is regenerated on decode.
+"""
+
+import json
+import struct
+
+from models import Card, Player
+
+FORMAT_VERSION = 1
+MAGIC = b'GS'
+
+RANKS = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+SUITS = ['♠', '♥', '♦', '♣']
+NO_CARD = 255
+CARDS = [Card(rank, suit) for rank in RANKS for suit in SUITS]  # decoded cards are shared, never mutated
+CARD_CODES = {(card.rank, card.suit): code for code, card in enumerate(CARDS)}
+
+AGENT_TYPES = ['human', 'random', 'heuristic', 'qlearning', 'linear', 'dqn', 'ev_ai', 'advanced_ev']
+AGENT_TYPE_IDS = {name: i for i, name in enumerate(AGENT_TYPES)}
+
+SESSION_FLAGS = ['game_over', 'cumulative_updated_for_game', 'waiting_for_next_game', 'ai_thinking',
+                 'human_has_played']
+SESSION_KEYS = {'game', 'mode', 'player_name', 'cumulative_scores', 'round_cumulative_scores', 'version',
+                'num_games', 'current_game', 'whos_first', 'match_winner', 'ai_reveal_at'} | set(SESSION_FLAGS)
+# version, num_games, current_game, whos_first, match_winner (-1 = None), flags, flags present, ai_reveal_at
+SESSION_HEADER = struct.Struct('<IHHbbBBd')
+# num_players, turn, round, max_rounds, drawn card, deck size, discard size, action log size
+GAME_HEADER = struct.Struct('<BBHBBBBH')
+# turn, round, player index, kind, position, new card, old card, flip position, flipped card
+LOG_ENTRY = struct.Struct('<BHBBbBBbB')
+
+
+def card_code(card):
+    return NO_CARD if card is None else CARD_CODES[(card.rank, card.suit)]
+
+
+def card_from_code(code):
+    return None if code == NO_CARD else CARDS[code]
+
+
+def _cards_bytes(cards):
+    return bytes(card_code(card) for card in cards)
+
+
+def _mask(flags):
+    return sum(1 << i for i, flag in enumerate(flags) if flag)
+
+
+def _unmask(mask, n=4):
+    return [bool(mask >> i & 1) for i in range(n)]
+
+
+class _Writer:
+    def __init__(self):
+        self.parts = []
+
+    def raw(self, data):
+        self.parts.append(data)
+
+    def pack(self, fmt, *values):
+        self.parts.append(struct.pack(fmt, *values))
+
+    def text(self, value, length_fmt='<H'):
+        data = value.encode('utf-8')
+        self.parts.append(struct.pack(length_fmt, len(data)))
+        self.parts.append(data)
+
+    def blob(self, data, length_fmt='<H'):
+        self.parts.append(struct.pack(length_fmt, len(data)))
+        self.parts.append(data)
+
+    def getvalue(self):
+        return b''.join(self.parts)
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.pos = 0
+
+    def unpack(self, fmt):
+        values = fmt.unpack_from(self.data, self.pos)
+        self.pos += fmt.size
+        return values
+
+    def take(self, n):
+        chunk = self.data[self.pos:self.pos + n]
+        self.pos += n
+        return bytes(chunk)
+
+    def blob(self, length_fmt):
+        n, = self.unpack(length_fmt)
+        return self.take(n)
+
+    def text(self, length_fmt=struct.Struct('<H')):
+        return self.blob(length_fmt).decode('utf-8')
+
+
+_U8 = struct.Struct('<B')
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_I32 = struct.Struct('<i')
+
+
+def encode_session(session):
+    """Encode a web session dict (with its 'game') to bytes."""
+    w = _Writer()
+    w.raw(MAGIC + bytes([FORMAT_VERSION]))
+    match_winner = session.get('match_winner')
+    flags_present = _mask(flag in session for flag in SESSION_FLAGS)
+    w.raw(SESSION_HEADER.pack(session.get('version', 0), session.get('num_games', 1),
+                              session.get('current_game', 1), session.get('whos_first', 0),
+                              -1 if match_winner is None else match_winner,
+                              _mask(session.get(flag, False) for flag in SESSION_FLAGS), flags_present,
+                              session.get('ai_reveal_at', 0.0)))
+    w.text(session.get('mode', ''))
+    w.text(session.get('player_name', ''))
+    for key in ('cumulative_scores', 'round_cumulative_scores'):
+        scores = session.get(key, [])
+        w.pack(f'<B{len(scores)}i', len(scores), *scores)
+    extras = {k: v for k, v in session.items() if k not in SESSION_KEYS and not k.startswith('_')}
+    w.blob(json.dumps(extras, separators=(',', ':'), ensure_ascii=False).encode('utf-8'), '<I')
+    _encode_game(w, session['game'])
+    return w.getvalue()
+
+
+def _encode_game(w, game):
+    w.raw(GAME_HEADER.pack(game.num_players, game.turn, game.round, game.max_rounds,
+                           card_code(getattr(game, 'drawn_card', None)), len(game.deck),
+                           len(game.discard_pile), len(game.action_log)))
+    w.text(getattr(game, 'game_id', None) or '', '<B')
+    w.raw(_cards_bytes(game.deck))
+    w.raw(_cards_bytes(game.discard_pile))
+    for player in game.players:
+        w.text(player.name, '<B')
+        type_id = AGENT_TYPE_IDS.get(player.agent_type, 255)
+        w.pack('<B', type_id)
+        if type_id == 255:
+            w.text(player.agent_type, '<B')
+        w.raw(_cards_bytes(player.grid))
+        w.pack('<B', _mask(player.known) | _mask(player.privately_visible) << 4)
+        w.blob(_cards_bytes(player.memory['all_seen_cards']))
+        w.blob(_cards_bytes(player.memory['discard_history']))
+    for turn, round_number, player_index, kind, position, new_card, old_card, flip_position, flipped_card in game.action_log:
+        w.raw(LOG_ENTRY.pack(turn, round_number, player_index, kind, position, card_code(new_card),
+                             card_code(old_card), -1 if flip_position is None else flip_position,
+                             card_code(flipped_card)))
+
+
+def decode_session(data):
+    """Decode bytes from encode_session into a session dict with a playable GolfGame."""
+    r = _Reader(data)
+    header = r.take(3)
+    if header[:2] != MAGIC:
+        raise ValueError("Not an encoded game session")
+    if header[2] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported session format version {header[2]}")
+    version, num_games, current_game, whos_first, match_winner, flags, flags_present, ai_reveal_at = \
+        r.unpack(SESSION_HEADER)
+    session = {
+        'version': version,
+        'num_games': num_games,
+        'current_game': current_game,
+        'whos_first': whos_first,
+        'match_winner': None if match_winner == -1 else match_winner,
+        'ai_reveal_at': ai_reveal_at,
+    }
+    for i, flag in enumerate(SESSION_FLAGS):
+        if flags_present >> i & 1:
+            session[flag] = bool(flags >> i & 1)
+    session['mode'] = r.text()
+    session['player_name'] = r.text()
+    for key in ('cumulative_scores', 'round_cumulative_scores'):
+        n, = r.unpack(_U8)
+        session[key] = list(struct.unpack_from(f'<{n}i', r.data, r.pos))
+        r.pos += 4 * n
+    session.update(json.loads(r.blob(_U32)))
+    session['game'] = _decode_game(r)
+    return session
+
+
+def _decode_game(r):
+    from game import GolfGame
+
+    num_players, turn, round_number, max_rounds, drawn_card, deck_size, discard_size, log_size = \
+        r.unpack(GAME_HEADER)
+    game = GolfGame.__new__(GolfGame)
+    game.num_players = num_players
+    game.turn = turn
+    game.round = round_number
+    game.max_rounds = max_rounds
+    game.drawn_card = card_from_code(drawn_card)
+    game_id = r.text(_U8)
+    if game_id:
+        game.game_id = game_id
+    game.deck = [CARDS[code] if code != NO_CARD else None for code in r.take(deck_size)]
+    game.discard_pile = [card_from_code(code) for code in r.take(discard_size)]
+
+    game.players = []
+    for _ in range(num_players):
+        name = r.text(_U8)
+        type_id, = r.unpack(_U8)
+        agent_type = r.text(_U8) if type_id == 255 else AGENT_TYPES[type_id]
+        player = Player(name, agent_type)
+        player.grid = [card_from_code(code) for code in r.take(4)]
+        masks, = r.unpack(_U8)
+        player.known = _unmask(masks & 0xF)
+        player.privately_visible = _unmask(masks >> 4)
+        seen = [card_from_code(code) for code in r.blob(_U16)]
+        player.memory['all_seen_cards'] = seen
+        player.memory['discard_history'] = [card_from_code(code) for code in r.blob(_U16)]
+        for card in seen:
+            player.memory['cards_per_rank'][card.rank] += 1
+        game.players.append(player)
+
+    game.action_log = []
+    for _ in range(log_size):
+        turn_, round_, player_index, kind, position, new_card, old_card, flip_position, flipped_card = \
+            r.unpack(LOG_ENTRY)
+        game.action_log.append((turn_, round_, player_index, kind, position, card_from_code(new_card),
+                                card_from_code(old_card), None if flip_position == -1 else flip_position,
+                                card_from_code(flipped_card)))
+    game.rebuild_action_history()
+    game.agents = game.create_agents([player.agent_type for player in game.players])
+    return game
@@ -0,0 +1,175 @@
+"""
+Crash-safe snapshots of in-process game sessions.
+
+Sessions are appended to a log file in session_codec's binary encoding. Only
+sessions whose version changed since the last snapshot are written, and
+evicted games get a tombstone, so a periodic snapshot costs little more than
+the moves made since the previous one. Every record carries a CRC: after a
+crash, restore() keeps everything up to the last complete record and cuts
+off a torn tail. When the log grows well past the size of the live sessions
+it is rewritten (to a temporary file, then atomically renamed).
+
+    file:    b'GSNAP1\\n' record*
+    record:  payload length:u32  crc32(payload):u32  kind:u8  payload
+    payload: game id length:u8  game id  [encoded session]   (kind 1 = session, 0 = removed)
+"""
+
+import os
+import struct
+import threading
+import time
+import zlib
+
+from app_log import get_logger
+from session_codec import encode_session, decode_session
+
+log = get_logger('session_snapshots')
+
+MAGIC = b'GSNAP1\n'
+RECORD_HEADER = struct.Struct('<IIB')
+KIND_REMOVED, KIND_SESSION = 0, 1
+SNAPSHOT_INTERVAL_SECONDS = 10
+
+
+def _record(kind, game_id, data=b''):
+    gid = game_id.encode('utf-8')
+    payload = bytes([len(gid)]) + gid + data
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload), kind) + payload
+
+
+class SessionSnapshots:
+    """
+    Args:
+        path: Log file (created if missing)
+        compact_ratio: Rewrite the log once it is this many times the live data
+    """
+
+    def __init__(self, path, compact_ratio=3.0):
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self.versions = {}  # game_id -> version last written
+        self.records = {}   # game_id -> latest record bytes, for compaction
+        self._write_lock = threading.Lock()
+        self._stop = threading.Event()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def restore(self):
+        """Read the log and return {game_id: session} for every game still live at the last snapshot."""
+        if not os.path.exists(self.path):
+            with open(self.path, 'wb') as f:
+                f.write(MAGIC)
+            return {}
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        if not data.startswith(MAGIC):
+            log.error(f"❌ {self.path} is not a session snapshot log, starting empty")
+            os.replace(self.path, self.path + '.corrupt')
+            return self.restore()
+
+        latest = {}
+        pos = good_end = len(MAGIC)
+        view = memoryview(data)
+        while pos + RECORD_HEADER.size <= len(data):
+            length, crc, kind = RECORD_HEADER.unpack_from(data, pos)
+            start, end = pos + RECORD_HEADER.size, pos + RECORD_HEADER.size + length
+            if end > len(data) or zlib.crc32(view[start:end]) != crc:
+                break
+            gid_len = data[start]
+            game_id = bytes(view[start + 1:start + 1 + gid_len]).decode('utf-8')
+            if kind == KIND_SESSION:
+                latest[game_id] = (start + 1 + gid_len, end, pos)
+            else:
+                latest.pop(game_id, None)
+            pos = good_end = end
+        if good_end < len(data):
+            log.error(f"❌ Dropping {len(data) - good_end} bytes of torn snapshot data from {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(good_end)
+
+        sessions = {}
+        for game_id, (start, end, record_start) in latest.items():
+            try:
+                session = decode_session(view[start:end])
+            except Exception as e:
+                log.error(f"❌ Could not restore game {game_id}: {e}")
+                continue
+            sessions[game_id] = session
+            self.versions[game_id] = session.get('version', 0)
+            self.records[game_id] = bytes(view[record_start:end])
+        return sessions
+
+    def write(self, games, locks, lock_timeout=0):
+        """
+        Append every session changed since the last snapshot, and tombstones
+        for removed games. Sessions busy in a request are skipped (they are
+        picked up next time) unless lock_timeout allows waiting for them.
+        Returns the number of records written.
+        """
+        with self._write_lock:
+            chunks = []
+            for game_id, session in list(games.items()):
+                version = session.get('version', 0)
+                if self.versions.get(game_id) == version:
+                    continue
+                lock = locks.get(game_id)
+                acquired = lock is None or (lock.acquire(timeout=lock_timeout) if lock_timeout
+                                            else lock.acquire(blocking=False))
+                if not acquired:
+                    continue
+                try:
+                    version = session.get('version', 0)
+                    record = _record(KIND_SESSION, game_id, encode_session(session))
+                except Exception as e:
+                    log.error(f"❌ Could not snapshot game {game_id}: {e}")
+                    continue
+                finally:
+                    if lock is not None:
+                        lock.release()
+                chunks.append(record)
+                self.versions[game_id] = version
+                self.records[game_id] = record
+            for game_id in [gid for gid in self.versions if gid not in games]:
+                chunks.append(_record(KIND_REMOVED, game_id))
+                del self.versions[game_id]
+                del self.records[game_id]
+            if chunks:
+                with open(self.path, 'ab') as f:
+                    if f.tell() == 0:
+                        f.write(MAGIC)
+                    f.write(b''.join(chunks))
+                    f.flush()
+                    os.fsync(f.fileno())
+            self._maybe_compact()
+            return len(chunks)
+
+    def _maybe_compact(self):
+        if not os.path.exists(self.path):
+            return
+        live_bytes = len(MAGIC) + sum(len(record) for record in self.records.values())
+        if os.path.getsize(self.path) > max(self.compact_ratio * live_bytes, 64 * 1024):
+            tmp_path = self.path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(MAGIC)
+                f.write(b''.join(self.records.values()))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+
+    def start(self, games, locks, interval=SNAPSHOT_INTERVAL_SECONDS):
+        """Snapshot every `interval` seconds in a daemon thread."""
+        def run():
+            while not self._stop.wait(interval):
+                try:
+                    self.write(games, locks)
+                except Exception as e:
+                    log.error(f"❌ Session snapshot failed: {e}")
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self, games, locks):
+        """Final snapshot on shutdown, waiting briefly for in-flight moves."""
+        self._stop.set()
+        started = time.perf_counter()
+        written = self.write(games, locks, lock_timeout=1)
+        log.info(f"Saved {written} session snapshot records in {(time.perf_counter() - started) * 1000:.0f} ms")
@@ -0,0 +1,163 @@
+"""
+Lifetime management for game sessions.
+
+web_app keeps every game in process memory (games, game_locks, plus chat
+history and bot caches keyed by game). SessionStore records when each game
+was last used and removes games that have been idle longer than ttl_seconds,
+or the least recently used ones once there are more than max_sessions.
+Whatever else holds per-game data registers a cleanup hook with on_evict(),
+so one eviction clears all of it.
+
+Eviction counters and session counts are available from stats().
+
+With a shared game store (several workers), each worker tracks the games it
+has served; a game is only evicted once the store also shows no write from
+any worker within the TTL, and a least recently used game is passed over if
+another worker wrote it after this one last did. Eviction deletes the game
+from the shared store, so it must not hit a game another worker is serving.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from app_log import get_logger
+
+log = get_logger('session_store')
+
+SESSION_TTL_SECONDS = int(os.getenv('SESSION_TTL_SECONDS', 2 * 60 * 60))
+MAX_SESSIONS = int(os.getenv('MAX_SESSIONS', 500))
+SWEEP_INTERVAL_SECONDS = 60
+
+
+class SessionStore:
+    """
+    Args:
+        games: The game_id -> session dict to manage
+        locks: The game_id -> threading.Lock dict kept alongside it
+        ttl_seconds: Idle time after which a game is evicted
+        max_sessions: Most games kept at once; the least recently used go first
+        in_use: Optional game_id -> bool; games it reports as in use are never
+            evicted for idleness (e.g. a client still has a live event stream)
+    """
+
+    def __init__(self, games, locks, ttl_seconds=SESSION_TTL_SECONDS, max_sessions=MAX_SESSIONS,
+                 in_use=None, clock=time.time):
+        self.games = games
+        self.locks = locks
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self.in_use = in_use
+        self.clock = clock
+        self.last_access = OrderedDict()  # game_id -> last access time, least recent first
+        self.cleanup_hooks = []
+        self.last_sweep = clock()
+        self._lock = threading.Lock()
+        self.metrics = {
+            'created': 0,
+            'restored': 0,
+            'evicted_idle': 0,
+            'evicted_lru': 0,
+            'peak_sessions': 0,
+            'last_sweep_ms': 0.0,
+        }
+
+    def on_evict(self, hook):
+        """Register hook(game_id, session) to clear other per-game data when a game is evicted."""
+        self.cleanup_hooks.append(hook)
+        return hook
+
+    def add(self, game_id, session, restored=False):
+        """Store a new game session, evicting least recently used games beyond max_sessions."""
+        with self._lock:
+            self.games[game_id] = session
+            self.locks[game_id] = threading.Lock()
+            self.last_access[game_id] = self.clock()
+            self.metrics['restored' if restored else 'created'] += 1
+            overflow = max(0, len(self.last_access) - self.max_sessions)
+            candidates = [(gid, last) for gid, last in self.last_access.items() if gid != game_id]
+        for old_id, last in candidates:
+            if overflow == 0:
+                break
+            if not self._written_since(old_id, last):
+                self.evict(old_id, 'lru')
+                overflow -= 1
+        self.metrics['peak_sessions'] = max(self.metrics['peak_sessions'], len(self.games))
+
+    def touch(self, game_id):
+        """Mark a game as used now."""
+        with self._lock:
+            if game_id in self.last_access:
+                self.last_access[game_id] = self.clock()
+                self.last_access.move_to_end(game_id)
+                return
+        if getattr(self.games, 'shared', False) and game_id in self.games:
+            # Created by another worker: start tracking it and give it a lock here
+            with self._lock:
+                self.last_access[game_id] = self.clock()
+                self.locks.setdefault(game_id, threading.Lock())
+
+    def evict(self, game_id, reason='idle'):
+        """Remove a game and everything registered for it. Returns False if it was already gone."""
+        with self._lock:
+            if self.last_access.pop(game_id, None) is None and game_id not in self.games:
+                return False
+            session = self.games.pop(game_id, None)
+            self.locks.pop(game_id, None)
+            self.metrics[f'evicted_{reason}'] += 1
+        for hook in self.cleanup_hooks:
+            try:
+                hook(game_id, session)
+            except Exception as e:
+                log.error(f"❌ Session cleanup hook failed for {game_id}: {e}")
+        log.info(f"🧹 Evicted game {game_id} ({reason}), {len(self.games)} active")
+        return True
+
+    def sweep(self):
+        """Evict every game idle for longer than ttl_seconds. Returns the evicted ids."""
+        start = time.perf_counter()
+        now = self.clock()
+        with self._lock:
+            expired = []
+            for game_id, last in self.last_access.items():
+                if now - last <= self.ttl_seconds:
+                    break  # ordered by last access, so the rest are fresher
+                expired.append(game_id)
+            self.last_sweep = now
+        expired = [game_id for game_id in expired
+                   if not (self.in_use and self.in_use(game_id)) and not self._written_since(game_id, now - self.ttl_seconds)]
+        for game_id in expired:
+            self.evict(game_id, 'idle')
+        self.metrics['last_sweep_ms'] = (time.perf_counter() - start) * 1000
+        return expired
+
+    def _written_since(self, game_id, since):
+        """
+        True if the store shows a commit to the game after `since` (shared
+        stores only); its last access here moves up to that commit.
+        """
+        last_modified = getattr(self.games, 'last_modified', lambda gid: None)(game_id)
+        if last_modified is None or last_modified <= since:
+            return False
+        with self._lock:
+            if game_id in self.last_access:
+                self.last_access[game_id] = last_modified
+                self.last_access.move_to_end(game_id)
+        return True
+
+    def maybe_sweep(self, interval=SWEEP_INTERVAL_SECONDS):
+        """Sweep if the last sweep was more than interval seconds ago (cheap to call per request)."""
+        if self.clock() - self.last_sweep >= interval:
+            return self.sweep()
+        return []
+
+    def stats(self):
+        now = self.clock()
+        with self._lock:
+            oldest = next(iter(self.last_access.values()), None)
+            return dict(self.metrics,
+                        active_sessions=len(self.games),
+                        max_sessions=self.max_sessions,
+                        ttl_seconds=self.ttl_seconds,
+                        oldest_idle_seconds=round(now - oldest, 1) if oldest is not None else 0.0)
@@ -0,0 +1,92 @@
+"""
+Bounded, time-limited handling for routes that wait on third-party APIs
+(TTS, Giphy, the chat LLM, custom bot generation).
+
+gunicorn gives us a handful of threads, and a TTS or LLM call can hold one
+for many seconds. Routes wrapped with SlowIOPool.limit() run their view on
+a separate pool of I/O threads:
+
+- each route has its own concurrency limit, and all of them together never
+  hold more than max_workers request threads, so /make_move and /game_state
+  always have threads left; requests over a limit get 503 straight away
+- the request thread waits at most `timeout` seconds, then answers 504 and
+  is free again; the slot stays taken until the third-party call returns
+
+The request thread does wait for the answer (up to the route's timeout, 45 s
+at most), so max_workers is also how many request threads slow routes can
+hold. It is sized together with the event stream cap (SSE_MAX_STREAMS), whose
+streams each hold a thread too: with the defaults, 16 gunicorn threads are
+6 for streams, 6 for slow routes and 4 always left for game moves and state
+reads. web_app warns at startup when GUNICORN_THREADS leaves fewer.
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from functools import wraps
+
+from flask import copy_current_request_context, jsonify, request
+
+from app_log import get_logger
+
+log = get_logger('slow_io')
+
+IO_POOL_WORKERS = int(os.getenv('IO_POOL_WORKERS', 6))
+
+
+class SlowIOPool:
+    """
+    Args:
+        max_workers: I/O threads, and the most slow requests in flight across all routes
+    """
+
+    def __init__(self, max_workers=IO_POOL_WORKERS):
+        self.max_workers = max_workers
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='slow-io')
+        self.slots = threading.BoundedSemaphore(max_workers)
+        self.routes = {}  # route name -> counters
+        self._lock = threading.Lock()
+
+    def limit(self, name, max_concurrent, timeout):
+        """Decorator: run the view on the I/O pool, at most max_concurrent at once, answering within timeout seconds."""
+        route_slots = threading.BoundedSemaphore(max_concurrent)
+        counters = self.routes[name] = {'max_concurrent': max_concurrent, 'timeout': timeout, 'in_flight': 0,
+                                        'completed': 0, 'rejected': 0, 'timed_out': 0}
+
+        def count(key, delta=1):
+            with self._lock:
+                counters[key] += delta
+
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                if not route_slots.acquire(blocking=False):
+                    count('rejected')
+                    return jsonify({'success': False, 'error': f'{name} is busy, try again shortly'}), 503
+                if not self.slots.acquire(blocking=False):
+                    route_slots.release()
+                    count('rejected')
+                    return jsonify({'success': False, 'error': f'{name} is busy, try again shortly'}), 503
+                count('in_flight')
+
+                def release(_future):
+                    count('in_flight', -1)
+                    count('completed')
+                    route_slots.release()
+                    self.slots.release()
+
+                request.get_data(cache=True)  # read the body now; the view may outlive this request
+                future = self.executor.submit(copy_current_request_context(view), *args, **kwargs)
+                future.add_done_callback(release)
+                try:
+                    return future.result(timeout=timeout)
+                except FutureTimeout:
+                    count('timed_out')
+                    log.error(f"❌ {name} timed out after {timeout}s")
+                    return jsonify({'success': False, 'error': f'{name} timed out'}), 504
+            return wrapper
+        return decorator
+
+    def stats(self):
+        with self._lock:
+            return {'max_workers': self.max_workers, 'routes': {name: dict(c) for name, c in self.routes.items()}}
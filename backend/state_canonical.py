@@ -0,0 +1,84 @@
+"""
+Canonical forms for Q-learning states and actions.
+
+Many distinct state/action keys describe the same decision:
+- 10, Q and K all score 10 and only ever pair with their own rank, so
+  relabeling them consistently across a state gives an equivalent state.
+  (Suits never appear in state keys, so ranks are the only labels left.)
+- Pairs can form between any two grid positions (see GolfGame.calculate_score),
+  so face-down positions in the same visibility class are interchangeable:
+  every hidden position looks the same, and so do private positions that hold
+  the same rank.
+
+canonical_ranks() picks one representative per relabeling class, and
+canonical_action_key() names an action by the class of the position it touches
+instead of the position index. concrete_action() maps a canonical action back
+to a legal action for the actual grid.
+"""
+
+import itertools
+
+EQUIVALENT_RANKS = ('10', 'Q', 'K')
+_RELABELINGS = [dict(zip(EQUIVALENT_RANKS, perm))
+                for perm in itertools.permutations(EQUIVALENT_RANKS)]
+IDENTITY = {}
+
+
+def canonical_ranks(public_cards, private_cards, discard_rank, drawn_rank):
+    """
+    Relabel 10/Q/K so the state tuple is the smallest of its equivalents.
+
+    Returns (public_cards, private_cards, discard_rank, drawn_rank, relabel),
+    where relabel maps original ranks to canonical ones and must be applied to
+    anything else that names a rank (such as canonical action keys).
+    """
+    if not any(rank in EQUIVALENT_RANKS
+               for rank in (*public_cards, *private_cards, discard_rank, drawn_rank)):
+        return public_cards, private_cards, discard_rank, drawn_rank, IDENTITY
+
+    best = None
+    for relabel in _RELABELINGS:
+        candidate = (tuple(sorted(relabel.get(rank, rank) for rank in public_cards)),
+                     tuple(sorted(relabel.get(rank, rank) for rank in private_cards)),
+                     relabel.get(discard_rank, discard_rank),
+                     relabel.get(drawn_rank, drawn_rank))
+        if best is None or candidate < best[0]:
+            best = (candidate, relabel)
+    return (*best[0], best[1])
+
+
+def position_class(player, position, relabel=IDENTITY):
+    """'hid' for a card nobody has seen, 'priv_<rank>' for a privately visible one."""
+    card = player.grid[position]
+    if player.privately_visible[position] and card:
+        return f"priv_{relabel.get(card.rank, card.rank)}"
+    return "hid"
+
+
+def canonical_action_key(action, player, relabel=IDENTITY):
+    """Action key with the position replaced by its visibility class."""
+    if action['type'] == 'draw_deck' and not action.get('keep', True):
+        return f"draw_deck_flip_{position_class(player, action['flip_position'], relabel)}"
+    return f"{action['type']}_{position_class(player, action['position'], relabel)}"
+
+
+def concrete_action(canonical_key, legal_actions, player, relabel=IDENTITY):
+    """First legal action (lowest position) matching a canonical action key, or None."""
+    for action in legal_actions:
+        if canonical_action_key(action, player, relabel) == canonical_key:
+            return action
+    return None
+
+
+def count_canonical_states(max_known=4, max_rounds=4):
+    """
+    Size of the GameState representation (known ranks, discard, round) after
+    10/Q/K relabeling, for comparison with GameState.calculate_state_space().
+    """
+    ranks = ['A', '2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K']
+    seen = set()
+    for num_known in range(max_known + 1):
+        for known in itertools.combinations_with_replacement(ranks, num_known):
+            for discard in ranks + ['None']:
+                seen.add(canonical_ranks(known, (), discard, 'none')[:4])
+    return len(seen) * max_rounds
@@ -0,0 +1,63 @@
+"""
+Compact diffs between two game states.
+
+The client sends the version of the state it already holds and gets back
+only what changed since then:
+
+    {'$set': value}                      replace the value
+    {'$obj': {key: patch}, '$del': [..]} patch some keys of a dict
+    {'$list': n, '$at': {i: patch}}      resize a list to n and patch some indices
+
+So a move that flips one card and appends one history line sends that card,
+that line and the stats that moved, not every grid and the whole history.
+apply_patch() is the reference for the client-side applyStatePatch().
+"""
+
+
+def diff(old, new):
+    """Patch turning old into new, or None if they are equal."""
+    if old == new:
+        return None
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = {}
+        for key, value in new.items():
+            if key not in old:
+                changes[key] = {'$set': value}
+            else:
+                patch = diff(old[key], value)
+                if patch is not None:
+                    changes[key] = patch
+        patch = {'$obj': changes}
+        removed = [key for key in old if key not in new]
+        if removed:
+            patch['$del'] = removed
+        return patch
+    if isinstance(old, list) and isinstance(new, list):
+        at = {}
+        for i, value in enumerate(new):
+            if i >= len(old):
+                at[i] = {'$set': value}
+            else:
+                patch = diff(old[i], value)
+                if patch is not None:
+                    at[i] = patch
+        return {'$list': len(new), '$at': at}
+    return {'$set': new}
+
+
+def apply_patch(value, patch):
+    """Apply a diff() patch (after a JSON round trip, list indices are strings)."""
+    if '$set' in patch:
+        return patch['$set']
+    if '$obj' in patch:
+        result = dict(value)
+        for key in patch.get('$del', []):
+            result.pop(key, None)
+        for key, sub_patch in patch['$obj'].items():
+            result[key] = apply_patch(result.get(key), sub_patch)
+        return result
+    length = patch['$list']
+    result = list(value[:length]) + [None] * max(0, length - len(value))
+    for i, sub_patch in patch['$at'].items():
+        result[int(i)] = apply_patch(result[int(i)], sub_patch)
+    return result
@@ -0,0 +1,119 @@
+"""
+Memoized EV analysis and EV-teacher actions.
+
+expected_value_draw_vs_discard() is the most expensive call in a Q-learning
+decision, and during the bootstrap phase it used to run twice per decision
+(once for the EV teacher, once for the state key). TeacherCache keys each
+result on everything the EV computation reads, written without suits:
+
+- the player's grid ranks and which positions are public / privately visible
+- the top discard rank
+- the unseen-rank counts (probabilities.get_private_deck_counts)
+
+Equal keys give identical EV results, so a hit is exact (only the
+'discard_card' label may show another suit). Full results are stored as
+compact tuples to keep the memory per entry small; the short results of the
+no-comparison paths are kept as dicts, so the fields they leave out stay
+missing (callers rely on .get() defaults for them). The cache can
+be saved to disk and loaded by later training runs, so the teacher policy for
+common positions is tabulated once.
+"""
+
+import json
+import os
+
+from probabilities import expected_value_draw_vs_discard, get_private_deck_counts
+
+EV_FIELDS = ('draw_expected_value', 'discard_expected_value', 'recommendation', 'draw_advantage',
+             'discard_card', 'discard_score', 'current_hand_score', 'best_discard_position',
+             'best_draw_position', 'best_flip_position', 'best_action_type')
+
+
+def _ev_dict(stored):
+    if isinstance(stored, dict):
+        return dict(stored)
+    return dict(zip(EV_FIELDS, stored))
+
+
+class TeacherCache:
+    """
+    Args:
+        max_entries: Oldest entries are evicted beyond this many
+        teacher: Agent with action_from_ev(ev, available_positions), EVAgent by default
+    """
+
+    def __init__(self, max_entries=200000, teacher=None):
+        if teacher is None:
+            from agents import EVAgent
+            teacher = EVAgent()
+        self.teacher = teacher
+        self.max_entries = max_entries
+        self.entries = {}  # key -> [EV_FIELDS values or partial EV dict, teacher_action or None]
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @staticmethod
+    def state_key(player, game):
+        grid = ','.join(card.rank if card else '-' for card in player.grid)
+        known = ''.join('1' if k else '0' for k in player.known)
+        private = ''.join('1' if p else '0' for p in player.privately_visible)
+        discard = game.discard_pile[-1].rank if game.discard_pile else 'none'
+        deck = 'none' if not game.deck else ','.join(str(c) for c in get_private_deck_counts(game).values())
+        return f"{grid}|{known}|{private}|{discard}|{deck}"
+
+    def _entry(self, player, game):
+        key = self.state_key(player, game)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        ev = expected_value_draw_vs_discard(game, player)
+        if all(field in ev for field in EV_FIELDS):
+            entry = [tuple(ev[field] for field in EV_FIELDS), None]
+        else:
+            entry = [dict(ev), None]
+        if len(self.entries) >= self.max_entries:
+            del self.entries[next(iter(self.entries))]
+        self.entries[key] = entry
+        return entry
+
+    def ev(self, player, game):
+        """expected_value_draw_vs_discard(game, player), memoized."""
+        return _ev_dict(self._entry(player, game)[0])
+
+    def teacher_action(self, player, game):
+        """The teacher's action for this decision, memoized (None if no moves)."""
+        available_positions = [i for i, known in enumerate(player.known) if not known]
+        if not available_positions:
+            return None
+        entry = self._entry(player, game)
+        if entry[1] is None:
+            ev = _ev_dict(entry[0])
+            entry[1] = self.teacher.action_from_ev(ev, available_positions)
+        return dict(entry[1])
+
+    def hit_rate(self):
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def save(self, path):
+        """Write the cache as JSON (atomically), to be reused by later runs."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f)
+        os.replace(tmp_path, path)
+        print(f"Teacher cache saved to {path} ({len(self.entries):,} states)")
+
+    def load(self, path):
+        if not os.path.exists(path):
+            print(f"No teacher cache found at {path}, starting empty.")
+            return self
+        with open(path, 'r', encoding='utf-8') as f:
+            self.entries.update(json.load(f))
+        print(f"Loaded teacher cache from {path} ({len(self.entries):,} states)")
+        return self
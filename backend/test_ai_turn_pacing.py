@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test that AI turns never sleep on the server: the move is applied at once,
+stamped with a reveal time, and early requests for the next bot move are
+told how long to wait instead of blocking.
+
+Run from the backend directory:
+    python -m pytest test_ai_turn_pacing.py
+"""
+
+import time
+
+import pytest
+
+
+@pytest.fixture
+def ai_turn_delay():
+    return 1.0
+
+
+def start_game(web):
+    """New game with two bots, after the human's first move."""
+    game_id = web.new_game(num_bots=2)
+    resp = web.client.post('/make_move', json={'game_id': game_id,
+                                               'action': {'type': 'take_discard', 'position': 0}})
+    assert resp.get_json()['game_state']['current_turn'] == 1
+    return game_id
+
+
+def test_ai_turn_does_not_sleep(web):
+    with web.app.test_client() as client:
+        game_id = start_game(web)
+
+        start = time.perf_counter()
+        data = client.post('/run_ai_turn', json={'game_id': game_id}).get_json()
+        assert time.perf_counter() - start < 0.5
+        state = data['game_state']
+        assert state['current_turn'] == 2
+        assert 0 < state['reveal_in_ms'] <= 1000 and state['ai_thinking']
+
+        # Asking for the next bot move before the reveal is paced, not blocked
+        start = time.perf_counter()
+        data = client.post('/run_ai_turn', json={'game_id': game_id}).get_json()
+        assert time.perf_counter() - start < 0.5
+        assert data['ai_wait_ms'] > 0 and data['game_state']['current_turn'] == 2
+
+        # The lock is free, so state reads are not held up either
+        start = time.perf_counter()
+        client.get(f'/game_state/{game_id}')
+        assert time.perf_counter() - start < 0.5
+
+        time.sleep(data['ai_wait_ms'] / 1000)
+        data = client.post('/run_ai_turn', json={'game_id': game_id}).get_json()
+        assert 'ai_wait_ms' not in data and data['game_state']['current_turn'] == 0
+
+
+def test_run_ai_turns_timeline(web):
+    from state_delta import apply_patch
+    with web.app.test_client() as client:
+        game_id = start_game(web)
+        state = client.get(f'/game_state/{game_id}').get_json()
+
+        start = time.perf_counter()
+        data = client.post('/run_ai_turns', json={'game_id': game_id, 'since_version': state['version']}).get_json()
+        assert time.perf_counter() - start < 0.5
+        timeline = data['timeline']
+        assert [step['player_index'] for step in timeline] == [1, 2]
+
+        # Each step patches the previous one and is revealed one AI_TURN_DELAY after it
+        reveals = []
+        for step in timeline:
+            assert step['game_state']['base_version'] == state['version']
+            state = apply_patch(state, step['game_state']['delta'])
+            reveals.append(state['reveal_in_ms'])
+        assert 0 < reveals[0] <= 1000 < reveals[1] <= 2000
+        assert state['version'] == data['version'] and state['current_turn'] == 0
+        full = client.get(f'/game_state/{game_id}').get_json()
+        for key in ('ai_thinking', 'reveal_in_ms'):
+            state.pop(key), full.pop(key)
+        assert state == full
+
+        # Nothing left to play until the human moves
+        data = client.post('/run_ai_turns', json={'game_id': game_id}).get_json()
+        assert data['timeline'] == [] and data['game_state']['current_turn'] == 0
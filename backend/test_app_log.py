@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test the logging layer: levels filter records, extra fields come out as
+key=value or JSON keys, sampled lines are thinned, and a stuck stdout
+drops records instead of blocking the caller.
+
+Run from the backend directory:
+    python test_app_log.py
+"""
+
+import io
+import json
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app_log import get_logger, sampled, setup_logging, flush_logging, log_stats
+
+log = get_logger('test')
+
+
+def test_levels_and_fields():
+    out = io.StringIO()
+    setup_logging(level='INFO', fmt='text', stream=out)
+    log.debug('hidden')
+    log.info('Game created', extra={'game_id': 'g1', 'players': 3})
+    flush_logging()
+    lines = out.getvalue().splitlines()
+    assert len(lines) == 1
+    assert 'INFO golf.test: Game created game_id=g1 players=3' in lines[0]
+
+    out = io.StringIO()
+    setup_logging(level='DEBUG', fmt='json', stream=out)
+    log.debug('Selected bots', extra={'selected_bots': [{'name': 'Bot'}]})
+    try:
+        raise ValueError('boom')
+    except ValueError:
+        log.error('Move failed', exc_info=True)
+    flush_logging()
+    first, second = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert first['level'] == 'DEBUG' and first['selected_bots'] == [{'name': 'Bot'}]
+    assert second['msg'].startswith('Move failed') and 'ValueError: boom' in second['msg']
+
+
+def test_sampling():
+    out = io.StringIO()
+    setup_logging(level='DEBUG', stream=out)
+    for i in range(2000):
+        log.debug('tick', extra=sampled(0.1, tick=i))
+    log.debug('never', extra=sampled(0))
+    flush_logging()
+    written = len(out.getvalue().splitlines())
+    assert 100 < written < 300, written
+    assert log_stats()['sampled_out'] == 2001 - written
+
+
+def test_stuck_output_never_blocks():
+    release = threading.Event()
+
+    class StuckStream(io.StringIO):
+        def write(self, text):
+            release.wait()
+            return super().write(text)
+
+    setup_logging(level='INFO', stream=StuckStream(), queue_size=10)
+    start = time.perf_counter()
+    for i in range(1000):
+        log.info('busy', extra={'i': i})
+    assert time.perf_counter() - start < 1.0
+    assert log_stats()['dropped'] >= 1000 - 11
+    release.set()
+    setup_logging()
+
+
+if __name__ == "__main__":
+    test_levels_and_fields()
+    test_sampling()
+    test_stuck_output_never_blocks()
+    print("✅ Logging tests passed")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test script for the DQN agent: replay ring buffer, batched self-play
+training, and a frozen numpy model that makes the same greedy decisions.
+"""
+
+import sys
+import os
+import random
+import tempfile
+import time
+import numpy as np
+from unittest.mock import MagicMock
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Game uploads go to Supabase; mock it out like test_multiround.py does
+sys.modules.setdefault('supabase', MagicMock())
+os.environ.setdefault('SUPABASE_URL', 'http://localhost')
+os.environ.setdefault('SUPABASE_PUBLIC', 'test')
+
+import game
+game.upload_game_state = MagicMock(return_value=None)
+from game import GolfGame
+from dqn_agent import (TORCH_AVAILABLE, INPUT_DIM, ReplayMemory, FrozenDQNPolicy,
+                       encode_decision, play_games_batched)
+
+
+def test_replay_memory_wraps():
+    memory = ReplayMemory(capacity=5)
+    for i in range(8):
+        memory.push(np.full(INPUT_DIM, i, dtype=np.float32), 0.1, False, np.ones((3, INPUT_DIM), dtype=np.float32))
+    assert len(memory) == 5
+    assert memory.position == 3
+    assert memory.state[0, 0] == 5 and memory.state[2, 0] == 7
+    assert memory.next_mask[0].sum() == 3
+
+
+def test_train_and_freeze():
+    from dqn_agent import DQNAgent
+    random.seed(0)
+    np.random.seed(0)
+    agent = DQNAgent(batch_size=64, replay_capacity=5000)
+    assert not hasattr(agent, 'q_table') and not hasattr(agent, 'update')
+
+    start = time.perf_counter()
+    results = play_games_batched(agent, 200, concurrent=25)
+    elapsed = time.perf_counter() - start
+    print(f"Trained on {len(results)} games in {elapsed:.1f}s ({len(results) / elapsed:.0f} games/sec), "
+          f"{agent.updates} updates")
+    assert len(results) == 200 and agent.games_played == 200
+    assert agent.updates > 0 and len(agent.replay) > 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = agent.export_frozen(os.path.join(tmp, "dqn_frozen.npz"))
+        policy = FrozenDQNPolicy.load(path)
+
+    agent.set_training_mode(False)
+    for seed in range(10):
+        random.seed(seed)
+        g = GolfGame(num_players=2, agent_types=["dqn", "random"], q_agents=[agent, None])
+        player = g.players[0]
+        assert policy.choose_action(player, g) == agent.choose_action(player, g)
+
+    legal = agent.get_legal_actions(player, g)
+    inputs, _, _ = encode_decision(player, g, legal)
+    start = time.perf_counter()
+    for _ in range(1000):
+        policy.q_values(inputs).argmax()
+    per_decision = (time.perf_counter() - start) / 1000
+    print(f"Frozen model: {per_decision * 1e6:.0f} µs to score {len(legal)} actions")
+    assert per_decision < 0.001
+
+
+if __name__ == "__main__":
+    test_replay_memory_wraps()
+    if TORCH_AVAILABLE:
+        test_train_and_freeze()
+    else:
+        print("PyTorch not available, skipping DQN training test")
+    print("✅ DQN agent tests passed")
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test the Server-Sent Events push channel: every subscriber of a game gets
+the same serialized frame, idle subscribers only see keepalives, and the
+/game_events route streams the state after each move.
+
+Run from the backend directory:
+    python -m pytest test_game_events.py
+"""
+
+import json
+import threading
+
+from game_events import GameEventHub
+
+
+def parse_frame(frame):
+    fields = dict(line.split(': ', 1) for line in frame.decode('utf-8').strip().split('\n'))
+    return int(fields['id']), json.loads(fields['data'])
+
+
+def test_subscribers_share_one_frame():
+    hub = GameEventHub()
+    first = hub.subscribe('g', keepalive=0.05)
+    second = hub.subscribe('g', keepalive=0.05)
+
+    # Nothing published yet: only keepalives
+    assert next(first) == b': keepalive\n\n'
+    assert next(second) == b': keepalive\n\n'
+    assert hub.subscriber_count('g') == 2
+
+    hub.publish('g', {'current_turn': 1})
+    frame_a, frame_b = next(first), next(second)
+    assert frame_a is frame_b  # serialized once, same bytes object for everyone
+    assert parse_frame(frame_a) == (1, {'current_turn': 1})
+
+    # A reconnect with the latest id does not get the same state twice
+    resumed = hub.subscribe('g', last_event_id=1, keepalive=0.05)
+    assert next(resumed) == b': keepalive\n\n'
+
+    first.close()
+    second.close()
+    resumed.close()
+    assert hub.subscriber_count('g') == 0
+
+
+def test_publish_wakes_waiting_subscriber():
+    hub = GameEventHub()
+    stream = hub.subscribe('g', keepalive=5)
+    received = []
+    reader = threading.Thread(target=lambda: received.append(next(stream)))
+    reader.start()
+    while hub.subscriber_count('g') == 0:
+        pass
+    hub.publish('g', {'current_turn': 2}, version=7)
+    reader.join(timeout=2)
+    assert received and parse_frame(received[0]) == (7, {'current_turn': 2})
+    hub.close('g')
+    assert list(stream) == []
+
+
+def test_stream_cap_releases_slots():
+    hub = GameEventHub(max_streams=2)
+    first = hub.subscribe('g', keepalive=0.05)
+    second = hub.subscribe('h', keepalive=0.05)
+    assert hub.subscribe('g') is None  # over the cap: the client polls instead
+    assert hub.stats() == {'open_streams': 2, 'max_streams': 2, 'rejected': 1}
+
+    # Closed before its first frame (client gone before the response started)
+    first.close()
+    third = hub.subscribe('g', keepalive=0.05)
+    assert third is not None and hub.stats()['open_streams'] == 2
+
+    # Ended by the game going away
+    next(second)
+    hub.close('h')
+    assert list(second) == []
+    assert hub.stats()['open_streams'] == 1
+    third.close()
+    third.close()
+    assert hub.stats()['open_streams'] == 0
+
+
+def test_game_events_route_streams_moves(web):
+    client = web.client
+    game_id = web.new_game()
+
+    assert client.get('/game_events/missing').status_code == 404
+
+    resp = client.get(f'/game_events/{game_id}', buffered=False)
+    assert resp.mimetype == 'text/event-stream'
+    stream = resp.iter_encoded()
+    _, state = parse_frame(next(stream))
+    assert state['current_turn'] == 0
+
+    client.post('/make_move', json={'game_id': game_id,
+                                    'action': {'type': 'take_discard', 'position': 0}})
+    _, state = parse_frame(next(stream))
+    assert state['current_turn'] == 1
+
+    # With every stream slot taken, the next tab is told to poll
+    web.event_hub.max_streams = 1
+    full = client.get(f'/game_events/{game_id}')
+    assert full.status_code == 503 and client.get('/api/session_stats').get_json()['event_streams']['rejected'] == 1
+    web.event_hub.close(game_id)
+    resp.close()
+    assert web.event_hub.stats()['open_streams'] == 0
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Test the shared SQLite game store: two stores on the same file behave like
+two gunicorn workers, commits are rejected when another worker committed
+first, and the web routes run unchanged on top of it.
+
+Run from the backend directory:
+    python -m pytest test_game_store.py
+"""
+
+import pytest
+
+from game import GolfGame
+from game_store import SQLiteGameStore, VersionConflict, create_game_store
+
+
+@pytest.fixture
+def game_store(tmp_path):
+    return create_game_store(f"sqlite:///{tmp_path / 'games.db'}")
+
+
+def test_workers_share_sessions(tmp_path):
+    path = str(tmp_path / 'shared.db')
+    worker_a, worker_b = SQLiteGameStore(path), SQLiteGameStore(path)
+    worker_a['g1'] = {'game': GolfGame(num_players=2, agent_types=['human', 'heuristic']), 'version': 1}
+
+    session_b = worker_b['g1']
+    assert worker_b['g1'] is session_b  # decoded once per version
+    assert type(session_b['game'].agents[1]).__name__ == 'HeuristicAgent'
+    session_b['version'] = 2
+    worker_b.commit('g1', session_b, 1)
+
+    session_a = worker_a['g1']
+    assert session_a['version'] == 2 and session_a is not session_b
+
+    session_a['version'] = 3
+    worker_a.commit('g1', session_a, 2)
+    session_b['version'] = 3
+    try:
+        worker_b.commit('g1', session_b, 2)  # stale: worker A already wrote version 3
+        assert False, "stale commit should be rejected"
+    except VersionConflict:
+        pass
+    assert worker_b['g1']['version'] == 3 and worker_b['g1'] is not session_b
+    assert list(worker_a) == ['g1'] and len(worker_b) == 1
+
+
+def test_routes_on_shared_store(web):
+    assert web.games.shared
+    client = web.client
+    game_id = web.new_game()
+    data = client.post('/make_move', json={'game_id': game_id,
+                                           'action': {'type': 'take_discard', 'position': 0}}).get_json()
+    assert data['game_state']['current_turn'] == 1
+
+    # Another worker sees the committed move and plays the bot's turn
+    other_worker = SQLiteGameStore(web.games.path)
+    session = other_worker[game_id]
+    assert session['version'] == data['game_state']['version']
+    session['game'].play_turn(session['game'].players[1])
+    session['game'].next_player()
+    session['version'] += 1
+    other_worker.commit(game_id, session, session['version'] - 1)
+
+    state = client.get(f'/game_state/{game_id}').get_json()
+    assert state['current_turn'] == 0 and state['version'] == session['version']
+
+    # Another worker commits while this request is mid-move: the write is refused with 409
+    def concurrent_write(*args, **kwargs):
+        theirs = other_worker[game_id]
+        theirs['version'] += 1
+        other_worker.commit(game_id, theirs, theirs['version'] - 1)
+
+    web.game_upload.side_effect = concurrent_write
+    resp = client.post('/make_move', json={'game_id': game_id,
+                                           'action': {'type': 'take_discard', 'position': 1}})
+    web.game_upload.side_effect = None
+    assert resp.status_code == 409 and resp.get_json()['conflict']
+    assert web.games[game_id]['version'] == other_worker[game_id]['version']
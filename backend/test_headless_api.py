@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test the headless bot-vs-bot API: all-engine matches finish in the create
+request, external seats play in bulk with engine seats answering in between,
+seat views hide other seats' cards, and nothing is uploaded.
+
+Run from the backend directory:
+    python -m pytest test_headless_api.py
+"""
+
+
+def test_engine_matches_play_to_the_end(web):
+    client = web.client
+    data = client.post('/headless/matches', json={'seats': ['random', 'heuristic', 'ev_ai'], 'count': 5}).get_json()
+    assert len(data['matches']) == 5
+    for match in data['matches']:
+        assert match['game_over'] and match['end_reason'] == 'all_cards_revealed'
+        assert len(match['scores']) == 3 and match['winners']
+        assert all(None not in player['grid'] for player in match['players'])
+    assert not web.game_upload.called
+
+    bad = client.post('/headless/matches', json={'seats': ['human', 'random']})
+    assert bad.status_code == 400
+
+
+def test_external_seat_bulk_actions(web):
+    client = web.client
+    match = client.post('/headless/matches', json={'seats': ['external', 'heuristic'], 'seat': 0}).get_json()['matches'][0]
+    match_id = match['match_id']
+    me, bot = match['players']
+    assert match['turn'] == 0 and match['deck_top']
+    assert me['grid'][:2] == [None, None] and None not in me['grid'][2:]  # bottom row is private to seat 0
+    assert bot['grid'] == [None] * 4
+    assert 'deck_top' not in client.get(f'/headless/matches/{match_id}?seat=1').get_json()['match']
+
+    resp = client.post(f'/headless/matches/{match_id}/actions', json={'actions': [{'seat': 1, 'type': 'take_discard', 'position': 0}]})
+    assert resp.status_code == 400 and resp.get_json()['applied'] == 0
+
+    actions = [{'seat': 0, 'type': 'draw_deck', 'keep': False, 'flip_position': 0}] + \
+              [{'seat': 0, 'type': 'take_discard', 'position': p} for p in (1, 2, 3)]
+    data = client.post(f'/headless/matches/{match_id}/actions', json={'actions': actions, 'seat': 0}).get_json()
+    assert data['success'] and data['applied'] == 4
+    state = data['match']
+    assert state['players'][0]['known'] == [True] * 4
+    assert state['moves'] >= 7  # the heuristic bot answered each move
+    if not state['game_over']:
+        assert state['turn'] == 0 and state['players'][1]['known'] != [True] * 4
+
+    assert client.delete(f'/headless/matches/{match_id}').get_json()['success']
+    assert client.get(f'/headless/matches/{match_id}').status_code == 404
+    stats = client.get('/headless/stats').get_json()
+    assert stats['matches_created'] == 1 and stats['moves'] > 0
+    assert not web.game_upload.called
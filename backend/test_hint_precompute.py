@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test that the human's hints are precomputed in the background once the bots
+have played: the state leaves the EV to them instead of computing it in the
+request, /draw_card and /hints serve them from cache, and they match what
+computing them in the request would give.
+
+Run from the backend directory:
+    python -m pytest test_hint_precompute.py
+"""
+
+import threading
+import time
+
+import hint_precompute
+import probabilities
+from probabilities import expected_value_draw_vs_discard, drawn_card_hints
+from hint_precompute import ready_hints
+
+
+def wait_for_hints(game_session):
+    for _ in range(200):
+        if ready_hints(game_session) is not None:
+            return ready_hints(game_session)
+        time.sleep(0.01)
+    raise AssertionError("hints were never computed")
+
+
+def test_hints_precomputed_after_bot_turns(web, monkeypatch):
+    # Hold the background work until the state has been built, as with a real EV that takes a while
+    release = threading.Event()
+    compute_hints = hint_precompute.compute_hints
+    monkeypatch.setattr(hint_precompute, 'compute_hints', lambda game: release.wait(5) and compute_hints(game))
+
+    client = web.client
+    game_id = web.new_game(num_bots=2)
+    client.post('/make_move', json={'game_id': game_id, 'action': {'type': 'take_discard', 'position': 0}})
+    assert ready_hints(web.games[game_id]) is None  # bots to move: nothing scheduled for the human
+
+    # Count EV computed in requests for the human's move (bot-turn states still compute their own)
+    inline_ev = []
+    ev = probabilities.expected_value_draw_vs_discard
+    def counting_ev(game, player=None):
+        if game.turn == 0:
+            inline_ev.append(player)
+        return ev(game, player)
+    monkeypatch.setattr(probabilities, 'expected_value_draw_vs_discard', counting_ev)
+
+    client.post('/run_ai_turns', json={'game_id': game_id})
+    game_session = web.games[game_id]
+    live_game = game_session['game']
+    assert live_game.turn == 0
+    state = client.get(f'/game_state/{game_id}').get_json()
+    assert state['hints_pending'] and state['version'] == game_session['version']
+    assert state['current_player_ev_analysis'] is None
+    assert state['probabilities']['expected_value_draw_vs_discard'] is None
+
+    release.set()
+    hints = wait_for_hints(game_session)
+    assert inline_ev == []
+
+    human = live_game.players[0]
+    assert hints['ev_analysis'] == expected_value_draw_vs_discard(live_game, human)
+    assert hints['drawn_card_hints'] == drawn_card_hints(live_game, human)
+    assert len(hints['win_probabilities']) == 3 and abs(sum(hints['win_probabilities']) - 1) < 0.01
+
+    # The state for this version stays as sent; the client reads the EV from /hints
+    assert client.get(f'/game_state/{game_id}').get_json() == state
+
+    before = web.hint_precomputer.stats()['ready']
+    data = client.get(f'/draw_card/{game_id}').get_json()
+    assert data['hint'] == hints['drawn_card_hints'][data['drawn_card']['rank']]
+    data = client.get(f'/hints/{game_id}').get_json()
+    assert data['version'] == game_session['version'] and data['win_probabilities'] == hints['win_probabilities']
+    assert data['ev_analysis'] == hints['ev_analysis']
+    assert web.hint_precomputer.stats()['ready'] == before + 2
+
+    # After the human moves, the old hints no longer apply
+    client.post('/make_move', json={'game_id': game_id, 'action': {'type': 'take_discard', 'position': 1}})
+    assert ready_hints(game_session) is None
+    assert client.get(f'/hints/{game_id}').status_code == 400
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test that /make_move is safe to retry: a move id is applied once, moves made
+against an old version are refused without waiting for the game lock, and
+the human's agent is never swapped out.
+
+Run from the backend directory:
+    python -m pytest test_idempotent_moves.py
+"""
+
+import time
+
+
+def test_retried_move_applies_once(web):
+    client = web.client
+    game_id = web.new_game()
+    game_session = web.games[game_id]
+    human_agent = game_session['game'].agents[0]
+    version = game_session['version']
+
+    move = {'game_id': game_id, 'move_id': 'move-1', 'expected_version': version,
+            'action': {'type': 'take_discard', 'position': 0}}
+    first = client.post('/make_move', json=move)
+    assert first.status_code == 200 and first.get_json()['game_state']['current_turn'] == 1
+    log_size = len(game_session['game'].action_log)
+    assert game_session['game'].agents[0] is human_agent
+
+    # The client never saw the reply and retries: same result, not a second move
+    retry = client.post('/make_move', json=move).get_json()
+    assert retry['success'] and retry['duplicate']
+    assert len(game_session['game'].action_log) == log_size
+    assert retry['game_state'] == first.get_json()['game_state']
+
+
+def test_stale_move_rejected_without_lock(web):
+    client = web.client
+    game_id = web.new_game()
+    game_session = web.games[game_id]
+    old_version = game_session['version']
+    client.post('/make_move', json={'game_id': game_id, 'move_id': 'a', 'expected_version': old_version,
+                                    'action': {'type': 'take_discard', 'position': 0}})
+    client.post('/run_ai_turns', json={'game_id': game_id})
+    assert game_session['game'].turn == 0
+
+    lock = web.game_locks[game_id]
+    lock.acquire()  # a slow request holds the game
+    try:
+        start = time.perf_counter()
+        resp = client.post('/make_move', json={'game_id': game_id, 'move_id': 'b', 'expected_version': old_version,
+                                               'action': {'type': 'take_discard', 'position': 1}})
+        assert time.perf_counter() - start < 0.5
+        assert resp.status_code == 409 and resp.get_json()['stale']
+        assert resp.get_json()['game_state']['version'] == game_session['version']
+    finally:
+        lock.release()
+
+    # Moves without ids (older clients) still work
+    resp = client.post('/make_move', json={'game_id': game_id, 'action': {'type': 'take_discard', 'position': 1}})
+    assert resp.status_code == 200 and resp.get_json()['success']
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Test script for the linear function-approximation Q-agent: fixed-size
+features, fixed memory while training, and fast decisions.
+"""
+
+import sys
+import os
+import random
+import time
+import numpy as np
+from unittest.mock import MagicMock
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Game uploads go to Supabase; mock it out like test_multiround.py does
+sys.modules.setdefault('supabase', MagicMock())
+os.environ.setdefault('SUPABASE_URL', 'http://localhost')
+os.environ.setdefault('SUPABASE_PUBLIC', 'test')
+
+import game
+game.upload_game_state = MagicMock(return_value=None)
+from game import GolfGame
+from agents import LinearQAgent, QLearningAgent
+from features import FEATURE_DIM, STATE_DIM, encode_state, encode_actions
+from probabilities import expected_value_draw_vs_discard
+
+
+def test_feature_shapes():
+    random.seed(0)
+    agent = LinearQAgent()
+    g = GolfGame(num_players=2, agent_types=["linear", "random"], q_agents=[agent, None])
+    player = g.players[0]
+    state, context = encode_state(player, g)
+    assert state.shape == (STATE_DIM,)
+    legal = agent.get_legal_actions(player, g)
+    features, types = encode_actions(state, context, legal)
+    assert features.shape == (len(legal), FEATURE_DIM)
+    assert np.isfinite(features).all()
+    assert set(types.tolist()) == {0, 1, 2}
+
+
+def test_training_keeps_memory_fixed():
+    random.seed(1)
+    agent = LinearQAgent(epsilon=0.3)
+    # No tabular leftovers: there is no q_table to update, save or replay
+    assert not isinstance(agent, QLearningAgent)
+    assert not hasattr(agent, 'q_table') and not hasattr(agent, 'update')
+    size_before = agent.get_q_table_size()
+    scores = []
+    for _ in range(150):
+        trajectory = []
+        g = GolfGame(num_players=2, agent_types=["linear", "random"], q_agents=[agent, None])
+        result = g.play_game(verbose=False, trajectories=[trajectory, None])
+        assert all('features' in step and 'state_key' in step for step in trajectory)
+        agent.train_on_trajectory(trajectory, 1.0 if result[0] <= result[1] else -1.0, result[0])
+        agent.notify_game_end()
+        scores.append(result[0] - result[1])
+    assert agent.get_q_table_size() == size_before
+    assert np.isfinite(agent.weights).all() and np.abs(agent.weights).sum() > 0
+    print(f"Average score margin vs random over the last 50 games: {np.mean(scores[-50:]):.2f}")
+
+
+def test_decision_speed():
+    random.seed(2)
+    agent = LinearQAgent()
+    agent.set_training_mode(False)
+    g = GolfGame(num_players=2, agent_types=["linear", "random"], q_agents=[agent, None])
+    player = g.players[0]
+    legal = agent.get_legal_actions(player, g)
+    ev = expected_value_draw_vs_discard(g, player)
+    start = time.perf_counter()
+    for _ in range(200):
+        state, context = encode_state(player, g, ev)
+        features, types = encode_actions(state, context, legal)
+        agent.q_values(features, types).argmax()
+    per_decision = (time.perf_counter() - start) / 200
+    print(f"Scoring all legal actions: {per_decision * 1e6:.0f} µs per decision (EV excluded)")
+    assert per_decision < 0.005
+
+
+if __name__ == "__main__":
+    test_feature_shapes()
+    test_training_keeps_memory_fixed()
+    test_decision_speed()
+    print("✅ Linear Q-agent tests passed")
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test the /metrics endpoint: request latency per route and the game phase,
+agent, lock wait and upload timers show up as Prometheus histograms, and a
+disabled registry leaves instrumented functions untouched.
+
+Run from the backend directory:
+    python -m pytest test_metrics.py
+"""
+
+from metrics import Metrics
+
+
+def test_metrics_endpoint(web):
+    client = web.client
+    game_id = web.new_game()
+    client.post('/make_move', json={'game_id': game_id, 'action': {'type': 'take_discard', 'position': 0}})
+    client.post('/run_ai_turns', json={'game_id': game_id})
+    client.get(f'/game_state/{game_id}')
+
+    resp = client.get('/metrics')
+    assert resp.status_code == 200 and resp.mimetype == 'text/plain'
+    text = resp.get_data(as_text=True)
+    assert '# TYPE golf_request_seconds histogram' in text
+    assert 'golf_request_seconds_count{route="/make_move",method="POST",status="200"} 1' in text
+    assert 'golf_request_seconds_bucket{route="/game_state/<game_id>",method="GET",status="200",le="+Inf"} 1' in text
+    assert 'golf_phase_seconds_count{phase="get_game_state"}' in text
+    assert 'golf_phase_seconds_count{phase="get_probabilities"}' in text
+    assert 'golf_choose_action_seconds_count{agent="RandomAgent"}' in text
+    assert 'golf_lock_wait_seconds_count{endpoint="make_move"} 1' in text
+    assert 'golf_lock_wait_seconds_count{endpoint="run_ai_turns"} 1' in text
+
+
+def test_disabled_metrics_cost_nothing():
+    metrics = Metrics(enabled=False)
+
+    def build():
+        return 42
+
+    assert metrics.timed('phase', 'build')(build) is build
+    with metrics.timer('lock_wait', 'make_move'):
+        pass
+    metrics.observe('request', 0.1, '/', 'GET', '200')
+    assert '_count' not in metrics.render()
+
+
+def test_buckets_are_cumulative():
+    metrics = Metrics(enabled=True, buckets=(0.01, 0.1))
+    for seconds in (0.005, 0.05, 0.05, 2):
+        metrics.observe('phase', seconds, 'get_game_state')
+    text = metrics.render()
+    assert 'golf_phase_seconds_bucket{phase="get_game_state",le="0.01"} 1' in text
+    assert 'golf_phase_seconds_bucket{phase="get_game_state",le="0.1"} 3' in text
+    assert 'golf_phase_seconds_bucket{phase="get_game_state",le="+Inf"} 4' in text
+    assert 'golf_phase_seconds_sum{phase="get_game_state"} 2.105000' in text
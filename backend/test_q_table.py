@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test script for the counted Q-table: the running counters must always match a
+full scan of the table, whatever mix of reads and writes the agent does.
+"""
+
+import copy
+import pickle
+import random
+from q_table import QTable, QRow
+from agents import QLearningAgent
+
+
+def scan_size(q_table):
+    return len(q_table), sum(len(actions) for actions in q_table.values())
+
+
+def test_counters_match_scan():
+    q_table = QTable()
+    rng = random.Random(0)
+    for _ in range(2000):
+        state = f"s{rng.randrange(50)}"
+        action = f"a{rng.randrange(12)}"
+        op = rng.random()
+        if op < 0.4:
+            q_table[state][action] += 1.0
+        elif op < 0.7:
+            _ = q_table[state][action]          # read inserts a default, like defaultdict
+        elif op < 0.8:
+            _ = max(q_table[state].values()) if q_table[state] else 0.0
+        elif op < 0.9:
+            q_table[state].pop(action, None)
+        else:
+            q_table.pop(state, None)
+        assert q_table.size() == scan_size(q_table)
+
+    q_table["replaced"] = {"a0": 1.0, "a1": 2.0}
+    assert q_table.size() == scan_size(q_table)
+    q_table.update({"u1": {"a0": 1.0}, "replaced": {"a2": 3.0}})
+    q_table.setdefault("d1", {"a0": 0.5})["a1"] = 1.5
+    q_table.setdefault("d1", {"ignored": 9.0})
+    q_table["u1"].setdefault("a3", 2.0)
+    assert isinstance(dict.__getitem__(q_table, "d1"), QRow)
+    assert dict(q_table["d1"]) == {"a0": 0.5, "a1": 1.5}
+    assert q_table.size() == scan_size(q_table)
+
+
+def test_interval_growth():
+    q_table = QTable()
+    q_table["s1"]["a1"] = 1.0
+    q_table["s1"]["a2"] = 1.0
+    assert q_table.interval_growth() == (1, 2)
+    q_table["s2"]["a1"] = 1.0
+    q_table["s1"]["a1"] = 3.0
+    assert q_table.interval_growth() == (1, 1)
+    assert q_table.interval_growth() == (0, 0)
+
+
+def test_pickle_round_trip():
+    q_table = QTable()
+    q_table["s1"]["a1"] = 1.0
+    q_table["s1"]["a2"] = -2.0
+    q_table["s2"]["a1"] = 0.5
+    q_table.record_visit("s1", "a1", 3)
+    restored = pickle.loads(pickle.dumps(q_table))
+    assert restored == q_table and restored.size() == (2, 3)
+    restored["s3"]["a1"] = 1.0
+    assert restored.size() == scan_size(restored) == (3, 4)
+    assert restored.get_visits("s1", "a1") == 3 and restored.get_visits("s1", "a2") is None
+    assert copy.deepcopy(q_table) == q_table
+    assert pickle.loads(pickle.dumps(q_table["s1"])) == {"a1": 1.0, "a2": -2.0}
+
+
+def test_visits_live_in_rows():
+    q_table = QTable()
+    q_table["s1"]["a1"] = 1.0
+    q_table["s1"]["a2"] = 2.0
+    q_table.record_visit("s1", "a1", 2)
+    q_table.record_visit("s1", "a2")
+    q_table.record_visit("s1", "a1")
+    assert q_table.get_visits("s1", "a1") == 3 and q_table.get_visits("s1", "a2") == 1
+    # Removing an entry or a row takes its visit count with it
+    q_table["s1"].pop("a1")
+    assert q_table.get_visits("s1", "a1") is None
+    del q_table["s1"]["a2"]
+    assert q_table["s1"].visits == {}
+    q_table.record_visit("s2", "a1")
+    del q_table["s2"]
+    assert q_table.get_visits("s2", "a1") is None and "s2" not in q_table
+
+
+def test_agent_uses_counters():
+    agent = QLearningAgent()
+    agent.update("s1", "take_discard_0", 1.0, "s2", [{'type': 'take_discard', 'position': 1}])
+    assert agent.get_q_table_size() == scan_size(agent.q_table) == (2, 2)
+
+
+if __name__ == "__main__":
+    test_counters_match_scan()
+    test_interval_growth()
+    test_pickle_round_trip()
+    test_visits_live_in_rows()
+    test_agent_uses_counters()
+    print("✅ Q-table counter tests passed")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script for Q-table deployment artifacts: pruning, quantization, lookups
+through the agent interface, and the greedy-agreement report.
+"""
+
+import sys
+import os
+import random
+import tempfile
+import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from q_table import QTable
+from q_table_deploy import build_deployment_artifact, DeployedQTable, quantize
+
+
+def trained_table(seed=0, num_states=500):
+    rng = random.Random(seed)
+    table = QTable()
+    for s in range(num_states):
+        for a in range(6):
+            state_key, action_key = f"state_{s}", f"take_discard_{a}"
+            table[state_key][action_key] = rng.uniform(-2, 2)
+            table.record_visit(state_key, action_key, rng.randint(1, 10))
+        # Entries read but never updated stay at the default
+        table[state_key]["draw_deck_0"]
+    return table
+
+
+def test_int8_quantization_error_is_bounded():
+    values = np.linspace(-3, 3, 101)
+    quantized, scale = quantize(values, 'int8')
+    assert quantized.dtype == np.int8
+    assert np.abs(quantized * scale - values).max() <= scale / 2 + 1e-9
+
+
+def test_artifact_prunes_and_round_trips():
+    table = trained_table()
+    with tempfile.TemporaryDirectory() as tmp:
+        full = build_deployment_artifact(table, os.path.join(tmp, "full.npz"),
+                                         min_visits=0, min_abs_value=0.0, dtype='float32')
+        assert full['greedy_agreement'] == 1.0
+        assert full['kept_entries'] == table.num_entries
+
+        path = os.path.join(tmp, "qtable_deploy.npz")
+        report = build_deployment_artifact(table, path, min_visits=3, dtype='int8')
+        assert report['kept_entries'] < table.num_entries
+        assert report['artifact_bytes'] < full['artifact_bytes']
+        assert 0.5 < report['greedy_agreement'] <= 1.0
+
+        deployed = DeployedQTable.load(path)
+        for state_key, actions in table.items():
+            row = deployed[state_key]
+            assert row['draw_deck_0'] == 0.0 and 'draw_deck_0' not in row
+            for action_key, q_value in actions.items():
+                if table.get_visits(state_key, action_key, 0) >= 3:
+                    assert abs(row[action_key] - q_value) <= report['scale']
+        assert deployed['never_seen_state']['take_discard_0'] == 0.0
+
+
+if __name__ == "__main__":
+    test_int8_quantization_error_is_bounded()
+    test_artifact_prunes_and_round_trips()
+    print("✅ Q-table deployment tests passed")
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Test script for merging Q-table shards: visit-weighted averages, CSV and
+.qbin inputs, and external sorting with small chunks.
+"""
+
+import sys
+import os
+import random
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from q_table import QTable, save_q_table_csv, load_q_table_csv, append_q_table_delta
+from q_table_merge import merge_q_tables, export_qbin, load_qbin, iter_qbin, table_exists
+
+
+def random_table(seed, num_states=300):
+    rng = random.Random(seed)
+    table = QTable()
+    for s in range(num_states):
+        if rng.random() < 0.6:
+            for a in rng.sample(range(12), 3):
+                table[f"state_{s}"][f"action_{a}"] = rng.uniform(-1, 1)
+                table.record_visit(f"state_{s}", f"action_{a}", rng.randint(1, 20))
+    return table
+
+
+def expected_merge(tables):
+    totals = {}
+    for table in tables:
+        for state_key, actions in table.items():
+            for action_key, q_value in actions.items():
+                visits = table.get_visits(state_key, action_key)
+                weighted, count = totals.get((state_key, action_key), (0.0, 0))
+                totals[(state_key, action_key)] = (weighted + q_value * visits, count + visits)
+    return {key: (weighted / count, count) for key, (weighted, count) in totals.items()}
+
+
+def test_merge_csv_and_qbin_shards():
+    tables = [random_table(seed) for seed in range(3)]
+    expected = expected_merge(tables)
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i, table in enumerate(tables[:2]):
+            paths.append(os.path.join(tmp, f"shard{i}.csv"))
+            save_q_table_csv(table, paths[-1])
+        paths.append(os.path.join(tmp, "shard2.qbin"))
+        export_qbin(tables[2], paths[-1])
+
+        # Tiny chunks force several sorted runs per CSV input
+        out_csv = os.path.join(tmp, "merged.csv")
+        written = merge_q_tables(paths, out_csv, chunk_rows=50)
+        assert written == len(expected)
+        merged = load_q_table_csv(out_csv)
+        for (state_key, action_key), (q_value, visits) in expected.items():
+            assert abs(merged[state_key][action_key] - q_value) < 1e-9
+            assert merged.get_visits(state_key, action_key) == visits
+
+        # Binary output is sorted by state id and loads to the same table
+        out_qbin = os.path.join(tmp, "merged.qbin")
+        merge_q_tables(paths, out_qbin, chunk_rows=50)
+        ids = [entry[0] for entry in iter_qbin(out_qbin)]
+        assert ids == sorted(ids)
+        from_qbin = load_qbin(out_qbin)
+        assert {s: dict(a) for s, a in from_qbin.items()} == {s: dict(a) for s, a in merged.items()}
+        assert not [name for name in os.listdir(tmp) if name.endswith('.run.qbin')]
+
+
+def test_tables_without_visits_average_evenly():
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i, value in enumerate((1.0, 3.0)):
+            paths.append(os.path.join(tmp, f"old{i}.csv"))
+            with open(paths[-1], 'w', encoding='utf-8') as f:
+                f.write(f"state_key,action_key,q_value\ns,take_discard_0,{value}\n")
+        out = os.path.join(tmp, "merged.csv")
+        merge_q_tables(paths, out)
+        assert load_q_table_csv(out)['s']['take_discard_0'] == 2.0
+
+
+def test_unvisited_entries_carry_no_weight():
+    with tempfile.TemporaryDirectory() as tmp:
+        trained, read_only = QTable(), QTable()
+        trained['s']['take_discard_0'] = 4.0
+        trained.record_visit('s', 'take_discard_0', 3)
+        read_only['s']['take_discard_0']  # a read inserts a default 0.0 without a visit
+        read_only['t']['draw_deck'] = 1.0
+        read_only.record_visit('t', 'draw_deck')
+        paths = [os.path.join(tmp, "trained.csv"), os.path.join(tmp, "read_only.csv")]
+        save_q_table_csv(trained, paths[0])
+        save_q_table_csv(read_only, paths[1])
+        out = os.path.join(tmp, "merged.csv")
+        assert merge_q_tables(paths, out) == 2
+        merged = load_q_table_csv(out)
+        assert merged['s']['take_discard_0'] == 4.0 and merged.get_visits('s', 'take_discard_0') == 3
+
+        export_qbin(read_only, os.path.join(tmp, "read_only.qbin"))
+        assert [entry[1:] for entry in iter_qbin(os.path.join(tmp, "read_only.qbin"))] == [('t', 'draw_deck', 1.0, 1)]
+
+
+def test_csv_inputs_include_delta_log():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "qtable_train.csv")
+        table = QTable()
+        table['s']['take_discard_0'] = 1.0
+        table.record_visit('s', 'take_discard_0')
+        save_q_table_csv(table, path)
+        # Training since the last compaction only reached the delta log
+        table['s']['take_discard_0'] = 5.0
+        table.record_visit('s', 'take_discard_0')
+        table['t']['draw_deck'] = 2.0
+        table.record_visit('t', 'draw_deck')
+        append_q_table_delta(table, path, [('s', 'take_discard_0'), ('t', 'draw_deck')])
+
+        out = os.path.join(tmp, "merged.csv")
+        assert merge_q_tables([path], out) == 2
+        merged = load_q_table_csv(out)
+        assert merged['s']['take_discard_0'] == 5.0 and merged.get_visits('s', 'take_discard_0') == 2
+        assert merged['t']['draw_deck'] == 2.0
+
+        # A run that never compacted has only the delta log
+        fresh = os.path.join(tmp, "fresh.csv")
+        assert not table_exists(fresh)
+        append_q_table_delta(table, fresh, [('s', 'take_discard_0'), ('t', 'draw_deck')])
+        assert table_exists(fresh) and not os.path.exists(fresh)
+        assert merge_q_tables([fresh], out) == 2
+        assert load_q_table_csv(out)['s']['take_discard_0'] == 5.0
+
+
+if __name__ == "__main__":
+    test_merge_csv_and_qbin_shards()
+    test_tables_without_visits_average_evenly()
+    test_unvisited_entries_carry_no_weight()
+    test_csv_inputs_include_delta_log()
+    print("✅ Q-table merge tests passed")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Test script for prioritized replay: sum-tree sampling follows priorities,
+and replaying tabular transitions converges in fewer games.
+"""
+
+import sys
+import os
+import numpy as np
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from replay_buffer import SumTree, PrioritizedSampler, TransitionBuffer
+from agents import QLearningAgent
+
+
+def test_sum_tree_sampling_follows_priorities():
+    tree = SumTree(5)
+    tree.update(np.arange(5), np.array([1.0, 0.0, 3.0, 0.0, 6.0]))
+    assert tree.total == 10.0
+    assert tree.find([0.5, 1.5, 3.9, 4.0, 9.9]).tolist() == [0, 2, 2, 4, 4]
+
+    np.random.seed(0)
+    sampler = PrioritizedSampler(5, alpha=1.0, epsilon=0.0)
+    sampler.update_priorities(np.arange(5), np.array([1.0, 0.0, 3.0, 0.0, 6.0]))
+    slots = np.concatenate([sampler.sample(100, 5)[0] for _ in range(100)])
+    counts = np.bincount(slots, minlength=5) / len(slots)
+    assert counts[1] == 0 and counts[3] == 0
+    assert abs(counts[4] - 0.6) < 0.02 and abs(counts[2] - 0.3) < 0.02
+
+
+def test_transition_buffer_wraps():
+    buffer = TransitionBuffer(capacity=4)
+    steps = [{'state_key': f's{i}', 'action_key': 'take_discard_0'} for i in range(3)]
+    buffer.add_trajectory(steps, 1.0)
+    buffer.add_trajectory(steps, -1.0)
+    assert len(buffer) == 4 and buffer.position == 2
+    assert len(buffer.states) == 3 and len(buffer.actions) == 1
+    # Slot 1 now holds the last step of the second game
+    assert buffer.done[1] and abs(buffer.reward[1] - (0.1 - 1.0)) < 1e-6
+
+
+def test_transition_buffer_drops_overwritten_keys():
+    buffer = TransitionBuffer(capacity=6, prioritized=False)
+    for game in range(50):
+        steps = [{'state_key': f'g{game}s{i}', 'action_key': f'a{game}'} for i in range(3)]
+        buffer.add_trajectory(steps, 1.0)
+    # Only the last two games are still in the buffer, and only their keys are interned
+    assert len(buffer.states) == 6 and len(buffer.actions) == 2
+    assert len(buffer.states.keys) <= 9
+    live = {buffer.states.keys[i] for i in np.concatenate([buffer.state, buffer.next_state])}
+    assert live == {f'g{game}s{i}' for game in (48, 49) for i in range(3)}
+    assert {buffer.actions.keys[i] for i in buffer.action} == {'a48', 'a49'}
+
+
+def test_replay_converges_in_fewer_games():
+    trajectory = [{'state_key': f's{i}', 'action_key': 'take_discard_0'} for i in range(4)]
+    expected_q = 0.1 + 1.0  # final step's true value
+
+    plain = QLearningAgent(n_bootstrap_games=0)
+    replayed = QLearningAgent(n_bootstrap_games=0, replay_buffer=TransitionBuffer(1000),
+                              replay_batch_size=32)
+    np.random.seed(1)
+    for _ in range(5):
+        plain.train_on_trajectory(trajectory, 1.0, 0)
+        replayed.train_on_trajectory(trajectory, 1.0, 0)
+    plain_error = abs(plain.q_table['s3']['take_discard_0'] - expected_q)
+    replay_error = abs(replayed.q_table['s3']['take_discard_0'] - expected_q)
+    print(f"Error after 5 games: plain {plain_error:.3f}, prioritized replay {replay_error:.3f}")
+    assert replay_error < plain_error / 2
+
+
+if __name__ == "__main__":
+    test_sum_tree_sampling_follows_priorities()
+    test_transition_buffer_wraps()
+    test_transition_buffer_drops_overwritten_keys()
+    test_replay_converges_in_fewer_games()
+    print("✅ Replay buffer tests passed")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Round-trip property tests for the binary session encoding: live GolfGame
+sessions at random points of random games decode to the same state, encode
+back to the same bytes, and keep playing exactly like the original.
+
+Run from the backend directory:
+    python test_session_codec.py
+"""
+
+import sys
+import os
+import random
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from unittest.mock import MagicMock
+sys.modules.setdefault('supabase', MagicMock())
+os.environ.setdefault('SUPABASE_URL', 'http://localhost')
+os.environ.setdefault('SUPABASE_PUBLIC', 'test-key')
+
+import game as game_module
+game_module.upload_game_state = MagicMock(return_value=None)
+from game import GolfGame
+from session_codec import encode_session, decode_session
+
+AGENT_TYPES = ['random', 'heuristic', 'ev_ai']
+
+
+def snapshot(session):
+    """Everything observable about a session, with cards as strings."""
+    game = session['game']
+    cards = lambda cs: [str(c) if c else None for c in cs]
+    return {
+        'session': {k: v for k, v in session.items() if k != 'game' and not k.startswith('_')},
+        'game': (game.num_players, game.turn, game.round, game.max_rounds, getattr(game, 'game_id', None),
+                 cards(game.deck), cards(game.discard_pile), str(game.drawn_card), game.last_action,
+                 game.action_history, game.last_action_turn,
+                 [tuple(str(x) if hasattr(x, 'rank') else x for x in entry) for entry in game.action_log]),
+        'players': [(p.name, p.agent_type, cards(p.grid), p.known, p.privately_visible,
+                     cards(p.memory['all_seen_cards']), cards(p.memory['discard_history']),
+                     p.memory['cards_per_rank']) for p in game.players],
+        'agents': [type(agent).__name__ for agent in game.agents],
+    }
+
+
+def play_one_turn(game):
+    player = game.players[game.turn]
+    if player.agent_type == 'human':
+        hidden = [i for i, known in enumerate(player.known) if not known]
+        game.apply_action(player, {'type': 'take_discard', 'position': hidden[0]})
+    else:
+        game.play_turn(player)
+    game.next_player()
+
+
+def random_session(rng):
+    num_players = rng.randint(2, 4)
+    agent_types = ['human'] + [rng.choice(AGENT_TYPES) for _ in range(num_players - 1)]
+    game = GolfGame(num_players=num_players, agent_types=agent_types)
+    game.game_id = f'game-{rng.randint(0, 10**6)}'
+    for i, player in enumerate(game.players):
+        player.name = rng.choice(['Human', 'Jim Nantz', 'Bot ♠', 'Ünïcode'])
+    for _ in range(rng.randint(0, 16)):
+        if game.all_players_done():
+            break
+        play_one_turn(game)
+    session = {
+        'game': game,
+        'mode': '1v1',
+        'game_over': game.all_players_done(),
+        'player_name': game.players[0].name,
+        'num_games': rng.randint(1, 5),
+        'current_game': 1,
+        'cumulative_scores': [rng.randint(-10, 60) for _ in range(num_players)],
+        'round_cumulative_scores': [rng.randint(-10, 60) for _ in range(num_players)],
+        'match_winner': rng.choice([None, 0, 1]),
+        'cumulative_updated_for_game': rng.random() < 0.5,
+        'conversation_history': [{'sender': 'user', 'message': 'nice hand 👍'}],
+        'pending_proactive_comments': [],
+        'selected_bots': [{'ai_bot_id': 'jim_nantz', 'name': 'Jim Nantz', 'difficulty': 'announcer'}],
+        'whos_first': rng.randint(0, num_players - 1),
+        'version': rng.randint(1, 500),
+        'ai_reveal_at': rng.random() * 1e9,
+        '_state_cache': {'skipped': True},
+    }
+    if rng.random() < 0.5:
+        session['waiting_for_next_game'] = rng.random() < 0.5
+        session['last_proactive_comment_time_jim_nantz'] = 123.5
+    return session
+
+
+def test_roundtrip_properties():
+    rng = random.Random(0)
+    for _ in range(300):
+        session = random_session(rng)
+        data = encode_session(session)
+        decoded = decode_session(data)
+        assert '_state_cache' not in decoded
+        expected = snapshot(session)
+        assert snapshot(decoded) == expected
+        assert encode_session(decoded) == data
+
+
+def test_decoded_game_plays_on_identically():
+    rng = random.Random(1)
+    for _ in range(50):
+        session = random_session(rng)
+        original, copy = session['game'], decode_session(encode_session(session))['game']
+        for game in (original, copy):
+            random.seed(7)
+            while not game.all_players_done() and game.round < 20:
+                play_one_turn(game)
+        assert original.action_history == copy.action_history
+        assert [original.calculate_score(p.grid) for p in original.players] == \
+               [copy.calculate_score(p.grid) for p in copy.players]
+
+
+def test_size_and_speed():
+    session = random_session(random.Random(2))
+    data = encode_session(session)
+    n = 2000
+    start = time.perf_counter()
+    for _ in range(n):
+        encode_session(session)
+    encode_us = (time.perf_counter() - start) / n * 1e6
+    start = time.perf_counter()
+    for _ in range(n):
+        decode_session(data)
+    decode_us = (time.perf_counter() - start) / n * 1e6
+    print(f"{len(data)} bytes, encode {encode_us:.0f} µs, decode {decode_us:.0f} µs")
+    assert len(data) < 1024
+
+
+if __name__ == "__main__":
+    test_roundtrip_properties()
+    test_decoded_game_plays_on_identically()
+    test_size_and_speed()
+    print("✅ Session codec tests passed")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Test session eviction: idle games are removed after the TTL, the least
+recently used go first beyond max_sessions, and eviction clears every
+per-game structure in web_app (locks, chat history, chat tracking, bot cache).
+
+Run from the backend directory:
+    python -m pytest test_session_store.py
+"""
+
+import web_app
+from session_store import SessionStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_idle_and_lru_eviction():
+    clock = FakeClock()
+    games, locks = {}, {}
+    evicted = []
+    store = SessionStore(games, locks, ttl_seconds=60, max_sessions=3, clock=clock,
+                         in_use=lambda gid: gid == 'pinned')
+    store.on_evict(lambda gid, session: evicted.append(gid))
+
+    for gid in ['a', 'b', 'c']:
+        store.add(gid, {'name': gid})
+        clock.now += 1
+    store.touch('a')
+    store.add('d', {'name': 'd'})  # over the bound: 'b' is now least recently used
+    assert evicted == ['b'] and set(games) == set(locks) == {'a', 'c', 'd'}
+
+    clock.now += 30
+    store.touch('d')
+    store.max_sessions = 4
+    store.add('pinned', {})
+    clock.now += 45  # a and c idle for 75s+, d for 45s
+    assert store.sweep() == ['c', 'a']  # least recently used first
+    assert set(games) == {'d', 'pinned'}
+    clock.now += 100
+    store.sweep()
+    assert set(games) == {'pinned'}  # in use, so never evicted for idleness
+
+    stats = store.stats()
+    assert stats['evicted_lru'] == 1 and stats['evicted_idle'] == 3
+    assert stats['active_sessions'] == 1 and stats['peak_sessions'] == 4
+
+
+class SharedGames(dict):
+    """A shared store as SessionStore sees it: commit times from every worker."""
+    shared = True
+
+    def __init__(self):
+        super().__init__()
+        self.modified = {}
+
+    def last_modified(self, game_id):
+        return self.modified.get(game_id)
+
+
+def test_lru_skips_games_other_workers_wrote():
+    clock = FakeClock()
+    games = SharedGames()
+    store = SessionStore(games, {}, ttl_seconds=60, max_sessions=2, clock=clock)
+    for gid in ['a', 'b']:
+        store.add(gid, {})
+        games.modified[gid] = clock.now
+        clock.now += 1
+    games.modified['a'] = clock.now  # another worker just moved in 'a'
+    clock.now += 1
+    store.add('c', {})
+    assert set(games) == {'a', 'c'}  # 'b' went instead, though 'a' is older here
+    assert list(store.last_access) == ['c', 'a']  # 'a' moved up to the other worker's write
+
+
+def test_eviction_clears_web_app_state(web):
+    client = web.client
+    evict_bot = [{'name': 'Evict Bot', 'ai_bot_id': 'evict_bot', 'difficulty': 'easy'}]
+    game_id = web.new_game(bots=evict_bot)
+    other_id = web.new_game(bots=evict_bot)
+    web_app.chatbot.conversation_history[game_id] = [{'message': 'hi'}]
+    web_app.chat_handler._get_or_create_game_tracking(game_id)
+    assert 'evict_bot' in web_app.custom_bot_cache
+
+    assert web.session_store.evict(game_id)
+    assert game_id not in web.games and game_id not in web.game_locks
+    assert game_id not in web_app.chatbot.conversation_history
+    assert game_id not in web_app.chat_handler._game_tracking
+    assert 'evict_bot' in web_app.custom_bot_cache  # the other game still uses it
+    assert web.session_store.evict(other_id)
+    assert 'evict_bot' not in web_app.custom_bot_cache and not web_app.custom_bot_games
+    assert client.get(f'/game_state/{game_id}').get_json() is None
+    assert client.get('/api/session_stats').get_json()['evicted_idle'] >= 1
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test that routes waiting on third-party APIs can't starve game routes:
+they run on the I/O pool, answer 504 once their timeout passes, get 503
+when their route is at its concurrency limit, and game routes keep
+answering meanwhile.
+
+Run from the backend directory:
+    python -m pytest test_slow_io.py
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock
+
+from flask import Flask, jsonify, request
+
+from slow_io import SlowIOPool
+
+
+def make_app(release):
+    app = Flask(__name__)
+    pool = SlowIOPool(max_workers=3)
+
+    @app.route('/slow', methods=['POST'])
+    @pool.limit('slow', max_concurrent=2, timeout=0.3)
+    def slow():
+        release.wait(5)
+        return jsonify({'echo': request.json['text']})
+
+    @app.route('/fast')
+    def fast():
+        return jsonify({'ok': True})
+
+    return app, pool
+
+
+def test_timeout_limit_and_release():
+    release = threading.Event()
+    app, pool = make_app(release)
+    client = app.test_client()
+
+    start = time.perf_counter()
+    assert client.post('/slow', json={'text': 'a'}).status_code == 504
+    assert client.post('/slow', json={'text': 'b'}).status_code == 504
+    assert time.perf_counter() - start < 1.5
+    # Both calls are still running against the third party: the route is full
+    assert client.post('/slow', json={'text': 'c'}).status_code == 503
+    assert client.get('/fast').get_json() == {'ok': True}
+
+    release.set()
+    for _ in range(50):
+        if pool.stats()['routes']['slow']['in_flight'] == 0:
+            break
+        time.sleep(0.01)
+    resp = client.post('/slow', json={'text': 'd'})
+    assert resp.status_code == 200 and resp.get_json() == {'echo': 'd'}
+    counters = pool.stats()['routes']['slow']
+    assert (counters['completed'], counters['rejected'], counters['timed_out']) == (3, 1, 2)
+
+
+def test_web_app_routes_use_pool(web, monkeypatch):
+    monkeypatch.setattr(web.web_app, 'chirp3_voice', MagicMock(return_value='QUJD'))
+    client = web.client
+    resp = client.post('/api/tts_google', json={'text': 'Hello friends'})
+    assert resp.get_json() == {'audioContent': 'QUJD'}
+    stats = client.get('/api/session_stats').get_json()['slow_io']
+    assert stats['routes']['api/tts_google']['completed'] >= 1
+    assert set(stats['routes']) == {'chatbot/send_message', 'gif/search', 'api/tts', 'api/tts_google',
+                                    'api/create_custom_bot'}
+
+
+def test_thread_budget_leaves_room_for_moves(web):
+    budget = web.client.get('/api/session_stats').get_json()['threads']
+    assert budget['event_streams'] + budget['slow_io'] + budget['game_routes'] == budget['threads']
+    assert budget['game_routes'] >= web.web_app.MIN_GAME_THREADS
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test that get_game_state is built once per session version: repeat reads
+between moves return the cached dict and JSON bytes without recomputing
+probabilities or EV, and every move bumps the version.
+
+Run from the backend directory:
+    python -m pytest test_state_cache.py
+"""
+
+import time
+from unittest.mock import patch
+
+import pytest
+
+import probabilities
+from game_state import get_game_state, get_game_state_json
+
+
+@pytest.fixture
+def ai_turn_delay():
+    return 0.3
+
+
+def test_repeat_reads_are_cached(web):
+    client = web.client
+    game_id = web.new_game()
+    games = web.games
+
+    with patch.object(probabilities, 'get_probabilities', wraps=probabilities.get_probabilities) as probs:
+        first = get_game_state(game_id, games)
+        for _ in range(50):
+            assert get_game_state(game_id, games) is first
+        assert probs.call_count == 0  # built by create_game already
+        payload = get_game_state_json(game_id, games)
+        assert get_game_state_json(game_id, games) is payload
+        assert client.get(f'/game_state/{game_id}').data == payload
+
+        version = first['version']
+        client.post('/make_move', json={'game_id': game_id,
+                                        'action': {'type': 'take_discard', 'position': 0}})
+        assert probs.call_count == 1  # one build serves upload and response
+        after = get_game_state(game_id, games)
+        assert after['version'] == version + 1 and after['current_turn'] == 1
+        # The upload records the human's move, not the bot about to play
+        uploaded = web.upload.call_args.kwargs['game_state']
+        assert uploaded['current_turn'] == 0 and uploaded['players'] == after['players']
+        assert get_game_state_json(game_id, games) != payload
+
+
+def test_reveal_countdown_stays_fresh(web):
+    client = web.client
+    game_id = web.new_game()
+    games = web.games
+    client.post('/make_move', json={'game_id': game_id,
+                                    'action': {'type': 'take_discard', 'position': 0}})
+    client.post('/run_ai_turn', json={'game_id': game_id})
+
+    pending = get_game_state(game_id, games)
+    assert pending['ai_thinking'] and 0 < pending['reveal_in_ms'] <= 300
+    time.sleep(0.35)
+    settled = get_game_state(game_id, games)
+    assert not settled['ai_thinking'] and settled['reveal_in_ms'] == 0
+    assert settled['version'] == pending['version']
+    assert get_game_state(game_id, games) is settled
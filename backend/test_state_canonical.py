@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for canonical Q-learning states: equivalent states share a key,
+canonical actions map back to legal actions, and the Q-table shrinks.
+"""
+
+import sys
+import os
+import random
+from unittest.mock import MagicMock
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Game uploads go to Supabase; mock it out like test_multiround.py does
+sys.modules.setdefault('supabase', MagicMock())
+os.environ.setdefault('SUPABASE_URL', 'http://localhost')
+os.environ.setdefault('SUPABASE_PUBLIC', 'test')
+
+import game
+game.upload_game_state = MagicMock(return_value=None)
+from game import GolfGame
+from models import Card
+from agents import QLearningAgent
+from state_canonical import canonical_ranks, concrete_action
+
+
+def swap_ranks(game_obj, a, b):
+    """Relabel every card of rank a as b and vice versa, everywhere in the game"""
+    def swap(card):
+        if card and card.rank in (a, b):
+            return Card(b if card.rank == a else a, card.suit)
+        return card
+    for player in game_obj.players:
+        player.grid = [swap(card) for card in player.grid]
+    game_obj.deck = [swap(card) for card in game_obj.deck]
+    game_obj.discard_pile = [swap(card) for card in game_obj.discard_pile]
+
+
+def test_canonical_ranks_merge_relabelings():
+    base = canonical_ranks(('10', '3'), ('K', 'K'), 'Q', 'none')
+    swapped = canonical_ranks(('K', '3'), ('Q', 'Q'), '10', 'none')
+    assert base[:4] == swapped[:4]
+    # Ranks outside 10/Q/K are never relabeled
+    assert canonical_ranks(('A', '5'), (), 'J', 'none')[:4] == (('A', '5'), (), 'J', 'none')
+
+
+def test_relabeled_game_has_same_state_key():
+    agent = QLearningAgent(canonical_states=True)
+    for seed in range(20):
+        random.seed(seed)
+        g = GolfGame(num_players=2, agent_types=["qlearning", "random"], q_agents=[agent, None])
+        player = g.players[0]
+        key = agent.get_state_key(player, g)
+        swap_ranks(g, 'Q', 'K')
+        swap_ranks(g, '10', 'Q')
+        assert agent.get_state_key(player, g) == key
+
+
+def test_canonical_actions_map_back():
+    agent = QLearningAgent(canonical_states=True)
+    random.seed(3)
+    g = GolfGame(num_players=2, agent_types=["qlearning", "random"], q_agents=[agent, None])
+    player = g.players[0]
+    legal = agent.get_legal_actions(player, g)
+    relabel = agent.get_rank_relabel(player, g)
+    keys = {agent.get_action_key(a, player, relabel) for a in legal}
+    # Two hidden positions collapse into one class
+    assert len(keys) < len(legal)
+    for key in keys:
+        action = concrete_action(key, legal, player, relabel)
+        assert action in legal
+        assert agent.get_action_key(action, player, relabel) == key
+
+
+def train(canonical, num_games=60):
+    random.seed(42)
+    agent = QLearningAgent(epsilon=0.3, n_bootstrap_games=0, canonical_states=canonical)
+    for _ in range(num_games):
+        trajectory = []
+        g = GolfGame(num_players=2, agent_types=["qlearning", "random"], q_agents=[agent, None])
+        scores = g.play_game(verbose=False, trajectories=[trajectory, None])
+        agent.train_on_trajectory(trajectory, 1.0 if scores[0] <= scores[1] else -1.0, scores[0])
+        agent.notify_game_end()
+    return agent.get_q_table_size()
+
+
+def test_q_table_shrinks():
+    plain_states, plain_entries = train(canonical=False)
+    canon_states, canon_entries = train(canonical=True)
+    print(f"Plain: {plain_states} states / {plain_entries} entries, "
+          f"canonical: {canon_states} states / {canon_entries} entries")
+    assert canon_entries < plain_entries
+
+
+if __name__ == "__main__":
+    test_canonical_ranks_merge_relabelings()
+    test_relabeled_game_has_same_state_key()
+    test_canonical_actions_map_back()
+    test_q_table_shrinks()
+    print("✅ Canonical state tests passed")
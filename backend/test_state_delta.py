@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test delta-encoded state responses: a client that applies each delta to the
+state it holds ends up with exactly the full state, deltas are much smaller
+than full states in a 4-player match, and unknown versions fall back to the
+full state.
+
+Run from the backend directory:
+    python -m pytest test_state_delta.py
+"""
+
+import json
+import random
+
+from state_delta import diff, apply_patch
+from game_state import get_game_state
+
+
+def roundtrip(value):
+    return json.loads(json.dumps(value))
+
+
+def test_diff_apply_roundtrip():
+    random.seed(0)
+
+    def random_value(depth=0):
+        kind = random.choice(['int', 'str', 'list', 'dict', 'none'] if depth < 3 else ['int', 'str', 'none'])
+        if kind == 'int':
+            return random.randint(0, 3)
+        if kind == 'str':
+            return random.choice('abc')
+        if kind == 'list':
+            return [random_value(depth + 1) for _ in range(random.randint(0, 4))]
+        if kind == 'dict':
+            return {random.choice('wxyz'): random_value(depth + 1) for _ in range(random.randint(0, 3))}
+        return None
+
+    for _ in range(2000):
+        old, new = random_value(), random_value()
+        patch = diff(old, new)
+        if patch is None:
+            assert old == new
+        else:
+            assert apply_patch(old, roundtrip(patch)) == new
+
+
+def test_client_follows_deltas(web):
+    client = web.client
+    game_id = web.new_game(num_bots=3)
+    held = client.get(f'/game_state/{game_id}').get_json()
+
+    full_bytes = delta_bytes = 0
+    for _ in range(40):
+        if held['game_over']:
+            break
+        if held['current_turn'] == 0:
+            pos = next(i for i, card in enumerate(held['players'][0]['grid']) if not card['public'])
+            data = client.post('/make_move', json={'game_id': game_id, 'since_version': held['version'],
+                                                   'action': {'type': 'take_discard', 'position': pos}}).get_json()
+        else:
+            data = client.post('/run_ai_turn', json={'game_id': game_id,
+                                                     'since_version': held['version']}).get_json()
+        payload = data['game_state']
+        assert payload['base_version'] == held['version']
+        held = apply_patch(held, roundtrip(payload['delta']))
+        assert held == get_game_state(game_id, web.games)
+
+        # A poll with the version we now hold is tiny; the full state is not
+        polled = client.get(f'/game_state/{game_id}?since={held["version"]}').data
+        full = client.get(f'/game_state/{game_id}').data
+        delta_bytes += len(polled)
+        full_bytes += len(full)
+        assert apply_patch(held, json.loads(polled)['delta']) == json.loads(full)
+
+    print(f"Polling bytes: {delta_bytes:,} with deltas vs {full_bytes:,} full")
+    assert delta_bytes * 10 < full_bytes
+
+    # Versions the server no longer keeps get the full state
+    stale = client.get(f'/game_state/{game_id}?since=1').get_json()
+    assert 'delta' not in stale and stale['version'] == held['version']
@@ -2,7 +2,7 @@ import sys
 sys.stdout.reconfigure(encoding='utf-8')
 sys.stderr.reconfigure(encoding='utf-8')
 
-from flask import Flask, render_template, request, jsonify, session, send_from_directory, send_file
+from flask import Flask, render_template, request, jsonify, session, g, send_from_directory, send_file, Response, stream_with_context
 import uuid
 import json
 import random
@@ -20,13 +20,25 @@ from chatbot import GolfChatbot, ChatHandler
 from bot_personalities import enhance_custom_bot, save_bot_to_supabase
 import json
 import os
-from game_state import get_game_state
+from game_state import get_game_state, get_game_state_json, get_game_state_delta, get_game_state_delta_json, bump_version
 from flask import send_file
 from google_chipr_api import chirp3_voice
 from data_upset import upload_game_state
+from game_events import GameEventHub, KEEPALIVE_SECONDS
+from session_store import SessionStore
+from game_store import create_game_store, VersionConflict
+from session_snapshots import SessionSnapshots, SNAPSHOT_INTERVAL_SECONDS
+from slow_io import SlowIOPool
+from hint_precompute import HintPrecomputer
+from headless_api import headless
+from metrics import metrics
+from app_log import get_logger, log_stats
+import atexit
+import signal
 
 # Load environment variables from .env file
 load_dotenv()
+log = get_logger('web_app')
 # log = logging.getLogger('werkzeug')
 # log.setLevel(logging.ERROR)  # Only show errors, not every request
 
@@ -36,33 +48,99 @@ backend_dir = os.path.dirname(os.path.abspath(__file__))
 frontend_dir = os.path.join(backend_dir, '..', 'frontend')
 
 # Debug logging for deployment
-print(f"Backend directory: {backend_dir}")
-print(f"Frontend directory: {frontend_dir}")
-print(f"Template folder: {os.path.join(frontend_dir, 'templates')}")
-print(f"Static folder: {os.path.join(frontend_dir, 'static')}")
-print(f"Template folder exists: {os.path.exists(os.path.join(frontend_dir, 'templates'))}")
-print(f"Static folder exists: {os.path.exists(os.path.join(frontend_dir, 'static'))}")
-
-# Store active games
-games = {}
+log.info(f"Backend directory: {backend_dir}")
+log.info(f"Frontend directory: {frontend_dir}")
+log.info(f"Template folder: {os.path.join(frontend_dir, 'templates')}")
+log.info(f"Static folder: {os.path.join(frontend_dir, 'static')}")
+log.info(f"Template folder exists: {os.path.exists(os.path.join(frontend_dir, 'templates'))}")
+log.info(f"Static folder exists: {os.path.exists(os.path.join(frontend_dir, 'static'))}")
+
+# Store active games (in this process, or shared by all workers when GAME_STORE is set)
+games = create_game_store()
 game_locks = {}  # Per-game threading locks to prevent concurrent turn processing
+event_hub = GameEventHub()  # Pushes each new game state to /game_events subscribers
+# Evicts idle / least recently used games; games with a live event stream count as in use
+session_store = SessionStore(games, game_locks, in_use=lambda gid: event_hub.subscriber_count(gid) > 0)
 
 chatbot = GolfChatbot()
 chat_handler = ChatHandler(chatbot, games, get_game_state)
 # Add error handling for imports
 try:
-    print("All imports successful")
+    log.info("All imports successful")
 except Exception as e:
-    print(f"Import error: {e}")
-    import traceback
-    traceback.print_exc()
+    log.error(f"Import error: {e}", exc_info=True)
 
 app = Flask(__name__,
            template_folder=os.path.join(frontend_dir, 'templates'),
            static_folder=os.path.join(frontend_dir, 'static'))
 app.secret_key = 'your-secret-key-here'  # Change this in production
-
-AI_TURN_DELAY = 01.50  # seconds
+app.register_blueprint(headless)  # /headless/...: bot-vs-bot matches without pacing, chat or uploads
+
+if metrics.enabled:
+    @app.before_request
+    def start_request_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_request_latency(response):
+        start = g.pop('request_start', None)
+        if start is not None:
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            metrics.observe('request', time.perf_counter() - start, route, request.method, str(response.status_code))
+        return response
+
+# Routes waiting on TTS / Giphy / LLM APIs run here, so they can't use up the threads game moves need
+slow_io = SlowIOPool()
+# EV / win odds / drawn-card hints for the human's next move, computed while they think
+hint_precomputer = HintPrecomputer()
+
+# Request threads per worker (gunicorn --threads, from GUNICORN_THREADS in the Procfile / render.yaml).
+# Open event streams and slow I/O requests each hold one; their caps must leave these for the game routes.
+REQUEST_THREADS = int(os.getenv('GUNICORN_THREADS', 16))
+MIN_GAME_THREADS = 4
+
+
+def thread_budget():
+    """How the request threads divide between event streams, slow I/O routes and everything else"""
+    streams = event_hub.max_streams or 0
+    return {'threads': REQUEST_THREADS, 'event_streams': streams, 'slow_io': slow_io.max_workers,
+            'game_routes': REQUEST_THREADS - streams - slow_io.max_workers}
+
+
+if thread_budget()['game_routes'] < MIN_GAME_THREADS:
+    log.warning(f"⚠️ Thread budget leaves too few threads for moves and state reads: {thread_budget()}; "
+                f"lower SSE_MAX_STREAMS / IO_POOL_WORKERS or raise GUNICORN_THREADS")
+
+AI_TURN_DELAY = 01.50  # seconds between AI moves; enforced by reveal_at stamps, never by sleeping
+
+
+def acquire_game_lock(lock, timeout):
+    """lock.acquire(timeout=timeout), recording the wait for /metrics"""
+    with metrics.timer('lock_wait', request.endpoint):
+        return lock.acquire(timeout=timeout)
+
+def commit_session(game_id, game_session):
+    """Bump the session version after a mutation and write it back to the game store"""
+    expected_version = game_session.get('version', 0)
+    bump_version(game_session)
+    hint_precomputer.schedule(game_session)  # before the state build, which leaves the EV to it
+    get_game_state(game_id, games)  # settles derived fields (cumulative scores, next-game flag) before writing
+    games.commit(game_id, game_session, expected_version)
+    session_store.touch(game_id)  # so LRU eviction doesn't take our own write for another worker's
+
+def discard_session_changes(game_id):
+    """After a failed mutation: reload the last committed session, or at least rebuild its state"""
+    if games.shared:
+        games.drop_cached(game_id)
+    elif game_id in games:
+        bump_version(games[game_id])
+
+def publish_game_state(game_id, force=False):
+    """Push the game's current version to its SSE subscribers (serialized once for all of them)."""
+    if not force and event_hub.subscriber_count(game_id) == 0:
+        event_hub.invalidate(game_id)  # built lazily when someone connects
+        return
+    event_hub.publish(game_id, get_game_state_json(game_id, games), version=games[game_id]['version'])
 
 # Custom bot storage functions
 def get_custom_bots_file_path():
@@ -74,6 +152,58 @@ def get_custom_bots_file_path():
 
 
 custom_bot_cache = {} # cache of custom bots for frontend/backend communication (chatbot)
+custom_bot_games = {}  # ai_bot_id -> ids of this process's games using it, so eviction needn't scan every session
+
+
+def track_custom_bots(game_id, game_session):
+    """Record which custom bots a game in this process uses"""
+    for bot in game_session.get('selected_bots', []):
+        if bot.get('ai_bot_id'):
+            custom_bot_games.setdefault(bot['ai_bot_id'], set()).add(game_id)
+
+
+@session_store.on_evict
+def cleanup_evicted_game(game_id, game_session):
+    """Clear everything else kept per game once session_store evicts it"""
+    chat_handler.forget_game(game_id, game_session)
+    event_hub.close(game_id)
+    # Custom bots are cached by bot id; drop those no remaining game uses
+    for bot in (game_session or {}).get('selected_bots', []):
+        bot_id = bot.get('ai_bot_id')
+        users = custom_bot_games.get(bot_id)
+        if users:
+            users.discard(game_id)
+        if not users:
+            custom_bot_games.pop(bot_id, None)
+            custom_bot_cache.pop(bot_id, None)
+
+
+# Crash-safe snapshots of in-process games (a shared GAME_STORE already persists them)
+SESSION_SNAPSHOT_PATH = os.getenv('SESSION_SNAPSHOT_PATH')
+session_snapshots = None
+if SESSION_SNAPSHOT_PATH and not games.shared:
+    session_snapshots = SessionSnapshots(SESSION_SNAPSHOT_PATH)
+    restore_start = time.perf_counter()
+    for restored_id, restored_session in session_snapshots.restore().items():
+        session_store.add(restored_id, restored_session, restored=True)
+        track_custom_bots(restored_id, restored_session)
+    chat_handler.update_games_reference(games, get_game_state)
+    log.info(f"Restored {len(games)} games from {SESSION_SNAPSHOT_PATH} in {(time.perf_counter() - restore_start) * 1000:.0f} ms")
+    session_snapshots.start(games, game_locks, int(os.getenv('SESSION_SNAPSHOT_INTERVAL', SNAPSHOT_INTERVAL_SECONDS)))
+    atexit.register(session_snapshots.stop, games, game_locks)
+
+    if threading.current_thread() is threading.main_thread():
+        previous_sigterm = signal.getsignal(signal.SIGTERM)
+
+        def snapshot_on_sigterm(signum, frame):
+            """Snapshot before a deploy/restart stops us, then shut down as before"""
+            session_snapshots.stop(games, game_locks)
+            if callable(previous_sigterm):
+                previous_sigterm(signum, frame)
+            else:
+                sys.exit(0)
+
+        signal.signal(signal.SIGTERM, snapshot_on_sigterm)
 
 # todo function needd to be moved to game.py or game startup.py
 def get_or_fetch_custom_bot(ai_bot_id):
@@ -89,7 +219,7 @@ def get_or_fetch_custom_bot(ai_bot_id):
     supabase: Client = create_client(url, key)
     response = supabase.table('custom_bots').select('*').eq('ai_bot_id', ai_bot_id).single().execute()
     if response.error or not response.data:
-        print(f"❌ Error fetching bot {ai_bot_id} from Supabase: {response.error}")
+        log.error(f"❌ Error fetching bot {ai_bot_id} from Supabase: {response.error}")
         return None
     bot_data = response.data
     for field in ['emotional_state', 'proactive_config', 'response_config', 'gif_config']:
@@ -102,6 +232,22 @@ def get_or_fetch_custom_bot(ai_bot_id):
     return bot_data
 
 
+@app.before_request
+def track_session_access():
+    """Record use of the request's game and run the periodic idle sweep"""
+    game_id = (request.view_args or {}).get('game_id') or request.args.get('game_id')
+    if not game_id and request.is_json:
+        game_id = (request.get_json(silent=True) or {}).get('game_id')
+    if game_id:
+        session_store.touch(game_id)
+    session_store.maybe_sweep()
+
+@app.errorhandler(VersionConflict)
+def handle_version_conflict(e):
+    """Another worker changed the game first; the client refetches and retries"""
+    log.warning(f"❌ Version conflict: {e}")
+    return jsonify({'error': 'Game was updated by another request, please retry', 'conflict': True}), 409
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -115,6 +261,19 @@ def health_check():
         'timestamp': time.time()
     })
 
+@app.route('/api/session_stats')
+def session_stats():
+    """Session counts and eviction counters, for sizing instances"""
+    return jsonify(dict(session_store.stats(), slow_io=slow_io.stats(), event_streams=event_hub.stats(),
+                        threads=thread_budget(), hints=hint_precomputer.stats(), logs=log_stats()))
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Latency histograms in the Prometheus text format (METRICS_ENABLED=1)"""
+    if not metrics.enabled:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/test-static')
 def test_static():
     """Test route to verify static files are being served"""
@@ -170,9 +329,7 @@ def create_game():
                 'proactive_config': bot_instance.proactive_config,
                 'response_config': bot_instance.response_config
             })
-    print(f"DEBUG: Selected bots data attributes from frontend:")
-    for idx, bot in enumerate(selected_bots):
-        print(f"  Bot {idx+1}: {json.dumps(bot, indent=2)}")
+    log.debug("Selected bots data attributes from frontend", extra={'selected_bots': selected_bots})
     # 1. Cache all selected custom bots
     for bot in selected_bots:
         if 'ai_bot_id' in bot:
@@ -183,13 +340,13 @@ def create_game():
     # Only add user-selected bots as players
     agent_types = ['human']
     player_names = [player_name]
-    difficulty_to_agent = {'easy': 'random', 'medium': 'heuristic', 'hard': 'ev_ai'}
+    difficulty_to_agent = {'easy': 'random', 'medium': 'heuristic', 'hard': 'ev_ai', 'expert': 'dqn'}
     for bot in selected_bots:
         # Only add as player if not an announcer or non-player bot
         if bot.get('difficulty') not in ('announcer', 'nonplayer', 'announcer_only'):
             agent_types.append(difficulty_to_agent.get(bot.get('difficulty', 'medium').lower(), 'heuristic'))
             player_names.append(bot.get('name', 'AI Opponent'))
-            print(f' player_names: {player_names}')
+            log.debug(f' player_names: {player_names}')
 
     num_players = len(agent_types)
 
@@ -200,10 +357,8 @@ def create_game():
     for i, name in enumerate(player_names):
         game.players[i].name = name
 
-    game_locks[game_id] = threading.Lock()
-
-    # 4. Store the game session
-    games[game_id] = {
+    # 4. Store the game session (session_store also creates its lock)
+    session_store.add(game_id, {
         'game': game,
         'mode': game_mode,
         'game_over': False,
@@ -218,53 +373,140 @@ def create_game():
         'pending_proactive_comments': [],
         'selected_bots': selected_bots, # Store selected_bots in session
         'whos_first': 0,  # Human starts first. Kinda like dealer, but want the human to start.
-    }
+        'version': 1,  # Bumped on every mutation; get_game_state caches per version
+    })
+    track_custom_bots(game_id, games[game_id])
 
-    print("Final player order:")
-    for i, name in enumerate(player_names):
-        print(f"  Index {i}: {name}")
+    log.debug("Final player order", extra={'game_id': game_id, 'player_names': player_names})
 
     # Update ChatHandler with the new game
     chat_handler.update_games_reference(games, get_game_state)
+    hint_precomputer.schedule(games[game_id])
+
+    state = get_game_state(game_id, games)
+    publish_game_state(game_id)
 
     return jsonify({
         'success': True,
         'game_id': game_id,
-        'game_state': get_game_state(game_id, games)
+        'game_state': state
     })
 
 @app.route('/game_state/<game_id>')
 def game_state(game_id):
-    """Get current game state (acquires lock to avoid reading mid-mutation)"""
+    """
+    Get current game state (acquires lock to avoid reading mid-mutation).
+    With ?since=<version>, replies with a delta from that version when it is still known.
+    """
+    if game_id not in games:
+        return jsonify(None)
+    since_version = request.args.get('since', type=int)
     lock = game_locks.get(game_id)
     if lock:
-        acquired = lock.acquire(timeout=2)
+        acquired = acquire_game_lock(lock, 2)
         if not acquired:
-            return jsonify(get_game_state(game_id, games))
+            return Response(get_game_state_delta_json(game_id, games, since_version), mimetype='application/json')
         try:
-            return jsonify(get_game_state(game_id, games))
+            return Response(get_game_state_delta_json(game_id, games, since_version), mimetype='application/json')
         finally:
             lock.release()
-    return jsonify(get_game_state(game_id, games))
+    return Response(get_game_state_delta_json(game_id, games, since_version), mimetype='application/json')
+
+@app.route('/game_events/<game_id>')
+def game_events(game_id):
+    """Server-Sent Events stream of game states, replacing the client's polling loop"""
+    if game_id not in games:
+        return jsonify({'error': 'Game not found'}), 404
+
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', 0))
+    except ValueError:
+        last_event_id = 0
+
+    _, frame = event_hub.latest(game_id)
+    if frame is None:
+        lock = game_locks.get(game_id)
+        if lock and acquire_game_lock(lock, 2):
+            try:
+                publish_game_state(game_id, force=True)
+            finally:
+                lock.release()
+        else:
+            publish_game_state(game_id, force=True)
+
+    on_idle = None
+    if games.shared:
+        # Moves may be committed by other workers: check the store once a second
+        def on_idle():
+            event_id, _ = event_hub.latest(game_id)
+            version = games.version_of(game_id)
+            if version is not None and version > event_id:
+                publish_game_state(game_id, force=True)
+
+    stream = event_hub.subscribe(game_id, last_event_id, keepalive=1 if games.shared else KEEPALIVE_SECONDS,
+                                 on_idle=on_idle)
+    if stream is None:
+        # Every stream holds a request thread; past the cap the client polls /game_state instead
+        return jsonify({'error': 'Too many open event streams, poll /game_state'}), 503
+    return Response(
+        stream_with_context(stream),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+RECENT_MOVE_IDS = 16  # applied move ids remembered per game, to answer retries
+
+def check_move_request(game_id, game_session, move_id, expected_version, since_version):
+    """Response for a retried or stale move, or None if the move should be applied"""
+    if move_id and move_id in game_session.get('recent_move_ids', []):
+        return jsonify({
+            'success': True,
+            'duplicate': True,  # already applied; this is a retry
+            'game_state': get_game_state_delta(game_id, games, since_version)
+        })
+    if expected_version is not None and expected_version != game_session.get('version', 0):
+        return jsonify({
+            'error': 'Game has changed since this move was made',
+            'stale': True,
+            'game_state': get_game_state_delta(game_id, games, since_version)
+        }), 409
+    return None
 
 @app.route('/make_move', methods=['POST'])
 def make_move():
-    """Process a human player move"""
+    """Process a human player move
+
+    Clients send a move_id (unique per move, reused on retries) and the
+    expected_version they made the move against: retries of an applied move
+    get its result again, and moves made against an older state are refused
+    with 409 before waiting for the game lock.
+    """
     data = request.json
     game_id = data.get('game_id')
     action = data.get('action')
+    move_id = data.get('move_id')
+    expected_version = data.get('expected_version')
 
     if game_id not in games:
         return jsonify({'error': 'Game not found'}), 404
 
+    early = check_move_request(game_id, games[game_id], move_id, expected_version, data.get('since_version'))
+    if early is not None:
+        return early
+
     lock = game_locks.get(game_id)
-    if lock and not lock.acquire(timeout=5):
+    if lock and not acquire_game_lock(lock, 5):
         return jsonify({'error': 'Server busy, try again'}), 503
 
     try:
         game_session = games[game_id]
         game = game_session['game']
 
+        # Another request may have applied a move while we waited for the lock
+        early = check_move_request(game_id, game_session, move_id, expected_version, data.get('since_version'))
+        if early is not None:
+            return early
+
         if game_session['game_over']:
             return jsonify({'error': 'Game is already over'}), 400
 
@@ -297,17 +539,11 @@ def make_move():
         if not game_action:
             return jsonify({'error': 'Invalid action'}), 400
 
-        original_agent = game.agents[0]
-
-        class MockAgent:
-            def choose_action(self, player, game_state, trajectory=None):
-                return game_action
-
-        game.agents[0] = MockAgent()
-        game.play_turn(player)
-        game.agents[0] = original_agent
+        game.apply_action(player, game_action)
 
         game_session['human_has_played'] = True
+        if move_id:
+            game_session['recent_move_ids'] = (game_session.get('recent_move_ids', []) + [move_id])[-RECENT_MOVE_IDS:]
         update_round_cumulative_scores(game_session, game)
 
         if game.all_players_done():
@@ -317,20 +553,30 @@ def make_move():
         else:
             game_session['waiting_for_next_game'] = False
 
+        mover = game.turn
+        game.next_player()
+        commit_session(game_id, game_session)
+
+        # One build serves the upload, the SSE push and the response. The
+        # upload records the move, so it carries the mover's turn as it did
+        # when it was built before next_player(); nothing else it sends changes.
+        state = get_game_state(game_id, games)
         upload_game_state(
             game_id=game_id,
-            game_state=get_game_state(game_id, games)
+            game_state=dict(state, current_turn=mover)
         )
-
-        game.next_player()
+        publish_game_state(game_id)
 
         return jsonify({
             'success': True,
-            'game_state': get_game_state(game_id, games)
+            'game_state': get_game_state_delta(game_id, games, data.get('since_version'))
         })
 
+    except VersionConflict:
+        raise
     except Exception as e:
-        print(f"Error processing move: {e}")
+        log.error(f"Error processing move: {e}")
+        discard_session_changes(game_id)  # the move may have been partly applied
         return jsonify({'error': str(e)}), 400
     finally:
         if lock:
@@ -354,6 +600,7 @@ def draw_card(game_id):
 
     # Peek at the top card without removing it
     drawn_card = game.deck[-1]
+    hints = hint_precomputer.get(game_session)
 
     return jsonify({
         'success': True,
@@ -361,9 +608,22 @@ def draw_card(game_id):
             'rank': drawn_card.rank,
             'suit': drawn_card.suit,
             'score': drawn_card.score()
-        }
+        },
+        'hint': hints['drawn_card_hints'].get(drawn_card.rank) if hints else None,
     })
 
+@app.route('/hints/<game_id>')
+def get_hints(game_id):
+    """EV analysis, win odds and best action per drawn card for the human's move (precomputed while they think)"""
+    if game_id not in games:
+        return jsonify({'error': 'Game not found'}), 404
+
+    game_session = games[game_id]
+    hints = hint_precomputer.get(game_session)
+    if hints is None:
+        return jsonify({'error': 'Not your turn or game is over'}), 400
+    return jsonify(dict(hints, success=True, version=game_session.get('version', 0)))
+
 
 
 
@@ -422,7 +682,7 @@ def next_game():
 
     lock = game_locks.get(game_id)
     if lock:
-        lock.acquire(timeout=5)
+        acquire_game_lock(lock, 5)
 
     try:
         # Increment game number
@@ -432,7 +692,7 @@ def next_game():
         agent_types = ['human']
         player_names = [game_session['player_name']]
         selected_bots = game_session.get('selected_bots', [])
-        difficulty_to_agent = {'easy': 'random', 'medium': 'heuristic', 'hard': 'ev_ai'}
+        difficulty_to_agent = {'easy': 'random', 'medium': 'heuristic', 'hard': 'ev_ai', 'expert': 'dqn'}
         for bot in selected_bots:
             if bot.get('difficulty') not in ('announcer', 'nonplayer', 'announcer_only'):
                 agent_types.append(difficulty_to_agent.get(bot.get('difficulty', 'medium').lower(), 'heuristic'))
@@ -452,23 +712,29 @@ def next_game():
         game_session['game'] = new_game
         game_session['game_over'] = False
         game_session['ai_thinking'] = False
+        game_session['ai_reveal_at'] = 0
         game_session['match_winner'] = None
         game_session['waiting_for_next_game'] = False
         game_session['cumulative_updated_for_game'] = False
         game_session['round_cumulative_scores'] = game_session['cumulative_scores'].copy()
         game_session['conversation_history'] = []
         game_session['pending_proactive_comments'] = []
+        commit_session(game_id, game_session)
 
         state = get_game_state(game_id, games)
         assert state['current_turn'] == game_session['whos_first'], f"next_game: expected current_turn={game_session['whos_first']}, got {state['current_turn']}"
+        publish_game_state(game_id)
 
         return jsonify({
             'success': True,
             'game_state': state
         })
 
+    except VersionConflict:
+        raise
     except Exception as e:
-        print(f"Error starting next game: {e}")
+        log.error(f"Error starting next game: {e}")
+        discard_session_changes(game_id)
         return jsonify({'error': str(e)}), 400
     finally:
         if lock and lock.locked():
@@ -495,69 +761,132 @@ def get_private_score(player, game):
 def run_ai_turn():
     data = request.json
     game_id = data['game_id']
+    since_version = data.get('since_version')  # client's last-seen version: reply with a delta
 
     if game_id not in games:
         return jsonify({'error': 'Game not found'}), 404
 
     lock = game_locks.get(game_id)
-    if lock and not lock.acquire(timeout=5):
-        return jsonify({'success': True, 'game_state': get_game_state(game_id, games)})
+    if lock and not acquire_game_lock(lock, 5):
+        return jsonify({'success': True, 'game_state': get_game_state_delta(game_id, games, since_version)})
 
     try:
         game_session = games[game_id]
         game = game_session['game']
 
+        # The previous AI move is still being "thought about" on the client:
+        # tell it how long to wait instead of holding this thread and the lock.
+        wait = game_session.get('ai_reveal_at', 0) - time.time()
+        if game.turn != 0 and not game_session['game_over'] and wait > 0:
+            return jsonify({
+                'success': True,
+                'ai_wait_ms': int(wait * 1000),
+                'game_state': get_game_state_delta(game_id, games, since_version)
+            })
+
         if game.turn != 0 and not game_session['game_over']:
-            game_session['ai_thinking'] = True
-            player = game.players[game.turn]
-            time.sleep(AI_TURN_DELAY)
-            try:
-                game.play_turn(player)
-            except Exception as e:
-                print(f"AI move failed: {e}")
-            try:
-                update_round_cumulative_scores(game_session, game)
-            except Exception as e:
-                print(f"Score update failed: {e}")
-            if game.all_players_done():
-                game_session['game_over'] = True
-            game.next_player()
-            print(f"After next_player: turn={game.turn}, player={game.players[game.turn].name}")
-            game_session['ai_thinking'] = False
-
-            if game_session['game_over'] and game_session['current_game'] < game_session['num_games']:
-                if not game_session.get('cumulative_updated_for_game', False):
-                    public_scores = [get_public_score(p, game) for p in game.players]
-                    for i, s in enumerate(public_scores):
-                        game_session['cumulative_scores'][i] += s
-                    game_session['cumulative_updated_for_game'] = True
-                game_session['waiting_for_next_game'] = True
-            else:
-                game_session['waiting_for_next_game'] = False
+            # Move is computed now and revealed AI_TURN_DELAY later by the client
+            play_ai_move(game_id, game_session, time.time() + AI_TURN_DELAY)
+            publish_game_state(game_id)
 
             return jsonify({
                 'success': True,
-                'game_state': get_game_state(game_id, games)
+                'game_state': get_game_state_delta(game_id, games, since_version)
             })
 
-        if game_session['game_over'] and game_session['current_game'] < game_session['num_games']:
-            if not game_session.get('cumulative_updated_for_game', False):
-                public_scores = [get_public_score(p, game) for p in game.players]
-                for i, s in enumerate(public_scores):
-                    game_session['cumulative_scores'][i] += s
-                game_session['cumulative_updated_for_game'] = True
-            game_session['waiting_for_next_game'] = True
-        else:
-            game_session['waiting_for_next_game'] = False
+        if settle_next_game_flags(game_session, game):
+            commit_session(game_id, game_session)
 
         return jsonify({
             'success': True,
-            'game_state': get_game_state(game_id, games)
+            'game_state': get_game_state_delta(game_id, games, since_version)
         })
     finally:
         if lock:
             lock.release()
 
+@app.route('/run_ai_turns', methods=['POST'])
+def run_ai_turns():
+    """Play every bot turn up to the human's turn (or the end of the game) in one request.
+
+    Returns a timeline with one state delta per bot move, in order: each applies
+    on top of the previous one (the first on since_version), and its
+    reveal_in_ms says when the client should show it.
+    """
+    data = request.json
+    game_id = data['game_id']
+    since_version = data.get('since_version')
+
+    if game_id not in games:
+        return jsonify({'error': 'Game not found'}), 404
+
+    lock = game_locks.get(game_id)
+    if lock and not acquire_game_lock(lock, 5):
+        return jsonify({'success': True, 'timeline': [], 'game_state': get_game_state_delta(game_id, games, since_version)})
+
+    try:
+        game_session = games[game_id]
+        game = game_session['game']
+        # Queue behind any move still being revealed, then one AI_TURN_DELAY per bot
+        reveal_at = max(time.time(), game_session.get('ai_reveal_at', 0))
+        timeline = []
+        base_version = since_version
+        while game.turn != 0 and not game_session['game_over'] and len(timeline) < 4 * game.num_players:
+            reveal_at += AI_TURN_DELAY
+            player_index = game.turn
+            play_ai_move(game_id, game_session, reveal_at)
+            timeline.append({
+                'player_index': player_index,
+                'game_state': get_game_state_delta(game_id, games, base_version),
+            })
+            base_version = game_session['version']
+
+        if not timeline:
+            if settle_next_game_flags(game_session, game):
+                commit_session(game_id, game_session)
+            return jsonify({'success': True, 'timeline': [],
+                            'game_state': get_game_state_delta(game_id, games, since_version)})
+
+        publish_game_state(game_id)
+        return jsonify({'success': True, 'timeline': timeline, 'version': game_session['version']})
+    finally:
+        if lock:
+            lock.release()
+
+def play_ai_move(game_id, game_session, reveal_at):
+    """Play the current bot's turn, update scores and match flags, and commit it"""
+    game = game_session['game']
+    player = game.players[game.turn]
+    game_session['ai_reveal_at'] = reveal_at
+    try:
+        game.play_turn(player)
+    except Exception as e:
+        log.error(f"AI move failed: {e}")
+    try:
+        update_round_cumulative_scores(game_session, game)
+    except Exception as e:
+        log.error(f"Score update failed: {e}")
+    if game.all_players_done():
+        game_session['game_over'] = True
+    game.next_player()
+    log.debug("After next_player", extra={'game_id': game_id, 'turn': game.turn, 'player': game.players[game.turn].name})
+    settle_next_game_flags(game_session, game)
+    commit_session(game_id, game_session)
+
+def settle_next_game_flags(game_session, game):
+    """Once a game of a multi-game match ends, bank its scores and wait for /next_game. Returns True if anything changed"""
+    flags_before = (game_session.get('cumulative_updated_for_game'), game_session.get('waiting_for_next_game'))
+    if game_session['game_over'] and game_session['current_game'] < game_session['num_games']:
+        if not game_session.get('cumulative_updated_for_game', False):
+            public_scores = [get_public_score(p, game) for p in game.players]
+            for i, s in enumerate(public_scores):
+                game_session['cumulative_scores'][i] += s
+            game_session['cumulative_updated_for_game'] = True
+        game_session['waiting_for_next_game'] = True
+    else:
+        game_session['waiting_for_next_game'] = False
+    return (game_session.get('cumulative_updated_for_game'), game_session.get('waiting_for_next_game')) != flags_before
+
 def update_round_cumulative_scores(game_session, game):
     """Update round cumulative scores for all players after any move"""
     public_scores = [get_public_score(p, game) for p in game.players]
@@ -584,6 +913,7 @@ def test_chatbot():
 
 # Chatbot Routes
 @app.route('/chatbot/send_message', methods=['POST'])
+@slow_io.limit('chatbot/send_message', max_concurrent=4, timeout=20)
 def send_chatbot_message():
     data = request.json
     result = chat_handler.handle_user_message(data)
@@ -612,7 +942,7 @@ def get_proactive_comment_get():
     game_session = games[game_id]
     comments = game_session.get('pending_proactive_comments', [])
     game_session['pending_proactive_comments'] = []
-    print(f"Returning proactive comments for {game_id}: {comments}")
+    log.debug(f"Returning proactive comments for {game_id}: {comments}")
     return jsonify({'comments': comments})
 
 
@@ -630,6 +960,7 @@ def get_giphy_gif():
         return jsonify(result)
 
 @app.route('/gif/search', methods=['POST'])
+@slow_io.limit('gif/search', max_concurrent=3, timeout=8)
 def user_gif_search():
     """Simple GIF search for users - searches exactly what they type"""
     try:
@@ -644,7 +975,7 @@ def user_gif_search():
         if not api_key:
             return jsonify({'error': 'GIPHY_API_KEY not found in environment variables'}), 500
 
-        print('User gif search query:', search_query)
+        log.debug('User gif search query: %s', search_query)
 
         # Call Giphy API directly with user's search query
         url = "https://api.giphy.com/v1/gifs/search"
@@ -655,7 +986,8 @@ def user_gif_search():
             'rating': 'g'
         }
 
-        response = requests.get(url, params=params)
+        with metrics.timer('external_call', 'giphy'):
+            response = requests.get(url, params=params, timeout=8)
         response.raise_for_status()
 
         data = response.json()
@@ -694,6 +1026,7 @@ GOOGLE_VOICE_MAPPING = {
 }
 
 @app.route('/api/tts', methods=['POST'])
+@slow_io.limit('api/tts', max_concurrent=3, timeout=20)
 def tts():
     try:
         data = request.get_json()
@@ -722,17 +1055,19 @@ def tts():
             "x-api-key": os.getenv("TOP_MEDIA"),
             "Content-Type": "application/json"
         }
-        print("🎤 TTS Request:", payload)
-        response = requests.post("https://api.topmediai.com/v1/text2speech", json=payload, headers=headers)
-        print("🎤 Raw response:", response.text)
+        log.debug("🎤 TTS Request: %s", payload)
+        with metrics.timer('external_call', 'tts_topmedia'):
+            response = requests.post("https://api.topmediai.com/v1/text2speech", json=payload, headers=headers, timeout=15)
+        log.debug("🎤 Raw response: %s", response.text)
         result = response.json()
-        print("🎤 TopMediai API response:", result)
+        log.debug("🎤 TopMediai API response: %s", result)
 
         if result.get("status") == 200 and "oss_url" in result.get("data", {}):
             audio_url = result["data"]["oss_url"]
 
             # Download the audio file and return it as a blob
-            audio_response = requests.get(audio_url)
+            with metrics.timer('external_call', 'tts_topmedia'):
+                audio_response = requests.get(audio_url, timeout=15)
             if audio_response.status_code == 200:
                 from flask import make_response
                 response = make_response(audio_response.content)
@@ -744,17 +1079,17 @@ def tts():
         else:
             return jsonify({"error": "TTS failed", "details": result}), 500
     except Exception as e:
-        import traceback
-        print("🎤 Exception in /api/tts:", e)
-        traceback.print_exc()
+        log.error("🎤 Exception in /api/tts: %s", e, exc_info=True)
         return jsonify({"error": "Server error", "details": str(e)}), 500
 
 @app.route('/api/tts_google', methods=['POST'])
+@slow_io.limit('api/tts_google', max_concurrent=3, timeout=15)
 def tts_google():
     data = request.json
     text = data['text']
     voice_name = data.get("en-AU-Chirp-HD-D", "en-AU-Chirp-HD-D")
-    audio_base64 = chirp3_voice(text, voice_name)
+    with metrics.timer('external_call', 'tts_google'):
+        audio_base64 = chirp3_voice(text, voice_name)
     return jsonify({'audioContent': audio_base64})
 
 # In your web_app.py or similar
@@ -765,21 +1100,22 @@ from flask import request, jsonify
 
 @app.route('/api/test', methods=['POST'])
 def test_route():
-    print("Test route hit!")
+    log.debug("Test route hit!")
     return {"success": True}
 
 @app.route('/api/create_custom_bot', methods=['POST'])
+@slow_io.limit('api/create_custom_bot', max_concurrent=2, timeout=45)
 def create_custom_bot():
-    print("Route hit!")  # <--- Add this as the first line
+    log.debug("Route hit!")
     data = request.get_json()
-    print(f"🔥 /api/create_custom_bot endpoint hit - data: {data}")
+    log.debug(f"🔥 /api/create_custom_bot endpoint hit - data: {data}")
     ai_bot_id = data.get('ai_bot_id')
     name = data.get('name')
     difficulty = data.get('difficulty')
     description = data.get('description')
     image_path = data.get('image_path')
     voice_id = data.get('voice_id')  # <-- Add this line
-    print(f' data is {data} and ai_bot_id is {ai_bot_id} and name is {name} and difficulty is {difficulty} and description is {description} and image_path is {image_path}')
+    log.debug(f' data is {data} and ai_bot_id is {ai_bot_id} and name is {name} and difficulty is {difficulty} and description is {description} and image_path is {image_path}')
     if not ai_bot_id or not name or not difficulty or not description:
         return jsonify({'success': False, 'error': 'Missing fields'}), 400
 
@@ -834,6 +1170,6 @@ def upload_bot_image():
 if __name__ == '__main__':
     # Get port from environment variable (for deployment) or use 5000 for local development
     port = int(os.environ.get('PORT', 5000))
-    print(f"Starting Flask app on port {port}")
-    print(f"Environment PORT: {os.environ.get('PORT', 'Not set')}")
+    log.info(f"Starting Flask app on port {port}")
+    log.info(f"Environment PORT: {os.environ.get('PORT', 'Not set')}")
     app.run(debug=False, host='0.0.0.0', port=port)
\ No newline at end of file
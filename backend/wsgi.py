@@ -9,14 +9,16 @@ import sys
 # Add the current directory to Python path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
+from app_log import get_logger
+
+log = get_logger('wsgi')
+
 try:
-    print("Starting Flask app...")
+    log.info("Starting Flask app...")
     from web_app import app
-    print("✅ Flask app imported successfully")
+    log.info("✅ Flask app imported successfully")
 except Exception as e:
-    print(f"❌ Error importing Flask app: {e}")
-    import traceback
-    traceback.print_exc()
+    log.error(f"❌ Error importing Flask app: {e}", exc_info=True)
     raise
 
 if __name__ == "__main__":
@@ -123,6 +123,7 @@ async function startGame() {
         if (data.success && data.game_state && data.game_state.players) {
             gameId = data.game_id;
             currentGameState = data.game_state;
+            connectGameEvents();
             document.getElementById('gameSetup').style.display = 'none';
             document.getElementById('gameBoard').style.display = 'block';
             showHeaderButtons(true); // <-- Add this here
@@ -181,55 +182,134 @@ async function refreshGameState() {
     if (!gameId) return;
 
     try {
-        const response = await fetch(`/game_state/${gameId}`);
-        const data = await response.json();
-                if (data && !data.error) {
-                        // Check if we're in a new game but setup timer hasn't been reset
-            const isNewGame = currentGameState && data.current_game > currentGameState.current_game;
-            const isMultiGameAndRound1 = data.current_game > 1 && data.round === 1 && setupCardsHidden && lastGameSetupReset < data.current_game;
+        const data = await fetchGameState();
+        applyRefreshedState(data);
+    } catch (error) {
+        console.error('Error refreshing game state:', error);
+    }
+}
 
-                        if (isNewGame || isMultiGameAndRound1) {
-                lastGameSetupReset = data.current_game; // Mark that we've reset for this game
+function applyRefreshedState(data) {
+    if (data && !data.error) {
+        // Check if we're in a new game but setup timer hasn't been reset
+        const isNewGame = currentGameState && data.current_game > currentGameState.current_game;
+        const isMultiGameAndRound1 = data.current_game > 1 && data.round === 1 && setupCardsHidden && lastGameSetupReset < data.current_game;
 
-                // RESET SETUP TIMER FOR NEW GAME
-                setupCardsHidden = false;
-                if (setupHideTimeout) clearTimeout(setupHideTimeout);
-                if (setupViewInterval) clearInterval(setupViewInterval);
+        if (isNewGame || isMultiGameAndRound1) {
+            lastGameSetupReset = data.current_game; // Mark that we've reset for this game
 
-                // Start the setup timer for the new game
-                let secondsLeft = cardVisibilityDuration;
-                showSetupViewTimer(secondsLeft);
-                setupViewInterval = setInterval(() => {
-                    secondsLeft -= 0.1;
-                    if (secondsLeft > 0) {
-                        showSetupViewTimer(Math.max(0, secondsLeft).toFixed(1));
-                    } else {
-                        hideSetupViewTimer();
-                        clearInterval(setupViewInterval);
-                    }
-                }, 100);
-                setupHideTimeout = setTimeout(() => {
-                    setupCardsHidden = true;
-                    updateGameDisplay();
+            // RESET SETUP TIMER FOR NEW GAME
+            setupCardsHidden = false;
+            if (setupHideTimeout) clearTimeout(setupHideTimeout);
+            if (setupViewInterval) clearInterval(setupViewInterval);
+
+            // Start the setup timer for the new game
+            let secondsLeft = cardVisibilityDuration;
+            showSetupViewTimer(secondsLeft);
+            setupViewInterval = setInterval(() => {
+                secondsLeft -= 0.1;
+                if (secondsLeft > 0) {
+                    showSetupViewTimer(Math.max(0, secondsLeft).toFixed(1));
+                } else {
                     hideSetupViewTimer();
-                    if (setupViewInterval) clearInterval(setupViewInterval);
-                }, cardVisibilityDuration * 1000);
-            }
+                    clearInterval(setupViewInterval);
+                }
+            }, 100);
+            setupHideTimeout = setTimeout(() => {
+                setupCardsHidden = true;
+                updateGameDisplay();
+                hideSetupViewTimer();
+                if (setupViewInterval) clearInterval(setupViewInterval);
+            }, cardVisibilityDuration * 1000);
+        }
 
-                        currentGameState = data;
-            updateGameDisplay();
-            // Update chart after game state refresh
-            updateCumulativeScoreChart();
+        currentGameState = data;
+        updateGameDisplay();
+        // Update chart after game state refresh
+        updateCumulativeScoreChart();
 
-            if (data.game_over) {
-                // Game over - handled by updateGameDisplay
-            }
+        if (data.game_over) {
+            // Game over - handled by updateGameDisplay
         }
-    } catch (error) {
-        console.error('Error refreshing game state:', error);
     }
 }
 
+// ===== STATE DELTAS =====
+// Requests carry the version we hold; the server answers with only what changed
+// since then ({version, base_version, delta}) or with the full state if it no
+// longer has that version. Mirrors backend/state_delta.py.
+
+function applyStatePatch(value, patch) {
+    if ('$set' in patch) return patch.$set;
+    if ('$obj' in patch) {
+        const result = Object.assign({}, value);
+        (patch.$del || []).forEach((key) => { delete result[key]; });
+        for (const [key, subPatch] of Object.entries(patch.$obj)) {
+            result[key] = applyStatePatch(result[key], subPatch);
+        }
+        return result;
+    }
+    const result = value.slice(0, patch.$list);
+    while (result.length < patch.$list) result.push(null);
+    for (const [i, subPatch] of Object.entries(patch.$at)) {
+        result[Number(i)] = applyStatePatch(result[Number(i)], subPatch);
+    }
+    return result;
+}
+
+// Full state from a server reply, or null if it is a delta against a state we don't hold
+function resolveGameState(payload, base) {
+    if (!payload || payload.delta === undefined) return payload;
+    if (!base || base.version !== payload.base_version) return null;
+    return applyStatePatch(base, payload.delta);
+}
+
+async function fetchGameState() {
+    const base = currentGameState;
+    const since = base && base.version ? `?since=${base.version}` : '';
+    const response = await fetch(`/game_state/${gameId}${since}`);
+    const state = resolveGameState(await response.json(), base);
+    if (state !== null) return state;
+    const full = await fetch(`/game_state/${gameId}`);
+    return full.json();
+}
+
+// ===== SERVER PUSH (SSE) =====
+
+let gameEvents = null; // EventSource for the current game; polling is the fallback while it's down
+
+function connectGameEvents() {
+    if (gameEvents) gameEvents.close();
+    if (!gameId || typeof EventSource === 'undefined') return;
+
+    const source = new EventSource(`/game_events/${gameId}`);
+    gameEvents = source;
+    source.addEventListener('state', async (event) => {
+        // Actions and AI polling apply their own responses; don't race them
+        if (source !== gameEvents || pollingPaused || aiPollingInProgress) return;
+        const data = JSON.parse(event.data);
+        if (data.reveal_in_ms > 0) {
+            await new Promise((resolve) => setTimeout(resolve, data.reveal_in_ms));
+            data.reveal_in_ms = 0;
+            data.ai_thinking = false;
+        }
+        if (source === gameEvents) applyRefreshedState(data);
+    });
+    source.addEventListener('error', () => {
+        // A server with all its stream slots taken answers 503 and the browser gives up:
+        // poll meanwhile (see the interval below) and try the stream again later
+        if (source === gameEvents && source.readyState === EventSource.CLOSED) {
+            setTimeout(() => {
+                if (source === gameEvents) connectGameEvents();
+            }, 30000);
+        }
+    });
+}
+
+function gameEventsConnected() {
+    return gameEvents && gameEvents.readyState === EventSource.OPEN;
+}
+
 function restartGame() {
     // Reset turn tracking for restart
     console.log('🔄 restartGame: New Game button pressed. turn tracking');
@@ -630,6 +710,7 @@ async function startGameWithSettings(gameMode, opponentType, playerName, numGame
         if (data.success && data.game_state && data.game_state.players) {
             gameId = data.game_id;
             currentGameState = data.game_state;
+            connectGameEvents();
             document.getElementById('gameSetup').style.display = 'none';
             document.getElementById('gameBoard').style.display = 'block';
             setupCardsHidden = false;
@@ -690,41 +771,51 @@ async function pollAITurnsRobust(maxRetries = 15, retryDelay = 800) {
       !currentGameState.game_over &&
       retries < maxRetries
     ) {
-      const currentBotIndex = currentGameState.current_turn;
-      const currentBotName = currentGameState.players && currentGameState.players[currentBotIndex]
-        ? currentGameState.players[currentBotIndex].name : 'Unknown';
-      console.log(`[AI Poll] Requesting turn for bot ${currentBotIndex} (${currentBotName}), retries=${retries}`);
-
-      const response = await fetch('/run_ai_turn', {
+      // One request plays every bot up to the human's turn; the reply is a
+      // timeline of per-move deltas that we reveal one by one.
+      const base = currentGameState;
+      console.log(`[AI Poll] Requesting bot turns from seat ${base.current_turn}, retries=${retries}`);
+      const response = await fetch('/run_ai_turns', {
         method: 'POST',
         headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ game_id: gameId }),
+        body: JSON.stringify({ game_id: gameId, since_version: base.version }),
       });
       const data = await response.json();
-      const newGameState = data.game_state;
+      const received = Date.now();
 
-      const newTurnIndex = newGameState.current_turn;
-      const newTurnName = newGameState.players && newGameState.players[newTurnIndex]
-        ? newGameState.players[newTurnIndex].name : 'Unknown';
-      console.log(`[AI Poll] Result: turn now ${newTurnIndex} (${newTurnName}), game_over=${newGameState.game_over}`);
-
-      currentGameState = newGameState;
-      updateGameDisplay();
-
-      if (newGameState.current_turn !== 0 && !newGameState.game_over) {
-        if (newGameState.current_turn === currentBotIndex) {
+      if (!data.timeline || data.timeline.length === 0) {
+        // Another request holds the game, or there was nothing to play
+        currentGameState = resolveGameState(data.game_state, base) || await fetchGameState();
+        updateGameDisplay();
+        if (currentGameState.current_turn !== 0 && !currentGameState.game_over) {
           retries++;
-          console.log(`[AI Poll] Turn stuck on bot ${currentBotIndex}, retry ${retries}/${maxRetries}`);
+          console.log(`[AI Poll] No bot moves played, retry ${retries}/${maxRetries}`);
           await new Promise((resolve) => setTimeout(resolve, retryDelay));
-        } else {
-          retries = 0;
-          // Brief pause so the user can see each bot's move before the next one starts
-          await new Promise((resolve) => setTimeout(resolve, 300));
         }
-      } else {
-        console.log('[AI Poll] Human turn or game over, stopping.');
-        break;
+        continue;
+      }
+
+      let state = base;
+      for (const step of data.timeline) {
+        const next = resolveGameState(step.game_state, state);
+        if (next === null) {
+          // Lost track of the versions: jump to the latest state instead of animating
+          currentGameState = await fetchGameState();
+          updateGameDisplay();
+          break;
+        }
+        state = next;
+        const wait = state.reveal_in_ms - (Date.now() - received);
+        if (wait > 0) {
+          await new Promise((resolve) => setTimeout(resolve, wait));
+        }
+        const playerName = state.players && state.players[step.player_index]
+          ? state.players[step.player_index].name : 'Unknown';
+        console.log(`[AI Poll] Showing move by ${playerName}, turn now ${state.current_turn}, game_over=${state.game_over}`);
+        currentGameState = Object.assign({}, state, { reveal_in_ms: 0, ai_thinking: false });
+        updateGameDisplay();
       }
+      retries = 0;
     }
   } finally {
     aiPollingInProgress = false;
@@ -901,9 +992,11 @@ function hideSetupViewTimer() {
 
 // ===== PERIODIC POLLING SETUP =====
 
-// Periodically refresh game state (skipped while AI polling is active to avoid race conditions)
+// Periodically refresh game state (skipped while AI polling is active to avoid race conditions,
+// and while the SSE stream is pushing updates)
 setInterval(() => {
-    if (gameId && currentGameState && !currentGameState.game_over && !pollingPaused && !aiPollingInProgress) {
+    if (gameId && currentGameState && !currentGameState.game_over && !pollingPaused && !aiPollingInProgress &&
+        !gameEventsConnected()) {
         refreshGameState();
     }
 }, 500);
@@ -637,8 +637,7 @@ function showReplayButton(show) {
 
 function handleGameEnd() {
     // Immediately fetch new game state, don't wait for polling
-    fetch(`/game_state/${gameId}`)
-        .then(response => response.json())
+    fetchGameState()
         .then(newState => {
             currentGameState = newState;
             updateGameDisplay(); // Force immediate UI update
@@ -613,6 +613,11 @@ function getAvailablePositions() {
 
 // Position modal functions removed - now using drag-and-drop
 
+function newMoveId() {
+    if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+}
+
 async function executeAction(position, actionType = null) {
     if (actionInProgress) {
         console.log('Action blocked: another action is in progress.');
@@ -640,15 +645,38 @@ async function executeAction(position, actionType = null) {
             action.action.flip_position = position;
         }
 
-        const response = await fetch('/make_move', {
-            method: 'POST',
-            headers: {
-                'Content-Type': 'application/json',
-            },
-            body: JSON.stringify(action)
-        });
+        const base = currentGameState;
+        action.since_version = base ? base.version : undefined;
+        // Retries reuse the move id, so the server applies the move at most once
+        action.move_id = newMoveId();
+        action.expected_version = action.since_version;
+        let response;
+        for (let attempt = 0; attempt < 3; attempt++) {
+            response = await fetch('/make_move', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify(action)
+            });
+            if (response.status !== 503) break;
+            await new Promise((resolve) => setTimeout(resolve, 500 * (attempt + 1)));
+        }
 
         const data = await response.json();
+        if (data.stale) {
+            // The game moved on (e.g. another tab played): show it instead of the rejected move
+            console.warn('executeAction: move was made against an old state, refreshing');
+            currentGameState = resolveGameState(data.game_state, base) || await fetchGameState();
+            humanDiscardPosition = null;
+            humanDiscardAction = null;
+            humanDrawnCardPosition = null;
+            updateGameDisplay();
+            return;
+        }
+        if (data.success) {
+            data.game_state = resolveGameState(data.game_state, base) || await fetchGameState();
+        }
         console.log('Received backend response:', data);
         if (data.success) {
             // Clear hurry up timer and GIF when human makes a move
@@ -8,6 +8,23 @@ let lastChartRound = null;
 let lastChartUpdate = 0;
 const CHART_UPDATE_THROTTLE = 100; // minimum 100ms between updates
 
+// EV for the human's move when the state was sent before the server finished it (hints_pending)
+let pendingHintsEv = { version: null, ev: null };
+
+function loadPendingHints(state) {
+    if (pendingHintsEv.version === state.version) return;
+    pendingHintsEv = { version: state.version, ev: null };
+    fetch(`/hints/${gameId}`)
+        .then(response => response.json())
+        .then(hints => {
+            if (hints.success && hints.version === pendingHintsEv.version) {
+                pendingHintsEv.ev = hints.ev_analysis;
+                updateProbabilitiesPanel();
+            }
+        })
+        .catch(error => console.error('Error loading hints:', error));
+}
+
 // HTML Legend Plugin for Chart.js
 const htmlLegendPlugin = {
     id: 'htmlLegend',
@@ -144,8 +161,12 @@ function updateProbabilitiesPanel() {
         otherHtml += '<h4 class="probabilities-title">Probabilities</h4>';
 
         // Expected Value Comparison (most important - show first)
-        if (probs.expected_value_draw_vs_discard && currentGameState.current_turn === 0 && !currentGameState.game_over) {
-            const ev = probs.expected_value_draw_vs_discard;
+        let ev = probs.expected_value_draw_vs_discard;
+        if (!ev && currentGameState.hints_pending) {
+            loadPendingHints(currentGameState);
+            ev = pendingHintsEv.version === currentGameState.version ? pendingHintsEv.ev : null;
+        }
+        if (ev && currentGameState.current_turn === 0 && !currentGameState.game_over) {
             otherHtml += '<div class="probabilities-bar">';
             // otherHtml += '<div class="probabilities-bar-title">🎯 Strategery!</div>';
             otherHtml += `<div class="probabilities-bar-main"><b>${ev.recommendation}</b></div>`;